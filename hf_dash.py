@@ -2,7 +2,6 @@
 
 import asyncio
 import json
-import re
 import subprocess
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -18,7 +17,7 @@ from rich import print as rprint
 from modal_for_noobs.cli_helpers.common import MODAL_BLACK, MODAL_DARK_GREEN, MODAL_GREEN, MODAL_LIGHT_GREEN
 
 # Import ModalDeployer for deployment functionality
-from modal_for_noobs.modal_deploy import ModalDeployer
+from modal_for_noobs.modal_deploy import ModalAPI, ModalDeployer
 from modal_for_noobs.ui.components import ModalStatusMonitor
 
 # Import new UI components and themes
@@ -73,134 +72,22 @@ class ModalDashboard:
     def __init__(self):
         self.deployments: list[ModalDeployment] = []
         self.refresh_interval = 30  # seconds
+        self.modal_api = ModalAPI()
 
     async def fetch_deployments(self) -> list[ModalDeployment]:
-        """Fetch current deployments from Modal library."""
-        try:
-            import modal
-            
-            # Test authentication by trying to list apps
-            try:
-                apps = modal.App.list()
-                deployments = []
-                
-                for app in apps:
-                    deployment = ModalDeployment(
-                        app_id=app.name,
-                        state="running" if app.state == "active" else "stopped",
-                        created_at=datetime.now().isoformat(),
-                        url=getattr(app, 'web_url', None),
-                        gpu_type="unknown",
-                        runtime_minutes=0,
-                        estimated_cost=0.0
-                    )
-                    deployments.append(deployment)
-                
-                return deployments
-                
-            except Exception as e:
-                logger.info(f"Not authenticated with Modal or error listing apps: {e}")
-                return []
-
-        except Exception as e:
-            logger.error(f"Error fetching deployments: {e}")
-            return []
-
-    async def _parse_text_output(self, output: str) -> list[ModalDeployment]:
-        """Parse text output from modal app list command with enhanced parsing."""
-        deployments = []
-        lines = output.strip().split("\n")
-
-        # Look for actual deployment lines (skip headers and separators)
-        for line in lines:
-            line = line.strip()
-            if not line or "─" in line or line.startswith("app_id") or line.startswith("App"):
-                continue
-
-            # Parse app lines - format varies but typically: app_id state created_at
-            parts = line.split()
-            if len(parts) >= 2:
-                app_id = parts[0]
-                state = parts[1] if len(parts) > 1 else "unknown"
-                created_at = " ".join(parts[2:]) if len(parts) > 2 else "Unknown"
-
-                # Try to extract more details for each app
-                app_details = await self._get_app_details(app_id)
-
-                deployment = ModalDeployment(
-                    app_id=app_id,
-                    app_name=app_details.get("name", app_id),
-                    created_at=created_at,
-                    state=state,
-                    url=app_details.get("url"),
-                    gpu_type=app_details.get("gpu_type", "CPU"),
-                    runtime_minutes=app_details.get("runtime_minutes", 0.0),
-                    estimated_cost=0.0,  # Calculate based on runtime
-                    uptime=app_details.get("uptime", "Unknown"),
-                    containers=app_details.get("containers", 1),
-                    functions=app_details.get("functions", []),
-                )
-
-                # Calculate estimated cost
-                deployment.estimated_cost = deployment.calculate_running_cost()
-                deployments.append(deployment)
-
-        return deployments
-
-    async def _get_app_details(self, app_id: str) -> dict[str, Any]:
-        """Get detailed information about a specific app."""
-        details = {
-            "name": app_id,
-            "url": None,
-            "gpu_type": "CPU",
-            "runtime_minutes": 0.0,
-            "uptime": "Unknown",
-            "containers": 1,
-            "functions": [],
-        }
-
-        try:
-            # Try to get app logs to extract more information
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "logs", app_id, "--lines", "5", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        """Fetch current deployments from Modal; errors are logged and give an empty list."""
+        return [
+            ModalDeployment(
+                app_id=app.app_id,
+                app_name=app.name,
+                created_at=app.created_at or "Unknown",
+                state=app.state,
+                url=app.url,
+                gpu_type="unknown",
+                containers=app.tasks,
             )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                logs = stdout.decode()
-
-                # Extract URL from logs
-                url_match = re.search(r"https://[^\s]+\.modal\.run[^\s]*", logs)
-                if url_match:
-                    details["url"] = url_match.group()
-
-                # Look for GPU mentions in logs
-                if "T4" in logs:
-                    details["gpu_type"] = "T4"
-                elif "L4" in logs:
-                    details["gpu_type"] = "L4"
-                elif "A10G" in logs:
-                    details["gpu_type"] = "A10G"
-                elif "A100" in logs:
-                    details["gpu_type"] = "A100"
-                elif "H100" in logs:
-                    details["gpu_type"] = "H100"
-
-                # Estimate runtime from timestamps in logs
-                timestamps = re.findall(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", logs)
-                if len(timestamps) >= 2:
-                    try:
-                        start_time = datetime.fromisoformat(timestamps[0].replace("Z", "+00:00"))
-                        end_time = datetime.fromisoformat(timestamps[-1].replace("Z", "+00:00"))
-                        runtime = (end_time - start_time).total_seconds() / 60.0
-                        details["runtime_minutes"] = runtime
-                    except Exception:
-                        pass
-
-        except Exception as e:
-            logger.debug(f"Could not get details for app {app_id}: {e}")
-
-        return details
+            for app in await self.modal_api.list_deployments()
+        ]
 
     async def stop_deployment(self, app_id: str) -> dict[str, Any]:
         """Stop a specific deployment."""
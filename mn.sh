@@ -158,7 +158,7 @@ elif [[ "$1" == "--"* ]]; then
             ;;
     esac
 
-elif [[ "$1" == "deploy" ]] || [[ "$1" == "mn" ]] || [[ "$1" == "run-examples" ]] || [[ "$1" == "milk-logs" ]] || [[ "$1" == "sanity-check" ]] || [[ "$1" == "kill-a-deployment" ]] || [[ "$1" == "config" ]] || [[ "$1" == "auth" ]] || [[ "$1" == "time-to-get-serious" ]]; then
+elif [[ "$1" == "deploy" ]] || [[ "$1" == "mn" ]] || [[ "$1" == "run-examples" ]] || [[ "$1" == "milk-logs" ]] || [[ "$1" == "sanity-check" ]] || [[ "$1" == "kill-a-deployment" ]] || [[ "$1" == "config" ]] || [[ "$1" == "auth" ]] || [[ "$1" == "time-to-get-serious" ]] || [[ "$1" == "logs" ]]; then
     # Direct CLI command
     $RUN_CMD python -m modal_for_noobs.cli "$@"
 
@@ -11,6 +11,14 @@ def tests(session):
     session.run("uv", "run", "pytest", "--cov=src", "--cov-report=xml", "--cov-report=term")
 
 
+@nox.session(python=["3.12"])
+def benchmarks(session):
+    """Run the rendering and listing-parsing benchmarks and save the results for comparison."""
+    session.install("uv")
+    session.run("uv", "sync", "--group", "test")
+    session.run("uv", "run", "pytest", "src/tests/benchmarks", "-m", "benchmark", "--benchmark-autosave", *session.posargs)
+
+
 @nox.session
 def lint(session):
     """Run linting with ruff."""
@@ -72,6 +72,10 @@ rm -rf dist/ build/ *.egg-info/
 echo "🔧 Installing build tools..."
 uv tool install --upgrade build twine
 
+# Precompile the Jinja2 templates so they ship in the wheel
+echo "🧩 Precompiling templates..."
+uv run python -c "from modal_for_noobs.template_generator import precompile_templates; precompile_templates()"
+
 # Build the package
 echo "🏗️ Building package..."
 uv build
@@ -4,8 +4,25 @@ __version__ = "0.2.5"
 __author__ = "Arthur Souza Rodrigues"
 __email__ = "arthrod@umich.edu"
 
-from modal_for_noobs.cli import app, main
-from modal_for_noobs.config import config
-from modal_for_noobs.modal_deploy import ModalDeployer
+import importlib
+from typing import Any
+
+# Public names are imported on first access so importing a submodule does not
+# pull in the CLI, the deployer and their dependencies.
+_LAZY_IMPORTS = {
+    "app": "modal_for_noobs.cli",
+    "main": "modal_for_noobs.cli",
+    "config": "modal_for_noobs.config",
+    "ModalDeployer": "modal_for_noobs.modal_deploy",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["__author__", "__email__", "__version__", "ModalDeployer", "app", "config", "main"]
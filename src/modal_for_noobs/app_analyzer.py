@@ -0,0 +1,286 @@
+"""AST-based analysis of Gradio app sources.
+
+Parses an app once to find its real imports, the module-level variables that
+hold Gradio interfaces, and its ``.launch()`` calls. Comments, strings and
+identifiers that merely contain a library name are ignored. Results are cached
+by content digest, so validation, mode suggestion, dependency inference and
+template rendering share a single parse.
+"""
+
+import ast
+import hashlib
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Libraries that make the 'optimized' (GPU) mode worthwhile
+ML_LIBRARIES = ("torch", "tensorflow", "transformers", "sklearn", "numpy", "pandas")
+
+# Libraries that suggest the Gradio + Jupyter mode
+JUPYTER_LIBRARIES = ("jupyter", "notebook", "ipywidgets", "matplotlib", "plotly")
+
+# Gradio classes that create a launchable interface
+GRADIO_INTERFACE_CLASSES = ("Blocks", "Interface", "ChatInterface", "TabbedInterface")
+
+# Variable names the deployment templates check when the analysis found none
+DEFAULT_INTERFACE_NAMES = ("demo", "app", "interface", "iface")
+
+# Number of analyses kept in memory
+ANALYSIS_CACHE_SIZE = 256
+
+_analysis_cache: "OrderedDict[str, AppAnalysis]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class AppAnalysis:
+    """What an app source imports and which Gradio interfaces it defines."""
+
+    imports: tuple[str, ...] = ()
+    interface_names: tuple[str, ...] = ()
+    launch_targets: tuple[str, ...] = ()
+    has_gradio: bool = False
+    has_interface: bool = False
+    syntax_error: str | None = None
+
+    @property
+    def has_launch(self) -> bool:
+        """Whether the app calls ``.launch()`` on anything."""
+        return bool(self.launch_targets)
+
+    @property
+    def third_party_imports(self) -> tuple[str, ...]:
+        """Imported top-level modules that are not part of the standard library."""
+        return tuple(name for name in self.imports if name not in sys.stdlib_module_names and name != "__future__")
+
+    @property
+    def ml_libraries(self) -> list[str]:
+        """Imported libraries from ``ML_LIBRARIES``."""
+        return [lib for lib in ML_LIBRARIES if lib in self.imports]
+
+    @property
+    def jupyter_libraries(self) -> list[str]:
+        """Imported libraries from ``JUPYTER_LIBRARIES``."""
+        return [lib for lib in JUPYTER_LIBRARIES if lib in self.imports]
+
+    @property
+    def suggested_mode(self) -> str:
+        """Suggest the best deployment mode based on the imported libraries."""
+        if self.jupyter_libraries:
+            return "gra_jupy"
+        if self.ml_libraries:
+            return "optimized"
+        return "minimum"
+
+    def detection_names(self) -> list[str]:
+        """Interface variable names for the in-container detection, most likely first."""
+        return list(dict.fromkeys([*self.interface_names, *DEFAULT_INTERFACE_NAMES]))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "imports": list(self.imports),
+            "interface_names": list(self.interface_names),
+            "launch_targets": list(self.launch_targets),
+            "has_gradio": self.has_gradio,
+            "has_interface": self.has_interface,
+            "syntax_error": self.syntax_error,
+        }
+
+
+class _AppVisitor(ast.NodeVisitor):
+    """Collect imports, Gradio interface assignments and launch calls."""
+
+    def __init__(self):
+        self.imports: set[str] = set()
+        self.gradio_modules: set[str] = set()
+        self.gradio_classes: set[str] = set()
+        self.interface_names: list[str] = []
+        self.launch_targets: list[str] = []
+        self.has_interface = False
+        self._scope_depth = 0
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            top_level = alias.name.split(".")[0]
+            self.imports.add(top_level)
+            if alias.name == "gradio":
+                self.gradio_modules.add(alias.asname or "gradio")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.level or not node.module:
+            return
+        self.imports.add(node.module.split(".")[0])
+        if node.module == "gradio":
+            for alias in node.names:
+                if alias.name in GRADIO_INTERFACE_CLASSES:
+                    self.gradio_classes.add(alias.asname or alias.name)
+
+    def _visit_scope(self, node: ast.AST) -> None:
+        self._scope_depth += 1
+        self.generic_visit(node)
+        self._scope_depth -= 1
+
+    visit_FunctionDef = _visit_scope
+    visit_AsyncFunctionDef = _visit_scope
+    visit_ClassDef = _visit_scope
+    visit_Lambda = _visit_scope
+
+    def _is_interface(self, node: ast.AST | None) -> bool:
+        """Whether ``node`` constructs a Gradio interface, possibly followed by chained calls."""
+        while isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name) and func.id in self.gradio_classes:
+                return True
+            if (
+                isinstance(func, ast.Attribute)
+                and func.attr in GRADIO_INTERFACE_CLASSES
+                and isinstance(func.value, ast.Name)
+                and func.value.id in self.gradio_modules
+            ):
+                return True
+            node = func.value if isinstance(func, ast.Attribute) else None
+        return False
+
+    def _record_interface(self, target: ast.AST | None) -> None:
+        self.has_interface = True
+        if self._scope_depth == 0 and isinstance(target, ast.Name) and target.id not in self.interface_names:
+            self.interface_names.append(target.id)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if self._is_interface(node.value):
+            for target in node.targets:
+                self._record_interface(target)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if self._is_interface(node.value):
+            self._record_interface(node.target)
+        self.generic_visit(node)
+
+    def visit_With(self, node: ast.With) -> None:
+        for item in node.items:
+            if self._is_interface(item.context_expr):
+                self._record_interface(item.optional_vars)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._is_interface(node):
+            self.has_interface = True
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == "launch":
+            target = func.value.id if isinstance(func.value, ast.Name) else ast.unparse(func.value)
+            self.launch_targets.append(target)
+        self.generic_visit(node)
+
+
+def _analyze(source: str) -> AppAnalysis:
+    """Parse ``source`` and collect the analysis, without caching."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return AppAnalysis(syntax_error=f"line {e.lineno}: {e.msg}")
+
+    # Resolve gradio aliases first so uses above a late import still count
+    visitor = _AppVisitor()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            visitor.visit(node)
+    visitor.visit(tree)
+
+    return AppAnalysis(
+        imports=tuple(sorted(visitor.imports)),
+        interface_names=tuple(visitor.interface_names),
+        launch_targets=tuple(visitor.launch_targets),
+        has_gradio="gradio" in visitor.imports,
+        has_interface=visitor.has_interface,
+    )
+
+
+def analyze_source(source: str) -> AppAnalysis:
+    """Analyze an app source, reusing the result for identical content.
+
+    Args:
+        source: Python source of the app.
+
+    Returns:
+        AppAnalysis: The analysis. Unparsable sources get ``syntax_error`` set.
+    """
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    analysis = _analysis_cache.get(digest)
+    if analysis is None:
+        analysis = _analyze(source)
+        _analysis_cache[digest] = analysis
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    else:
+        _analysis_cache.move_to_end(digest)
+    return analysis
+
+
+def analyze_app(app_file: Path) -> AppAnalysis:
+    """Analyze an app file, reusing the result while its content is unchanged."""
+    return analyze_source(app_file.read_text())
+
+
+def validate_app_file(app_file: Path) -> dict[str, Any]:
+    """Validate a Gradio app file for Modal deployment.
+
+    Args:
+        app_file: Path to the app file to validate.
+
+    Returns:
+        dict: Validation result with recommendations and a suggested mode.
+    """
+    if not app_file.exists():
+        return {"valid": False, "error": f"File not found: {app_file}", "recommendations": ["Create the file first"]}
+
+    if not app_file.suffix == ".py":
+        return {"valid": False, "error": "File must be a Python file (.py)", "recommendations": ["Rename file with .py extension"]}
+
+    try:
+        analysis = analyze_app(app_file)
+    except Exception as e:
+        return {"valid": False, "error": f"Failed to read file: {e!s}", "recommendations": ["Check file permissions and content"]}
+
+    if analysis.syntax_error:
+        return {
+            "valid": False,
+            "error": f"Syntax error at {analysis.syntax_error}",
+            "recommendations": ["Fix the syntax error before deploying"],
+        }
+
+    recommendations = []
+    warnings = []
+
+    if not analysis.has_gradio:
+        recommendations.append("Add 'import gradio as gr' to your file")
+
+    if not analysis.has_interface:
+        recommendations.append("Create a Gradio interface using gr.Blocks() or gr.Interface()")
+
+    if not analysis.has_launch:
+        warnings.append("Consider adding .launch() for local testing")
+
+    detected_ml = analysis.ml_libraries
+    if detected_ml:
+        recommendations.append(f"Consider using 'optimized' mode for ML libraries: {', '.join(detected_ml)}")
+
+    detected_jupyter = analysis.jupyter_libraries
+    if detected_jupyter:
+        recommendations.append("Consider using 'gra_jupy' mode for Jupyter features")
+
+    return {
+        "valid": analysis.has_gradio and analysis.has_interface,
+        "has_gradio": analysis.has_gradio,
+        "has_interface": analysis.has_interface,
+        "has_launch": analysis.has_launch,
+        "interface_names": list(analysis.interface_names),
+        "third_party_imports": list(analysis.third_party_imports),
+        "detected_ml_libraries": detected_ml,
+        "detected_jupyter": detected_jupyter,
+        "recommendations": recommendations,
+        "warnings": warnings,
+        "suggested_mode": analysis.suggested_mode,
+    }
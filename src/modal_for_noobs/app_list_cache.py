@@ -0,0 +1,111 @@
+"""Short-lived, process-wide caches of ``modal app list`` results and app details.
+
+Dashboards, status helpers and the deployer all need the app list, often at
+the same moment, and the dashboards also show per-app details. Results are
+kept for a few seconds, and concurrent callers that miss the cache wait for
+the one fetch already in flight instead of starting their own. Callers may run on different event loops (the dashboards
+run each request under ``asyncio.run`` in a worker thread), so in-flight
+fetches are shared through thread-safe futures.
+"""
+
+import asyncio
+import concurrent.futures
+import copy
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Seconds a fetched app list is served from the cache
+APP_LIST_TTL = 5.0
+# Seconds an app's details are served from the cache; deploys and stops clear it sooner
+APP_DETAILS_TTL = 60.0
+
+
+class AppCache:
+    """Values keyed by backend (and app), with a TTL and single-flight fetching."""
+
+    def __init__(self, ttl: float = APP_LIST_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._in_flight: dict[str, concurrent.futures.Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value for ``key``, calling ``fetch`` on a miss.
+
+        Every caller gets its own copy. Errors from ``fetch`` reach every caller
+        waiting on that fetch and are not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            future = self._in_flight.get(key)
+            if future is None:
+                self.misses += 1
+                future = self._in_flight[key] = concurrent.futures.Future()
+                generation = self._generation
+            else:
+                self.hits += 1
+                self.coalesced += 1
+                generation = None
+        if generation is None:
+            return copy.deepcopy(await asyncio.wrap_future(future))
+
+        try:
+            value = await fetch()
+        except BaseException as e:
+            with self._lock:
+                self._forget(key, future)
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("Fetch was cancelled"))
+            raise
+        with self._lock:
+            self._forget(key, future)
+            # A fetch that started before an invalidation may predate the change
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic(), value)
+        future.set_result(value)
+        return copy.deepcopy(value)
+
+    def _forget(self, key: str, future: concurrent.futures.Future) -> None:
+        # After an invalidation, a newer fetch may already own the key
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    def invalidate(self) -> None:
+        """Drop every cached value, e.g. after a deploy or stop.
+
+        Fetches already in flight still answer their current waiters, but
+        later callers start a fresh fetch instead of joining them.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._in_flight.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hit and miss counters; coalesced waits count as hits."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Shared by every ModalAPI in the process
+app_list_cache = AppCache(APP_LIST_TTL)
+app_details_cache = AppCache(APP_DETAILS_TTL)
+
+
+def invalidate_apps() -> None:
+    """Drop cached app lists and details after something changed the apps."""
+    app_list_cache.invalidate()
+    app_details_cache.invalidate()
@@ -1,9 +1,13 @@
 """Modal-for-noobs CLI - Beautiful, async-first Gradio deployment to Modal."""
 
 import asyncio
+import importlib
+import json
+import re
 import secrets
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import typer
 import uvloop
@@ -11,18 +15,62 @@ from loguru import logger
 from rich import print as rprint
 from rich.align import Align
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
 from rich.text import Text
 
-from modal_for_noobs.auth_manager import ModalAuthManager
 from modal_for_noobs.cli_helpers.common import MODAL_BLACK, MODAL_DARK_GREEN, MODAL_GREEN, MODAL_LIGHT_GREEN
-from modal_for_noobs.config import Config, config
+from modal_for_noobs.cli_helpers.logs_helper import (
+    LineFilter,
+    MergedLogPrinter,
+    app_stream_table,
+    archive_log_lines,
+    close_archive_writer,
+    fetch_merged_tails,
+    follow_many_logs,
+    make_line_filter,
+    milk_logs_async,
+    open_archive_writer,
+    print_merged_lines,
+)
 from modal_for_noobs.config_loader import config_loader
-from modal_for_noobs.huggingface import HuggingFaceSpacesMigrator
-from modal_for_noobs.modal_deploy import ModalDeployer
-from modal_for_noobs.template_generator import generate_from_wizard_input
-from modal_for_noobs.utils.easy_cli_utils import check_modal_auth, create_modal_deployment, setup_modal_auth
+from modal_for_noobs.deploy_many import DEFAULT_CONCURRENCY, BatchItem, deploy_many, discover_targets
+from modal_for_noobs.subprocess_runner import run_modal
+from modal_for_noobs.templates.deployment import DASHBOARD_RUNTIMES
+
+if TYPE_CHECKING:
+    from modal_for_noobs.modal_deploy import DeploymentResult
+
+# Heavy dependencies (httpx, modal, huggingface_hub, jinja2) are imported by the
+# commands that need them, so `--help` and light commands start fast.
+_LAZY_IMPORTS = {
+    "ModalAuthManager": "modal_for_noobs.auth_manager",
+    "ModalDeployer": "modal_for_noobs.modal_deploy",
+    "HuggingFaceSpacesMigrator": "modal_for_noobs.huggingface",
+    "generate_from_wizard_input": "modal_for_noobs.template_generator",
+    "check_modal_auth": "modal_for_noobs.utils.easy_cli_utils",
+    "setup_modal_auth": "modal_for_noobs.utils.easy_cli_utils",
+    "deployment_ledger": "modal_for_noobs.deploy_ledger",
+}
+
+
+def _lazy(name: str) -> Any:
+    """Import a heavy dependency on first use and bind it on this module.
+
+    A value already bound here (for example a test patch) wins over the import.
+    """
+    if name not in globals():
+        globals()[name] = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    return globals()[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 app = typer.Typer(
     name="modal-for-noobs",
@@ -112,6 +160,35 @@ def deploy(
     wizard: Annotated[bool, typer.Option("--wizard", help="Interactive step-by-step deployment wizard")] = False,
     br_huehuehue: Annotated[bool, typer.Option("--br-huehuehue", help="Brazilian mode 🇧🇷", hidden=True)] = False,
     dry_run: Annotated[bool, typer.Option("--dry-run", help="Generate deployment file without deploying")] = False,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Always re-render the deployment file")] = False,
+    dashboard_runtime: Annotated[
+        str,
+        typer.Option(
+            "--dashboard-runtime",
+            help="How the dashboard reaches the container: 'embedded' in the generated file, or 'image' to add the shared runtime to the image",
+        ),
+    ] = "embedded",
+    full_image: Annotated[
+        bool, typer.Option("--full-image", help="Install the mode's full package list, even packages the app never imports")
+    ] = False,
+    lock: Annotated[
+        bool, typer.Option("--lock", help="Pin every package with uv and store the lock next to the generated file")
+    ] = False,
+    wheelhouse: Annotated[
+        Path | None,
+        typer.Option("--wheelhouse", help="Install packages from this wheel directory (see 'prefetch'); --lock resolves from it too"),
+    ] = None,
+    skip_unchanged: Annotated[
+        bool,
+        typer.Option(
+            "--skip-unchanged",
+            help="Skip 'modal deploy' when the app is unchanged since its last successful deploy and still listed by 'modal app list'",
+        ),
+    ] = False,
+    timings: Annotated[bool, typer.Option("--timings", help="Print a per-phase timing waterfall")] = False,
+    timings_json: Annotated[
+        Path | None, typer.Option("--timings-json", help="Append per-phase timings as a JSON line to this file")
+    ] = None,
 ):
     """Deploy a Gradio app to Modal with zero configuration.
 
@@ -119,7 +196,17 @@ def deploy(
         modal-for-noobs deploy app.py
         modal-for-noobs deploy app.py --optimized
         modal-for-noobs deploy app.py --dry-run
+        modal-for-noobs deploy app.py --no-cache
+        modal-for-noobs deploy app.py --skip-unchanged
+        modal-for-noobs deploy app.py --dashboard-runtime image
+        modal-for-noobs deploy app.py --optimized --full-image
+        modal-for-noobs deploy app.py --lock
+        modal-for-noobs deploy app.py --wheelhouse wheels/
+        modal-for-noobs deploy app.py --timings --timings-json timings.jsonl
     """
+    ModalDeployer = _lazy("ModalDeployer")
+    check_modal_auth = _lazy("check_modal_auth")
+    setup_modal_auth = _lazy("setup_modal_auth")
     print_modal_banner(br_huehuehue)
 
     # Validate file exists
@@ -127,6 +214,8 @@ def deploy(
         print_error(f"File not found: {app_file}")
         raise typer.Exit(1)
 
+    _check_dashboard_runtime(dashboard_runtime)
+
     # Handle wizard mode with enhanced features
     if wizard:
         wizard_text = Text()
@@ -265,6 +354,7 @@ def deploy(
             raise typer.Exit(0)
 
         # Generate enhanced deployment using template generator
+        generate_from_wizard_input = _lazy("generate_from_wizard_input")
         try:
             deployment_code = generate_from_wizard_input(
                 app_name=app_name,
@@ -330,14 +420,21 @@ def deploy(
 
         progress.update(task, description="✅ Authentication verified!")
 
+        deployer = ModalDeployer(app_file=app_file, mode=deployment_mode, br_huehuehue=br_huehuehue, use_cache=not no_cache)
+        deployer.config.dashboard_runtime = dashboard_runtime
+        deployer.config.minimal_image = not full_image
+        deployer.config.lock_dependencies = lock
+        deployer.config.wheelhouse = wheelhouse
+
         # Create deployment
         if dry_run:
             task = progress.add_task("📝 Creating deployment file...", total=None)
-            deployment_file = create_modal_deployment(app_file, deployment_mode)
+            deployment_file = uvloop.run(deployer.create_modal_deployment_async(app_file), debug=False)
             progress.update(task, description=f"✅ Created {deployment_file.name}")
             progress.stop()
 
             print_success(f"Deployment file created: {deployment_file.name}")
+            _print_render_cache_status(deployer.last_render_cache_hit)
             print_info("Run the following command to deploy:")
             print_info(f"  modal deploy {deployment_file}")
             return
@@ -345,17 +442,255 @@ def deploy(
         # Full deployment using async deployer
         task = progress.add_task("🚀 Deploying to Modal...", total=None)
 
-        # Run async deployment
-        deployer = ModalDeployer(app_file=app_file, mode=deployment_mode, br_huehuehue=br_huehuehue)
+        def show_output(stream: str, line: str) -> None:
+            if line.strip():
+                progress.update(task, description=f"🚀 {line.strip()[:100]}")
+
+        deployer.on_output = show_output
 
         try:
-            uvloop.run(deployer.deploy(), debug=False)
-            progress.update(task, description="✅ Deployment complete!")
+            result = uvloop.run(deployer.deploy(skip_unchanged=skip_unchanged), debug=False)
+            if result.skipped:
+                progress.update(task, description="⏭️ Deployment skipped, app unchanged!")
+            else:
+                progress.update(task, description="✅ Deployment complete!")
         except Exception as e:
             progress.stop()
             print_error(f"Deployment failed: {e}")
             raise typer.Exit(1) from e
 
+    _print_render_cache_status(result.render_cache_hit)
+    _print_skip_status(result.skipped)
+    if timings:
+        _print_timings(result)
+    if timings_json:
+        _export_timings(result, timings_json)
+
+
+def _print_render_cache_status(render_cache_hit: bool | None) -> None:
+    """Report whether the deployment file came from the render cache."""
+    if render_cache_hit is None:
+        return
+    if render_cache_hit:
+        print_info("Render cache: hit (deployment file reused)")
+    else:
+        print_info("Render cache: miss (deployment file rendered)")
+
+
+def _check_dashboard_runtime(dashboard_runtime: str) -> None:
+    """Exit with an error unless the dashboard runtime is known."""
+    if dashboard_runtime not in DASHBOARD_RUNTIMES:
+        print_error(f"Unknown dashboard runtime '{dashboard_runtime}', expected one of: {', '.join(DASHBOARD_RUNTIMES)}")
+        raise typer.Exit(1)
+
+
+def _print_skip_status(skipped: bool) -> None:
+    """Report that 'modal deploy' was skipped for an unchanged app."""
+    if skipped:
+        print_info("Skipped 'modal deploy': app unchanged since its last successful deploy")
+
+
+def _print_timings(result: "DeploymentResult", width: int = 40) -> None:
+    """Print deployment phases as a waterfall."""
+    if not result.phases:
+        return
+    total = max(phase.start + phase.duration for phase in result.phases) or 1.0
+
+    table = Table(title="Deployment timings", border_style=MODAL_GREEN)
+    table.add_column("Phase", style="bold white")
+    table.add_column("Start", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Waterfall")
+    for phase in result.phases:
+        offset = int(phase.start / total * width)
+        length = max(1, round(phase.duration / total * width))
+        bar = " " * offset + "█" * min(length, width - offset)
+        table.add_row(phase.name, f"{phase.start:.3f}s", f"{phase.duration:.3f}s", f"[{MODAL_GREEN}]{bar}[/{MODAL_GREEN}]")
+    console.print(table)
+
+
+def _export_timings(result: "DeploymentResult", path: Path) -> None:
+    """Append the deployment's phase timings to a JSON Lines file."""
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "app_name": result.config.app_name if result.config else None,
+        "mode": result.config.mode if result.config else None,
+        "success": result.success,
+        "skipped": result.skipped,
+        "render_cache_hit": result.render_cache_hit,
+        "total": sum(phase.duration for phase in result.phases),
+        "phases": [phase.to_dict() for phase in result.phases],
+    }
+    try:
+        with path.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+        print_info(f"Timings appended to {path}")
+    except OSError as e:
+        print_warning(f"Could not write timings to {path}: {e}")
+
+
+@app.command("deploy-many")
+def deploy_many_command(
+    source: Annotated[str, typer.Argument(help="Glob of app files (e.g. 'apps/*.py') or a YAML manifest")],
+    optimized: Annotated[bool, typer.Option("--optimized", help="Default to ML libraries and GPU support")] = False,
+    concurrency: Annotated[int, typer.Option("--concurrency", "-j", help="Maximum deployments in flight")] = DEFAULT_CONCURRENCY,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Always re-render the deployment files")] = False,
+    dashboard_runtime: Annotated[
+        str,
+        typer.Option(
+            "--dashboard-runtime",
+            help="How the dashboard reaches the container: 'embedded' in the generated file, or 'image' to add the shared runtime to the image",
+        ),
+    ] = "embedded",
+    skip_unchanged: Annotated[bool, typer.Option("--skip-unchanged", help="Skip apps unchanged since their last successful deploy")] = False,
+    br_huehuehue: Annotated[bool, typer.Option("--br-huehuehue", help="Brazilian mode 🇧🇷", hidden=True)] = False,
+) -> None:
+    """Deploy many Gradio apps concurrently.
+
+    Manifest entries are paths or mappings with 'path' and optional 'mode' and 'name'.
+
+    Examples:
+        modal-for-noobs deploy-many "apps/*.py"
+        modal-for-noobs deploy-many apps.yml --concurrency 8 --skip-unchanged
+    """
+    check_modal_auth = _lazy("check_modal_auth")
+    setup_modal_auth = _lazy("setup_modal_auth")
+    print_modal_banner(br_huehuehue)
+    _check_dashboard_runtime(dashboard_runtime)
+
+    try:
+        targets = discover_targets(source, default_mode="optimized" if optimized else "minimum")
+    except (OSError, ValueError) as e:
+        print_error(f"Could not read deploy targets: {e}")
+        raise typer.Exit(1) from e
+
+    if not targets:
+        print_error(f"No app files matched: {source}")
+        raise typer.Exit(1)
+
+    missing = [str(target.app_file) for target in targets if not target.app_file.exists()]
+    if missing:
+        print_error(f"File not found: {', '.join(missing)}")
+        raise typer.Exit(1)
+
+    if not check_modal_auth():
+        print_info("Setting up Modal authentication...")
+        if not setup_modal_auth():
+            print_error("Failed to set up Modal authentication")
+            raise typer.Exit(1)
+
+    print_info(f"Deploying {len(targets)} apps with concurrency {concurrency}")
+    with Live(_batch_table([BatchItem(target=target) for target in targets]), refresh_per_second=4, transient=True) as live:
+        items = uvloop.run(
+            deploy_many(
+                targets,
+                concurrency=concurrency,
+                skip_unchanged=skip_unchanged,
+                use_cache=not no_cache,
+                dashboard_runtime=dashboard_runtime,
+                on_update=lambda items: live.update(_batch_table(items)),
+            ),
+            debug=False,
+        )
+
+    console.print(_batch_table(items, title="Deployment summary"))
+    failed = [item for item in items if item.status == "failed"]
+    if failed:
+        print_error(f"{len(failed)} of {len(items)} deployments failed")
+        raise typer.Exit(1)
+    print_success(f"All {len(items)} apps deployed")
+
+
+_BATCH_STATUS_STYLES = {
+    "queued": "dim",
+    "deploying": "yellow",
+    "deployed": MODAL_GREEN,
+    "skipped": MODAL_LIGHT_GREEN,
+    "failed": "red",
+}
+
+
+def _batch_table(items: list[BatchItem], title: str = "Deploying apps") -> Table:
+    """Render batch deploy state as a table."""
+    table = Table(title=title, border_style=MODAL_GREEN)
+    table.add_column("App", style="bold white")
+    table.add_column("Mode")
+    table.add_column("Status")
+    table.add_column("Time", justify="right")
+    table.add_column("URL / error", overflow="fold")
+
+    for item in items:
+        style = _BATCH_STATUS_STYLES.get(item.status, "white")
+        elapsed = f"{item.elapsed:.1f}s" if item.elapsed is not None else ""
+        detail = ""
+        if item.status == "deploying":
+            detail = item.last_line[:100]
+        elif item.result and item.result.success:
+            detail = item.result.url or ""
+        elif item.result and item.result.error:
+            detail = item.result.error.strip().splitlines()[-1]
+        table.add_row(item.target.name, item.target.mode, f"[{style}]{item.status}[/{style}]", elapsed, detail)
+    return table
+
+
+@app.command()
+def prefetch(
+    modes: Annotated[list[str] | None, typer.Option("--mode", "-m", help="Mode to prefetch (repeatable, default: every mode)")] = None,
+    wheelhouse: Annotated[Path | None, typer.Option("--wheelhouse", help="Wheel directory (default: the cache's wheelhouse)")] = None,
+    requirements: Annotated[
+        Path | None, typer.Option("--requirements", "-r", help="Also prefetch an app's requirements file for every mode")
+    ] = None,
+    br_huehuehue: Annotated[bool, typer.Option("--br-huehuehue", help="Brazilian mode 🇧🇷", hidden=True)] = False,
+) -> None:
+    """Download wheels for the mode package sets into a local wheelhouse.
+
+    Each mode gets its own subdirectory; wheels shared between modes are
+    stored once. Deploy with '--wheelhouse' to copy the mode's wheels into
+    the image and install without PyPI.
+
+    Examples:
+        modal-for-noobs prefetch
+        modal-for-noobs prefetch --mode optimized --wheelhouse wheels/ -r requirements.txt
+        modal-for-noobs deploy app.py --optimized --wheelhouse wheels/
+    """
+    from modal_for_noobs.requirements import read_requirements
+    from modal_for_noobs.wheelhouse import default_wheelhouse_dir
+    from modal_for_noobs.wheelhouse import prefetch as prefetch_wheels
+
+    print_modal_banner(br_huehuehue)
+    package_config = config_loader.load_base_packages()
+    unknown = [mode for mode in modes or [] if mode not in package_config]
+    if unknown:
+        print_error(f"Unknown mode: {', '.join(unknown)}. Expected one of: {', '.join(package_config)}")
+        raise typer.Exit(1)
+
+    extra_packages = []
+    if requirements is not None:
+        try:
+            extra_packages = read_requirements(requirements).to_list()
+        except (OSError, UnicodeDecodeError) as e:
+            print_error(f"Could not read {requirements}: {e}")
+            raise typer.Exit(1) from e
+
+    wheelhouse = wheelhouse or default_wheelhouse_dir()
+    selected = {mode: [*package_config[mode], *extra_packages] for mode in modes or package_config}
+    print_info(f"Prefetching wheels for {', '.join(selected)} into {wheelhouse}")
+    with console.status("📦 Downloading wheels..."):
+        results, manifest = prefetch_wheels(selected, wheelhouse)
+
+    table = Table(title="Wheelhouse", border_style=MODAL_GREEN)
+    table.add_column("Mode", style="bold")
+    table.add_column("Packages", justify="right")
+    table.add_column("Without wheels")
+    for result in results:
+        table.add_row(result.mode, str(len(result.packages)), ", ".join(result.failed) or "-")
+    console.print(table)
+
+    unique_wheels = len({entry["sha256"] for entry in manifest["wheels"].values()})
+    print_success(f"{unique_wheels} wheels, {manifest['total_bytes'] / 1024**2:.0f} MB stored in {wheelhouse}")
+    if any(result.failed for result in results):
+        print_warning("Packages without Linux wheels cannot install from the wheelhouse; add their wheels or deploy without --wheelhouse")
+
 
 @app.command()
 def mn(
@@ -372,6 +707,7 @@ def mn(
 
     Also supports quick access to dashboard with --dashboard flag.
     """
+    ModalDeployer = _lazy("ModalDeployer")
     print_modal_banner(br_huehuehue)
 
     # Handle dashboard mode
@@ -516,12 +852,35 @@ def kill_a_deployment(
 
 @app.command()
 def milk_logs(
-    app_name: Annotated[str | None, typer.Argument(help="App name to get logs from")] = None,
+    app_names: Annotated[
+        list[str] | None, typer.Argument(help="App names to get logs from; logs of several apps are merged by time")
+    ] = None,
     follow: Annotated[bool, typer.Option("--follow", "-f", help="Follow logs in real-time")] = False,
-    lines: Annotated[int, typer.Option("--lines", "-n", help="Number of log lines to show")] = 100,
+    lines: Annotated[int, typer.Option("--lines", "-n", help="Number of recent log lines to show (without --follow)")] = 100,
     br_huehuehue: Annotated[bool, typer.Option("--br-huehuehue", help="Modo brasileiro! 🇧🇷")] = False,
+    archive: Annotated[
+        bool, typer.Option("--archive", help="Also keep the lines in a local archive, searchable with 'logs query'")
+    ] = False,
+    grep: Annotated[str | None, typer.Option("--grep", "-g", help="Only show lines matching this regular expression")] = None,
+    level: Annotated[
+        str | None, typer.Option("--level", "-l", help="Only show lines at or above this level: debug, info, warning, error, critical")
+    ] = None,
 ) -> None:
     """🥛 Milk the logs from your Modal deployments - fresh and creamy!"""
+    apps = app_names or []
+    line_filter = None
+    if len(apps) > 1 or grep or level:
+        if not apps:
+            print_error("Name the apps whose logs should be filtered, e.g. 'milk-logs my-app --level error'")
+            raise typer.Exit(1)
+        from modal_for_noobs.log_parser import level_number
+
+        try:
+            line_filter = make_line_filter(grep, level_number(level) if level else None)
+        except (re.error, ValueError) as e:
+            print_error(f"Invalid log filter: {e}")
+            raise typer.Exit(1) from e
+
     print_modal_banner(br_huehuehue)
 
     if br_huehuehue:
@@ -535,7 +894,60 @@ def milk_logs(
 
     rprint(Panel(Align.center(milk_text), border_style=f"{MODAL_GREEN}", padding=(1, 2)))
 
-    uvloop.run(_milk_logs_async(app_name, follow, lines, br_huehuehue), debug=False)
+    try:
+        if line_filter is not None or len(apps) > 1:
+            uvloop.run(_milk_many_logs_async(apps, follow, lines, line_filter, br_huehuehue, archive), debug=False)
+        else:
+            uvloop.run(_milk_logs_async(apps[0] if apps else None, follow, lines, br_huehuehue, archive), debug=False)
+    except KeyboardInterrupt:
+        # The modal process was already killed when the stream was cancelled
+        if br_huehuehue:
+            print_info("Parou de ordenhar logs! Huehuehue!")
+        else:
+            print_info("Stopped milking logs.")
+
+
+logs_app = typer.Typer(help="🗄️ Search logs archived by 'milk-logs --archive'", no_args_is_help=True)
+app.add_typer(logs_app, name="logs")
+
+
+@logs_app.command("query")
+def logs_query(
+    text: Annotated[str | None, typer.Argument(help="Words every line must contain")] = None,
+    apps: Annotated[list[str] | None, typer.Option("--app", "-a", help="App to search (repeatable; default: all archived apps)")] = None,
+    since: Annotated[str | None, typer.Option("--since", help="Start time, ISO 8601 or relative like 30m, 2h, 1d")] = None,
+    until: Annotated[str | None, typer.Option("--until", help="End time, ISO 8601 or relative like 30m, 2h, 1d")] = None,
+    level: Annotated[str | None, typer.Option("--level", "-l", help="Minimum level: debug, info, warning, error, critical")] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Show at most this many of the newest matching lines")] = 200,
+    as_json: Annotated[bool, typer.Option("--json", help="Print one JSON record per line, for export")] = False,
+) -> None:
+    """🔎 Search archived logs by time range, level and text, without calling Modal."""
+    from modal_for_noobs.log_archive import iter_lines, log_archive, parse_time
+    from modal_for_noobs.log_parser import level_number
+
+    try:
+        lines = log_archive.query(
+            apps=apps,
+            since=parse_time(since) if since else None,
+            until=parse_time(until) if until else None,
+            min_level=level_number(level) if level else None,
+            text=text,
+            limit=limit,
+        )
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(1) from e
+
+    if as_json:
+        for line in lines:
+            typer.echo(json.dumps({"app": line.app, **line.to_record().to_dict()}))
+        return
+    if not lines:
+        print_info("No archived log lines match. Archive some with 'modal-for-noobs milk-logs <app> --archive'.")
+        return
+    # One line per log line, never wrapped or read as Rich markup
+    console.print(Text("\n".join(iter_lines(lines, show_app=len({line.app for line in lines}) > 1))), highlight=False, soft_wrap=True)
+    print_success(f"Found {len(lines)} matching lines")
 
 
 @app.command("run-examples")
@@ -546,6 +958,7 @@ def run_examples(
     br_huehuehue: Annotated[bool, typer.Option("--br-huehuehue", help="Modo brasileiro! 🇧🇷")] = False,
 ) -> None:
     """🎯 Run built-in examples - perfect for testing and learning!"""
+    ModalDeployer = _lazy("ModalDeployer")
     print_modal_banner(br_huehuehue)
 
     # Get examples directory
@@ -813,6 +1226,8 @@ async def _launch_dashboard_async(port: int, share: bool, br_huehuehue: bool) ->
 
 async def _setup_auth_async(token_id: str | None, token_secret: str | None, create_account: bool = False) -> None:
     """Async authentication setup with progress."""
+    ModalAuthManager = _lazy("ModalAuthManager")
+    ModalDeployer = _lazy("ModalDeployer")
     import os
 
     deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
@@ -847,6 +1262,7 @@ async def _setup_auth_async(token_id: str | None, token_secret: str | None, crea
 
 async def _sanity_check_async(br_huehuehue: bool = False) -> None:
     """Async sanity check for Modal deployments."""
+    ModalDeployer = _lazy("ModalDeployer")
     deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
 
     with Progress(
@@ -867,15 +1283,12 @@ async def _sanity_check_async(br_huehuehue: bool = False) -> None:
                 return
 
             # Run modal app list command
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            result = await run_modal("app", "list")
 
             progress.update(check_task, description="✅ Sanity check complete!")
 
-            if process.returncode == 0:
-                output = stdout.decode().strip()
+            if result.ok:
+                output = result.stdout.strip()
                 if output:
                     if br_huehuehue:
                         rprint(f"\n[{MODAL_GREEN}]🎉 Apps encontrados em sua conta Modal (huehuehue!):[/{MODAL_GREEN}]")
@@ -888,7 +1301,7 @@ async def _sanity_check_async(br_huehuehue: bool = False) -> None:
                     else:
                         rprint(f"\n[{MODAL_LIGHT_GREEN}]✨ No apps deployed yet! Time to get started![/{MODAL_LIGHT_GREEN}]")
             else:
-                error_msg = stderr.decode().strip()
+                error_msg = result.error
                 if br_huehuehue:
                     print_error(f"Erro ao verificar deployments: {error_msg}")
                 else:
@@ -904,6 +1317,8 @@ async def _sanity_check_async(br_huehuehue: bool = False) -> None:
 
 async def _migrate_hf_spaces_async(spaces_url: str, optimized: bool, dry_run: bool) -> None:
     """Async HuggingFace Spaces migration with epic visuals."""
+    ModalDeployer = _lazy("ModalDeployer")
+    HuggingFaceSpacesMigrator = _lazy("HuggingFaceSpacesMigrator")
     migrator = HuggingFaceSpacesMigrator()
 
     with Progress(
@@ -1423,6 +1838,8 @@ def _get_example_description(example_file: Path) -> str:
 
 async def _kill_deployment_async(deployment_id: str | None = None, br_huehuehue: bool = False) -> None:
     """Async kill deployment functionality - completely stops and removes containers."""
+    ModalDeployer = _lazy("ModalDeployer")
+    deployment_ledger = _lazy("deployment_ledger")
     deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
 
     with Progress(
@@ -1450,13 +1867,11 @@ async def _kill_deployment_async(deployment_id: str | None = None, br_huehuehue:
             try:
                 # Stop the deployment
                 progress.update(kill_task, description=f"🛑 Stopping deployment {deployment_id}...")
-                stop_process = await asyncio.create_subprocess_exec(
-                    "modal", "app", "stop", deployment_id, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                stop_stdout, stop_stderr = await stop_process.communicate()
+                stop_result = await run_modal("app", "stop", deployment_id)
 
-                if stop_process.returncode == 0:
+                if stop_result.ok:
                     progress.update(kill_task, description=f"✅ Deployment {deployment_id} completely terminated!")
+                    deployment_ledger.forget(deployment_id)
 
                     if br_huehuehue:
                         print_success(f"💀 Deployment {deployment_id} foi completamente exterminado! Huehuehue!")
@@ -1469,7 +1884,7 @@ async def _kill_deployment_async(deployment_id: str | None = None, br_huehuehue:
                             f"[{MODAL_LIGHT_GREEN}]✨ App removed from all servers! No longer consuming resources![/{MODAL_LIGHT_GREEN}]"
                         )
                 else:
-                    error_msg = stop_stderr.decode().strip()
+                    error_msg = stop_result.error
                     progress.update(kill_task, description="❌ Failed to terminate deployment!")
                     if br_huehuehue:
                         print_error(f"Erro ao exterminar deployment: {error_msg}")
@@ -1488,15 +1903,12 @@ async def _kill_deployment_async(deployment_id: str | None = None, br_huehuehue:
             list_task = progress.add_task("📋 Listing deployments to terminate...", total=None)
 
             try:
-                process = await asyncio.create_subprocess_exec(
-                    "modal", "app", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
+                result = await run_modal("app", "list")
 
                 progress.update(list_task, description="✅ Deployments listed!")
 
-                if process.returncode == 0:
-                    output = stdout.decode().strip()
+                if result.ok:
+                    output = result.stdout.strip()
                     if output:
                         if br_huehuehue:
                             rprint(f"\n[{MODAL_GREEN}]💀 EXTERMINADOR DE DEPLOYMENTS 💀[/{MODAL_GREEN}]")
@@ -1519,7 +1931,7 @@ async def _kill_deployment_async(deployment_id: str | None = None, br_huehuehue:
                         else:
                             rprint(f"\n[{MODAL_LIGHT_GREEN}]✨ No deployments found! Everything clean![/{MODAL_LIGHT_GREEN}]")
                 else:
-                    error_msg = stderr.decode().strip()
+                    error_msg = result.error
                     if br_huehuehue:
                         print_error(f"Erro ao listar deployments: {error_msg}")
                     else:
@@ -1533,16 +1945,33 @@ async def _kill_deployment_async(deployment_id: str | None = None, br_huehuehue:
                     print_error(f"Error listing deployments: {str(e)}")
 
 
-async def _milk_logs_async(app_name: str | None = None, follow: bool = False, lines: int = 100, br_huehuehue: bool = False) -> None:
+async def _milk_logs_async(
+    app_name: str | None = None, follow: bool = False, lines: int = 100, br_huehuehue: bool = False, archive: bool = False
+) -> None:
     """Async log milking functionality - get those creamy logs! 🥛."""
+    ModalDeployer = _lazy("ModalDeployer")
     deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
+    await milk_logs_async(app_name, follow, lines, br_huehuehue, archive, deployer=deployer, console=console)
+
+
+async def _milk_many_logs_async(
+    app_names: list[str],
+    follow: bool = False,
+    lines: int = 100,
+    line_filter: LineFilter | None = None,
+    br_huehuehue: bool = False,
+    archive: bool = False,
+) -> None:
+    """Milk the logs of several apps at once, merged by timestamp 🥛."""
+    ModalDeployer = _lazy("ModalDeployer")
+    deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
+    names = ", ".join(app_names)
 
     with Progress(
         SpinnerColumn(spinner_name="dots", style=f"{MODAL_GREEN}"),
         TextColumn("[progress.description]{task.description}", style="bold white"),
         console=console,
     ) as progress:
-        # Check authentication first
         auth_task = progress.add_task("🔍 Checking Modal authentication...", total=None)
 
         if not await deployer.check_modal_auth_async():
@@ -1554,112 +1983,67 @@ async def _milk_logs_async(app_name: str | None = None, follow: bool = False, li
             return
 
         progress.update(auth_task, description="✅ Authentication verified!")
+        milk_task = progress.add_task(f"🥛 Milking logs from {names}...", total=None)
 
-        if not app_name:
-            # List apps for user to choose
-            list_task = progress.add_task("📋 Finding apps to milk logs from...", total=None)
-
-            try:
-                process = await asyncio.create_subprocess_exec(
-                    "modal", "app", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
-
-                progress.update(list_task, description="✅ Apps found!")
-
-                if process.returncode == 0:
-                    output = stdout.decode().strip()
-                    if output:
-                        if br_huehuehue:
-                            rprint(f"\n[{MODAL_GREEN}]🥛 Apps disponíveis para ordenhar logs (huehuehue!):[/{MODAL_GREEN}]")
-                        else:
-                            rprint(f"\n[{MODAL_GREEN}]🥛 Apps available for log milking:[/{MODAL_GREEN}]")
-                        rprint(f"```\n{output}\n```")
-
-                        if br_huehuehue:
-                            rprint(f"\n[{MODAL_LIGHT_GREEN}]💡 Para ordenhar logs de um app específico:[/{MODAL_LIGHT_GREEN}]")
-                            rprint("modal-for-noobs milk-logs <app-name> --br-huehuehue")
-                        else:
-                            rprint(f"\n[{MODAL_LIGHT_GREEN}]💡 To milk logs from a specific app:[/{MODAL_LIGHT_GREEN}]")
-                            rprint("modal-for-noobs milk-logs <app-name> --follow")
-                    else:
-                        if br_huehuehue:
-                            rprint(
-                                f"\n[{MODAL_LIGHT_GREEN}]✨ Nenhum app para ordenhar! Deploye algo primeiro! Huehuehue![/{MODAL_LIGHT_GREEN}]"
-                            )
-                        else:
-                            rprint(f"\n[{MODAL_LIGHT_GREEN}]✨ No apps to milk logs from! Deploy something first![/{MODAL_LIGHT_GREEN}]")
-                else:
-                    error_msg = stderr.decode().strip()
-                    if br_huehuehue:
-                        print_error(f"Erro ao listar apps: {error_msg}")
-                    else:
-                        print_error(f"Error listing apps: {error_msg}")
-
-            except Exception as e:
-                progress.update(list_task, description="❌ Error listing apps!")
+        try:
+            if follow:
                 if br_huehuehue:
-                    print_error(f"Erro ao listar apps: {str(e)}")
+                    rprint(f"\n[{MODAL_GREEN}]🥛 Ordenhando logs de {names} ao vivo (Ctrl-C para parar, huehuehue!):[/{MODAL_GREEN}]")
                 else:
-                    print_error(f"Error listing apps: {str(e)}")
-
-        else:
-            # Milk logs from specific app
-            milk_task = progress.add_task(f"🥛 Milking logs from {app_name}...", total=None)
-
-            try:
-                # Build modal logs command - Modal CLI uses different syntax
-                cmd = ["modal", "app", "logs", app_name]
-                if follow:
-                    cmd.append("--follow")
-
-                # For non-follow mode, get all logs at once
-                process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-                stdout, stderr = await process.communicate()
-
-                if process.returncode == 0:
-                    progress.update(milk_task, description=f"✅ Logs milked from {app_name}!")
-
-                    logs = stdout.decode().strip()
-                    if logs:
-                        if br_huehuehue:
-                            rprint(f"\n[{MODAL_GREEN}]🥛 Logs fresquinhos de {app_name} (huehuehue!):[/{MODAL_GREEN}]")
-                        else:
-                            rprint(f"\n[{MODAL_GREEN}]🥛 Fresh creamy logs from {app_name}:[/{MODAL_GREEN}]")
-                        rprint("=" * 80)
-
-                        # Pretty print logs with milk emojis (limit to requested lines)
-                        log_lines = logs.split("\n")
-                        displayed_lines = log_lines[-lines:] if len(log_lines) > lines else log_lines
-
-                        for line in displayed_lines:
-                            if line.strip():
-                                rprint(f"🥛 {line}")
-
-                        rprint("=" * 80)
-                        if br_huehuehue:
-                            print_success(f"Logs ordenhados com sucesso de {app_name}! ({len(displayed_lines)} linhas) Huehuehue!")
-                        else:
-                            print_success(f"Successfully milked {len(displayed_lines)} lines of creamy logs from {app_name}!")
+                    rprint(f"\n[{MODAL_GREEN}]🥛 Following fresh creamy logs from {names} (Ctrl-C to stop):[/{MODAL_GREEN}]")
+
+                writers = {app: writer for app in app_names if archive and (writer := open_archive_writer(app))}
+                printer = MergedLogPrinter(progress.console, app_names, line_filter=line_filter)
+                try:
+                    async with printer:
+                        results = await follow_many_logs(printer, writers)
+                except asyncio.CancelledError:
+                    progress.update(milk_task, description=f"🛑 Stopped following {names}")
+                    raise
+                finally:
+                    for app_name, writer in writers.items():
+                        close_archive_writer(writer, app_name)
+                    progress.console.print(app_stream_table(printer.streams))
+                milked = printer.printed
+            else:
+                merged = await fetch_merged_tails(app_names, lines, line_filter)
+                results = merged.results
+                if merged.entries:
+                    if br_huehuehue:
+                        rprint(f"\n[{MODAL_GREEN}]🥛 Logs fresquinhos de {names} (huehuehue!):[/{MODAL_GREEN}]")
                     else:
-                        if br_huehuehue:
-                            rprint(f"\n[{MODAL_LIGHT_GREEN}]📝 Nenhum log encontrado para {app_name}![/{MODAL_LIGHT_GREEN}]")
-                        else:
-                            rprint(f"\n[{MODAL_LIGHT_GREEN}]📝 No logs found for {app_name}![/{MODAL_LIGHT_GREEN}]")
-                else:
-                    error_msg = stderr.decode().strip()
-                    progress.update(milk_task, description="❌ Failed to milk logs!")
+                        rprint(f"\n[{MODAL_GREEN}]🥛 Fresh creamy logs from {names}:[/{MODAL_GREEN}]")
+                    rprint("=" * 80)
+                    print_merged_lines(progress.console, merged.entries, merged.streams)
+                    rprint("=" * 80)
+                if archive:
+                    for app_name, raw in merged.raw.items():
+                        if raw:
+                            archive_log_lines(app_name, raw)
+                progress.console.print(app_stream_table(merged.streams))
+                milked = len(merged.entries)
+
+            for app_name, result in results.items():
+                if not result.ok:
                     if br_huehuehue:
-                        print_error(f"Erro ao ordenhar logs: {error_msg}")
+                        print_error(f"Erro ao ordenhar logs de {app_name}: {result.error}")
                     else:
-                        print_error(f"Failed to milk logs: {error_msg}")
-
-            except Exception as e:
-                progress.update(milk_task, description="❌ Error during log milking!")
+                        print_error(f"Failed to milk logs from {app_name}: {result.error}")
+            if all(result.ok for result in results.values()):
+                progress.update(milk_task, description=f"✅ Logs milked from {names}!")
                 if br_huehuehue:
-                    print_error(f"Erro ao ordenhar logs: {str(e)}")
+                    print_success(f"Logs ordenhados com sucesso! ({milked} linhas) Huehuehue!")
                 else:
-                    print_error(f"Error milking logs: {str(e)}")
+                    print_success(f"Successfully milked {milked} lines of creamy logs from {len(app_names)} apps!")
+            else:
+                progress.update(milk_task, description="❌ Failed to milk some logs!")
+
+        except Exception as e:
+            progress.update(milk_task, description="❌ Error during log milking!")
+            if br_huehuehue:
+                print_error(f"Erro ao ordenhar logs: {str(e)}")
+            else:
+                print_error(f"Error milking logs: {str(e)}")
 
 
 def main():
@@ -1,23 +1,432 @@
 """Logs management helpers for modal-for-noobs CLI."""
 
 import asyncio
+import heapq
+import itertools
+import re
+import sqlite3
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+from rich.text import Text
 
 from modal_for_noobs.cli_helpers.common import MODAL_GREEN, MODAL_LIGHT_GREEN, print_error, print_info, print_success, print_warning
+from modal_for_noobs.log_archive import ArchiveWriter, log_archive
+from modal_for_noobs.log_parser import LogParser, LogRecord
+from modal_for_noobs.subprocess_runner import DEFAULT_TIMEOUT, CommandResult, run_modal, stream_modal
 
-
-async def milk_logs_async(app_name: str | None = None, follow: bool = False, lines: int = 100, br_huehuehue: bool = False) -> None:
-    """Async log milking functionality - get those creamy logs! 🥛."""
+if TYPE_CHECKING:
     from modal_for_noobs.modal_deploy import ModalDeployer
 
-    deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
+# Followed log lines waiting to be printed; reading `modal` pauses when this many are queued
+FOLLOW_BUFFER_LINES = 2000
+# Most lines printed in one console write
+RENDER_BATCH = 500
+# Seconds between console writes while following
+RENDER_INTERVAL = 0.1
+# Lines of stderr kept to explain a failed `modal app logs`
+STDERR_TAIL = 20
+
+LOG_PREFIX = "🥛 "
+
+# Seconds a line from one of several followed apps is held back, so that a line
+# another app logged earlier but delivered later can still be printed before it
+REORDER_WINDOW = 1.0
+# Prefix colours of merged apps, in order
+APP_STYLES = (MODAL_GREEN, "cyan", "magenta", "yellow", "bright_blue", "bright_red", MODAL_LIGHT_GREEN, "bright_white")
+
+
+def print_log_lines(console: Console, lines: list[str], prefix: str = LOG_PREFIX) -> int:
+    """Print non-empty log lines in one console write; returns how many were printed."""
+    lines = [line for line in lines if line.strip()]
+    if lines:
+        # Log text is printed as-is, never as Rich markup
+        console.print(Text("\n".join(prefix + line for line in lines)), highlight=False)
+    return len(lines)
+
+
+class LogPrinter:
+    """Prints followed log lines in batches, one console write per batch.
+
+    ``put`` waits while ``buffer_size`` lines are queued, so a slow terminal
+    slows down reading from ``modal`` instead of growing memory. Leaving the
+    ``async with`` block prints whatever is still queued, also on Ctrl-C.
+    """
+
+    def __init__(self, console: Console, buffer_size: int = FOLLOW_BUFFER_LINES, prefix: str = LOG_PREFIX):
+        self.console = console
+        self.prefix = prefix
+        self.printed = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max(buffer_size, 1))
+        self._renderer: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "LogPrinter":
+        self._renderer = asyncio.create_task(self._render())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        # Let the renderer drain the queue, unless we are being cancelled
+        if exc_info[0] is None:
+            await self._queue.join()
+        self._renderer.cancel()
+        await asyncio.gather(self._renderer, return_exceptions=True)
+        self._print(self._drain(self._queue.qsize()))
+
+    async def put(self, line: str) -> None:
+        """Queue a line for printing, waiting while the buffer is full."""
+        await self._queue.put(line)
+
+    def _drain(self, limit: int) -> list[str]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            self._queue.task_done()
+        return batch
+
+    def _print(self, batch: list[str]) -> None:
+        self.printed += print_log_lines(self.console, batch, self.prefix)
+
+    async def _render(self) -> None:
+        while True:
+            first = await self._queue.get()
+            self._queue.task_done()
+            self._print([first, *self._drain(RENDER_BATCH - 1)])
+            await asyncio.sleep(RENDER_INTERVAL)
+
+
+async def fetch_log_tail(app_name: str, lines: int, timestamps: bool = False) -> tuple[CommandResult, list[str]]:
+    """The command result and the last ``lines`` non-empty log lines of an app.
+
+    Lines are streamed through a ring buffer, so memory stays proportional to
+    ``lines`` however much ``modal`` prints. With ``timestamps``, each line
+    starts with the time Modal logged it.
+    """
+    tail: deque[str] = deque(maxlen=max(lines, 1))
+    stderr: deque[str] = deque(maxlen=STDERR_TAIL)
+
+    def collect(stream: str, line: str) -> None:
+        if stream == "stdout":
+            if line.strip():
+                tail.append(line)
+        else:
+            stderr.append(line)
+
+    args = ["app", "logs", app_name, "--tail", str(lines)]
+    if timestamps:
+        args.append("--timestamps")
+    result = await stream_modal(*args, on_line=collect, timeout=DEFAULT_TIMEOUT)
+    result.stderr = "\n".join(stderr)
+    return result, list(tail)
+
+
+async def follow_logs(app_name: str, printer: LogPrinter, writer: ArchiveWriter | None = None) -> CommandResult:
+    """Stream an app's logs to ``printer`` until ``modal`` exits.
+
+    Lines also go to ``writer`` if given, with their timestamps. Cancelling the
+    caller (Ctrl-C) kills the ``modal`` process.
+    """
+    stderr: deque[str] = deque(maxlen=STDERR_TAIL)
+
+    async def forward(stream: str, line: str) -> None:
+        if stream == "stdout":
+            if writer is not None:
+                writer.add(line)
+            await printer.put(line)
+        else:
+            stderr.append(line)
+
+    args = ["app", "logs", app_name, "--follow"]
+    if writer is not None:
+        args.append("--timestamps")
+    result = await stream_modal(*args, on_line=forward, timeout=None)
+    result.stderr = "\n".join(stderr)
+    return result
+
+
+LineFilter = Callable[[LogRecord], bool]
+
+
+def make_line_filter(pattern: str | None = None, min_level: int | None = None) -> LineFilter | None:
+    """A check that a record's text matches ``pattern`` and its level is at least ``min_level``.
+
+    Returns ``None`` when there is nothing to filter.
+
+    Raises:
+        re.error: If ``pattern`` is not a valid regular expression.
+    """
+    if pattern is None and min_level is None:
+        return None
+    regex = re.compile(pattern) if pattern else None
+
+    def keep(record: LogRecord) -> bool:
+        if regex is not None and not regex.search(record.text):
+            return False
+        return min_level is None or record.level_no >= min_level
+
+    return keep
+
+
+@dataclass
+class AppStream:
+    """Parser and counters of one app in a merged log view."""
+
+    app: str
+    style: str
+    lines: int = 0
+    filtered: int = 0
+    first_ts: float = 0.0
+    last_ts: float = 0.0
+    parser: LogParser = field(default_factory=LogParser)
+
+    def parse(self, line: str) -> LogRecord:
+        """Parse the app's next line, tracking the span of its timestamps."""
+        record = self.parser.parse(line)
+        if record.ts:
+            self.first_ts = self.first_ts or record.ts
+            self.last_ts = record.ts
+        return record
+
+    @property
+    def rate(self) -> float:
+        """Lines per second the app logged, kept or filtered, between its first and last timestamp."""
+        span = self.last_ts - self.first_ts
+        return (self.lines + self.filtered) / span if span > 0 else 0.0
+
+
+def app_streams(apps: list[str]) -> dict[str, AppStream]:
+    """Counters for each app, each with its own prefix colour."""
+    return {app: AppStream(app, APP_STYLES[i % len(APP_STYLES)]) for i, app in enumerate(apps)}
+
+
+def _merged_text(entries: list[tuple[float, str, str]], streams: dict[str, AppStream]) -> Text:
+    width = max(len(app) for app in streams)
+    text = Text()
+    for i, (ts, app, line) in enumerate(entries):
+        if i:
+            text.append("\n")
+        clock = datetime.fromtimestamp(ts).strftime("%H:%M:%S") if ts else "--:--:--"
+        text.append(f"{app:<{width}} {clock} │ ", style=streams[app].style)
+        text.append(line)
+    return text
+
+
+class MergedLogPrinter:
+    """Prints the followed logs of several apps as one stream, ordered by timestamp.
+
+    Lines from all apps wait in one heap keyed by their timestamp. A line is
+    printed once it has waited ``window`` seconds, after every earlier line, so
+    apps whose lines arrive a little late still appear in order. Lines are
+    filtered before they are queued, and ``put`` waits while ``buffer_size``
+    lines are queued, like ``LogPrinter``.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        apps: list[str],
+        window: float = REORDER_WINDOW,
+        buffer_size: int = FOLLOW_BUFFER_LINES,
+        line_filter: LineFilter | None = None,
+    ):
+        self.console = console
+        self.streams = app_streams(apps)
+        self.window = window
+        self.line_filter = line_filter
+        self.printed = 0
+        # (timestamp, arrival order, app, line, arrival time)
+        self._heap: list[tuple[float, int, str, str, float]] = []
+        self._order = itertools.count()
+        self._slots = asyncio.Semaphore(max(buffer_size, 1))
+        self._renderer: asyncio.Task | None = None
 
-    from rich.console import Console
+    async def __aenter__(self) -> "MergedLogPrinter":
+        self._renderer = asyncio.create_task(self._render())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._renderer.cancel()
+        await asyncio.gather(self._renderer, return_exceptions=True)
+        self._print(self._pop(float("inf")))
+
+    async def put(self, app: str, line: str) -> None:
+        """Queue a ``--timestamps`` line of ``app``, waiting while the buffer is full.
+
+        Lines without a timestamp, such as traceback frames, keep the timestamp
+        of the app's previous line.
+        """
+        if not line.strip():
+            return
+        stream = self.streams[app]
+        record = stream.parse(line)
+        if self.line_filter is not None and not self.line_filter(record):
+            stream.filtered += 1
+            return
+        await self._slots.acquire()
+        heapq.heappush(self._heap, (record.ts or 0.0, next(self._order), app, record.text, time.monotonic()))
+        stream.lines += 1
+
+    def _pop(self, cutoff: float) -> list[tuple[float, str, str]]:
+        """Lines, oldest first, up to the first one that arrived after ``cutoff``."""
+        ready = []
+        while self._heap and self._heap[0][4] <= cutoff:
+            ts, _, app, text, _ = heapq.heappop(self._heap)
+            ready.append((ts, app, text))
+            self._slots.release()
+        return ready
+
+    def _print(self, entries: list[tuple[float, str, str]]) -> None:
+        if entries:
+            self.console.print(_merged_text(entries, self.streams), highlight=False)
+            self.printed += len(entries)
+
+    async def _render(self) -> None:
+        while True:
+            await asyncio.sleep(RENDER_INTERVAL)
+            self._print(self._pop(time.monotonic() - self.window))
+
+
+async def follow_many_logs(printer: MergedLogPrinter, writers: dict[str, ArchiveWriter] | None = None) -> dict[str, CommandResult]:
+    """Follow the logs of every app of ``printer`` at once, one ``modal`` process each.
+
+    Returns each app's command result once all of them exit. Cancelling the
+    caller (Ctrl-C) kills every ``modal`` process.
+    """
+    writers = writers or {}
+
+    async def follow(app: str) -> CommandResult:
+        stderr: deque[str] = deque(maxlen=STDERR_TAIL)
+        writer = writers.get(app)
+
+        async def forward(stream: str, line: str) -> None:
+            if stream == "stdout":
+                if writer is not None:
+                    writer.add(line)
+                await printer.put(app, line)
+            else:
+                stderr.append(line)
+
+        result = await stream_modal("app", "logs", app, "--follow", "--timestamps", on_line=forward, timeout=None)
+        result.stderr = "\n".join(stderr)
+        return result
+
+    results = await asyncio.gather(*(follow(app) for app in printer.streams))
+    return dict(zip(printer.streams, results, strict=True))
+
+
+@dataclass
+class MergedTails:
+    """Recent logs of several apps, merged by timestamp."""
+
+    results: dict[str, CommandResult]
+    streams: dict[str, AppStream]
+    # (timestamp, app, line) of the lines that passed the filter, oldest first
+    entries: list[tuple[float, str, str]]
+    # Each app's fetched lines, unfiltered and with their timestamps
+    raw: dict[str, list[str]] = field(default_factory=dict)
+
+
+async def fetch_merged_tails(apps: list[str], lines: int, line_filter: LineFilter | None = None) -> MergedTails:
+    """Fetch the last ``lines`` lines of several apps at once and merge them by timestamp."""
+    streams = app_streams(apps)
+    fetched = dict(zip(apps, await asyncio.gather(*(fetch_log_tail(app, lines, timestamps=True) for app in apps)), strict=True))
+
+    def entries(app: str):
+        stream = streams[app]
+        for line in fetched[app][1]:
+            record = stream.parse(line)
+            if line_filter is not None and not line_filter(record):
+                stream.filtered += 1
+                continue
+            stream.lines += 1
+            yield record.ts or 0.0, app, record.text
+
+    # Each app's lines are already in order, so a k-way merge orders them all
+    merged = list(heapq.merge(*(entries(app) for app in apps), key=lambda entry: entry[0]))
+    return MergedTails(
+        results={app: result for app, (result, _) in fetched.items()},
+        streams=streams,
+        entries=merged,
+        raw={app: raw for app, (_, raw) in fetched.items()},
+    )
+
+
+def print_merged_lines(console: Console, entries: list[tuple[float, str, str]], streams: dict[str, AppStream]) -> int:
+    """Print merged ``(timestamp, app, line)`` entries in one console write; returns how many were printed."""
+    if entries:
+        console.print(_merged_text(entries, streams), highlight=False)
+    return len(entries)
+
+
+def app_stream_table(streams: dict[str, AppStream]) -> Table:
+    """Lines, filtered lines and logging rate of each app."""
+    table = Table(title="🥛 Lines per app", border_style=MODAL_GREEN)
+    table.add_column("App")
+    table.add_column("Lines", justify="right")
+    table.add_column("Filtered", justify="right")
+    table.add_column("Lines/s", justify="right")
+    for stream in streams.values():
+        table.add_row(Text(stream.app, style=stream.style), str(stream.lines), str(stream.filtered), f"{stream.rate:.1f}")
+    return table
+
+
+def archive_log_lines(app_name: str, lines: list[str]) -> None:
+    """Append fetched lines to the app's local archive, warning instead of failing."""
+    try:
+        stored = log_archive.append(app_name, lines)
+    except (sqlite3.Error, OSError) as e:
+        print_warning(f"Could not archive logs from {app_name}: {e}")
+        return
+    print_info(f"🗄️ Archived {stored} new lines from {app_name}; search them with 'modal-for-noobs logs query'")
+
+
+def open_archive_writer(app_name: str) -> ArchiveWriter | None:
+    """A writer into the app's local archive, or ``None`` with a warning if it cannot be opened."""
+    try:
+        return log_archive.writer(app_name)
+    except (sqlite3.Error, OSError) as e:
+        print_warning(f"Could not archive logs from {app_name}: {e}")
+        return None
+
+
+def close_archive_writer(writer: ArchiveWriter, app_name: str) -> None:
+    """Write out what is buffered and report how much was archived."""
+    try:
+        writer.close()
+    except (sqlite3.Error, OSError) as e:
+        print_warning(f"Could not archive logs from {app_name}: {e}")
+        return
+    print_info(f"🗄️ Archived {writer.written} new lines from {app_name}; search them with 'modal-for-noobs logs query'")
+
+
+async def milk_logs_async(
+    app_name: str | None = None,
+    follow: bool = False,
+    lines: int = 100,
+    br_huehuehue: bool = False,
+    archive: bool = False,
+    deployer: "ModalDeployer | None" = None,
+    console: Console | None = None,
+) -> None:
+    """Async log milking functionality - get those creamy logs! 🥛.
+
+    ``deployer`` checks authentication and ``console`` shows progress; both
+    default to new ones.
+    """
     from rich.progress import Progress, SpinnerColumn, TextColumn
 
-    console = Console()
+    if deployer is None:
+        from modal_for_noobs.modal_deploy import ModalDeployer
+
+        deployer = ModalDeployer(app_file=Path("dummy"), mode="minimum")
+    console = console or Console()
 
     with Progress(
         SpinnerColumn(spinner_name="dots", style=f"{MODAL_GREEN}"),
@@ -42,15 +451,12 @@ async def milk_logs_async(app_name: str | None = None, follow: bool = False, lin
             list_task = progress.add_task("📋 Finding apps to milk logs from...", total=None)
 
             try:
-                process = await asyncio.create_subprocess_exec(
-                    "modal", "app", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
+                result = await run_modal("app", "list")
 
                 progress.update(list_task, description="✅ Apps found!")
 
-                if process.returncode == 0:
-                    output = stdout.decode().strip()
+                if result.ok:
+                    output = result.stdout.strip()
                     if output:
                         if br_huehuehue:
                             rprint(f"\n[{MODAL_GREEN}]🥛 Apps disponíveis para ordenhar logs (huehuehue!):[/{MODAL_GREEN}]")
@@ -72,7 +478,7 @@ async def milk_logs_async(app_name: str | None = None, follow: bool = False, lin
                         else:
                             rprint(f"\n[{MODAL_LIGHT_GREEN}]✨ No apps to milk logs from! Deploy something first![/{MODAL_LIGHT_GREEN}]")
                 else:
-                    error_msg = stderr.decode().strip()
+                    error_msg = result.error
                     if br_huehuehue:
                         print_error(f"Erro ao listar apps: {error_msg}")
                     else:
@@ -90,46 +496,66 @@ async def milk_logs_async(app_name: str | None = None, follow: bool = False, lin
             milk_task = progress.add_task(f"🥛 Milking logs from {app_name}...", total=None)
 
             try:
-                # Build modal logs command - Modal CLI uses different syntax
-                cmd = ["modal", "app", "logs", app_name]
                 if follow:
-                    cmd.append("--follow")
+                    if br_huehuehue:
+                        rprint(f"\n[{MODAL_GREEN}]🥛 Ordenhando logs de {app_name} ao vivo (Ctrl-C para parar, huehuehue!):[/{MODAL_GREEN}]")
+                    else:
+                        rprint(f"\n[{MODAL_GREEN}]🥛 Following fresh creamy logs from {app_name} (Ctrl-C to stop):[/{MODAL_GREEN}]")
 
-                # For non-follow mode, get all logs at once
-                process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-                stdout, stderr = await process.communicate()
+                    writer = open_archive_writer(app_name) if archive else None
+                    try:
+                        async with LogPrinter(progress.console) as printer:
+                            result = await follow_logs(app_name, printer, writer)
+                    except asyncio.CancelledError:
+                        progress.update(milk_task, description=f"🛑 Stopped following {app_name}")
+                        raise
+                    finally:
+                        if writer is not None:
+                            close_archive_writer(writer, app_name)
 
-                if process.returncode == 0:
+                    if result.ok:
+                        progress.update(milk_task, description=f"✅ Log stream from {app_name} ended!")
+                        if br_huehuehue:
+                            print_success(f"Logs ordenhados com sucesso de {app_name}! ({printer.printed} linhas) Huehuehue!")
+                        else:
+                            print_success(f"Successfully milked {printer.printed} lines of creamy logs from {app_name}!")
+                    else:
+                        progress.update(milk_task, description="❌ Failed to milk logs!")
+                        if br_huehuehue:
+                            print_error(f"Erro ao ordenhar logs: {result.error}")
+                        else:
+                            print_error(f"Failed to milk logs: {result.error}")
+                    return
+
+                result, log_lines = await fetch_log_tail(app_name, lines, timestamps=archive)
+
+                if result.ok:
                     progress.update(milk_task, description=f"✅ Logs milked from {app_name}!")
 
-                    logs = stdout.decode().strip()
-                    if logs:
+                    if log_lines:
                         if br_huehuehue:
                             rprint(f"\n[{MODAL_GREEN}]🥛 Logs fresquinhos de {app_name} (huehuehue!):[/{MODAL_GREEN}]")
                         else:
                             rprint(f"\n[{MODAL_GREEN}]🥛 Fresh creamy logs from {app_name}:[/{MODAL_GREEN}]")
                         rprint("=" * 80)
 
-                        # Pretty print logs with milk emojis (limit to requested lines)
-                        log_lines = logs.split("\n")
-                        displayed_lines = log_lines[-lines:] if len(log_lines) > lines else log_lines
-
-                        for line in displayed_lines:
-                            if line.strip():
-                                rprint(f"🥛 {line}")
+                        # Pretty print logs with milk emojis, in one write
+                        print_log_lines(progress.console, log_lines)
 
                         rprint("=" * 80)
                         if br_huehuehue:
-                            print_success(f"Logs ordenhados com sucesso de {app_name}! ({len(displayed_lines)} linhas) Huehuehue!")
+                            print_success(f"Logs ordenhados com sucesso de {app_name}! ({len(log_lines)} linhas) Huehuehue!")
                         else:
-                            print_success(f"Successfully milked {len(displayed_lines)} lines of creamy logs from {app_name}!")
+                            print_success(f"Successfully milked {len(log_lines)} lines of creamy logs from {app_name}!")
+                        if archive:
+                            archive_log_lines(app_name, log_lines)
                     else:
                         if br_huehuehue:
                             rprint(f"\n[{MODAL_LIGHT_GREEN}]📝 Nenhum log encontrado para {app_name}![/{MODAL_LIGHT_GREEN}]")
                         else:
                             rprint(f"\n[{MODAL_LIGHT_GREEN}]📝 No logs found for {app_name}![/{MODAL_LIGHT_GREEN}]")
                 else:
-                    error_msg = stderr.decode().strip()
+                    error_msg = result.error
                     progress.update(milk_task, description="❌ Failed to milk logs!")
                     if br_huehuehue:
                         print_error(f"Erro ao ordenhar logs: {error_msg}")
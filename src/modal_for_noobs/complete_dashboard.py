@@ -33,9 +33,13 @@ except ImportError as e:
     print(f"❌ Modal import failed: {e}")
     print("Install with: pip install modal")
 
+from modal_for_noobs.app_list_cache import app_list_cache, invalidate_apps
 from modal_for_noobs.auth_manager import ModalAuthConfig, ModalAuthManager
 from modal_for_noobs.cli_helpers.common import MODAL_DARK_GREEN, MODAL_GREEN, MODAL_LIGHT_GREEN
-from modal_for_noobs.modal_deploy import ModalDeployer
+from modal_for_noobs.log_parser import format_record, parse_log_text
+from modal_for_noobs.modal_backends import ModalBackendError
+from modal_for_noobs.modal_deploy import ModalAPI, ModalDeployer
+from modal_for_noobs.subprocess_runner import run_modal
 from modal_for_noobs.template_generator import generate_from_wizard_input
 
 # Create a global event loop for Modal operations
@@ -595,70 +599,31 @@ demo.launch()""",
                         """)
 
             # Monitoring functions
+            modal_api = ModalAPI()
+
             async def refresh_deployments():
                 """Refresh the deployments list from Modal."""
                 try:
-                    import asyncio
-                    import subprocess
-                    from datetime import datetime
-
-                    # Run modal app list command
-                    process = await asyncio.create_subprocess_exec(
-                        "modal", "app", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                    )
-                    stdout, stderr = await process.communicate()
+                    # Served from the shared app list cache
+                    try:
+                        apps = await app_list_cache.get(modal_api.backend.cache_key, modal_api.backend.list_apps)
+                    except ModalBackendError as e:
+                        return gr.update(value=[["Error", "Failed to list apps", "", "", "", str(e)]]), []
 
-                    if process.returncode != 0:
-                        error_msg = stderr.decode() if stderr else "Unknown error"
-                        return gr.update(value=[["Error", "Failed to list apps", "", "", "", error_msg]]), []
-
-                    # Parse the output
-                    output = stdout.decode()
                     deployments = []
                     app_choices = []
-
-                    lines = output.strip().split("\n")
-                    for line in lines:
-                        line = line.strip()
-                        if (
-                            not line
-                            or "─" in line
-                            or line.startswith("app_id")
-                            or line.startswith("App")
-                            or line.startswith("Created")
-                            or "App" in line
-                            or "Status" in line
-                            or "URL" in line
-                            or "GPU" in line
-                            or "Cost" in line
-                        ):
-                            continue
-
-                        # Parse app line - format: app_id state created_at url
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            app_id = parts[0]
-                            state = parts[1] if len(parts) > 1 else "unknown"
-                            created = parts[2] if len(parts) > 2 else "unknown"
-                            url = "N/A"
-
-                            # Try to extract URL if present
-                            if "modal.run" in line:
-                                url_parts = [p for p in parts if "modal.run" in p]
-                                if url_parts:
-                                    url = url_parts[0]
-
-                            deployments.append(
-                                [
-                                    app_id,
-                                    state,
-                                    url,
-                                    created,
-                                    "CPU",  # Default GPU type
-                                    "$0.30/hr",  # Estimated cost
-                                ]
-                            )
-                            app_choices.append(app_id)
+                    for app in apps:
+                        deployments.append(
+                            [
+                                app.app_id,
+                                app.state,
+                                app.url or "N/A",
+                                app.created_at or "unknown",
+                                "CPU",  # Default GPU type
+                                "$0.30/hr",  # Estimated cost
+                            ]
+                        )
+                        app_choices.append(app.app_id)
 
                     if not deployments:
                         deployments = [["No deployments found", "N/A", "", "", "", ""]]
@@ -685,22 +650,16 @@ demo.launch()""",
                     if not app_id or app_id.strip() == "":
                         return "❌ Please select an app to stop", gr.update()
 
-                    import asyncio
-                    import subprocess
-
                     # Run modal app stop command
-                    process = await asyncio.create_subprocess_exec(
-                        "modal", "app", "stop", app_id, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                    )
-                    stdout, stderr = await process.communicate()
+                    result = await run_modal("app", "stop", app_id)
 
-                    if process.returncode == 0:
+                    if result.ok:
+                        invalidate_apps()
                         # Refresh deployments after stopping
                         new_data, new_choices = await refresh_deployments()
                         return f"✅ Successfully stopped {app_id}", new_data
                     else:
-                        error_msg = stderr.decode() if stderr else "Unknown error"
-                        return f"❌ Failed to stop {app_id}: {error_msg}", gr.update()
+                        return f"❌ Failed to stop {app_id}: {result.error}", gr.update()
 
                 except Exception as e:
                     logger.error(f"Error stopping deployment: {e}")
@@ -722,24 +681,17 @@ demo.launch()""",
                     if not app_id or app_id.strip() == "":
                         return "❌ Please select an app to view logs", ""
 
-                    import asyncio
-                    import subprocess
-
                     # Run modal app logs command
-                    process = await asyncio.create_subprocess_exec(
-                        "modal", "app", "logs", app_id, "--lines", "100", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                    )
-                    stdout, stderr = await process.communicate()
+                    result = await run_modal("app", "logs", app_id, "--tail", "100", "--timestamps")
 
-                    if process.returncode == 0:
-                        logs = stdout.decode()
+                    if result.ok:
+                        logs = "\n".join(format_record(record) for record in parse_log_text(result.stdout))
                         if logs.strip():
                             return f"✅ Logs for {app_id}", logs
                         else:
                             return f"✅ No logs found for {app_id}", "No logs available yet."
                     else:
-                        error_msg = stderr.decode() if stderr else "Unknown error"
-                        return f"❌ Failed to get logs for {app_id}: {error_msg}", ""
+                        return f"❌ Failed to get logs for {app_id}: {result.error}", ""
 
                 except Exception as e:
                     logger.error(f"Error getting logs: {e}")
@@ -1,6 +1,7 @@
 """Configuration loader for Modal-for-noobs."""
 
 from pathlib import Path
+from typing import Any
 
 import yaml
 from loguru import logger
@@ -53,6 +54,17 @@ class ConfigLoader:
                 ],
             }
 
+    def load_import_packages(self) -> dict[str, Any]:
+        """Load the offline import-to-package mapping used for minimal images."""
+        try:
+            config_file = self.config_dir / "import_packages.yml"
+            with open(config_file) as f:
+                return yaml.safe_load(f)
+        except Exception as e:
+            logger.warning(f"Could not load import package mapping: {e}")
+            # Without the mapping nothing is known to be optional, so images stay complete
+            return {"mode_imports": {}, "provided_imports": [], "distributions": {}}
+
     def load_modal_marketing(self) -> dict[str, any]:
         """Load Modal marketing content."""
         try:
@@ -2,7 +2,6 @@
 
 import asyncio
 import json
-import re
 import subprocess
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -14,11 +13,15 @@ import httpx
 from loguru import logger
 from rich import print as rprint
 
+# Import ModalDeployer for deployment functionality
+from modal_for_noobs.app_list_cache import invalidate_apps
+
 # Import Modal color palette from common module
 from modal_for_noobs.cli_helpers.common import MODAL_BLACK, MODAL_DARK_GREEN, MODAL_GREEN, MODAL_LIGHT_GREEN
-
-# Import ModalDeployer for deployment functionality
-from modal_for_noobs.modal_deploy import ModalDeployer
+from modal_for_noobs.log_parser import format_record, parse_log_text
+from modal_for_noobs.modal_deploy import ModalAPI, ModalDeployer
+from modal_for_noobs.modal_listings import AppInfo
+from modal_for_noobs.subprocess_runner import run_modal
 from modal_for_noobs.ui.components import ModalStatusMonitor
 
 # Import new UI components and themes
@@ -57,9 +60,15 @@ class ModalDeployment:
             self.functions = []
 
     def estimate_hourly_cost(self) -> float:
-        """Estimate hourly cost based on GPU type."""
-        if self.gpu_type and self.gpu_type in GPU_COSTS:
-            return GPU_COSTS[self.gpu_type] * self.containers
+        """Estimate hourly cost based on GPU type.
+
+        Accepts Modal's GPU strings such as ``A100-80GB`` or ``H100:2``; unknown
+        types are priced as CPU.
+        """
+        gpu, _, count = (self.gpu_type or "").partition(":")
+        gpu = gpu.split("-", 1)[0]
+        if gpu in GPU_COSTS:
+            return GPU_COSTS[gpu] * (int(count) if count.isdigit() else 1) * self.containers
         return GPU_COSTS["CPU"] * self.containers
 
     def calculate_running_cost(self) -> float:
@@ -68,141 +77,83 @@ class ModalDeployment:
         return (self.runtime_minutes / 60.0) * hourly_cost
 
 
+def _runtime_minutes(app: AppInfo) -> float:
+    """Minutes between an app's creation and its stop (or now), from the app list."""
+    try:
+        created_at = datetime.fromisoformat(app.created_at)
+        stopped_at = datetime.fromisoformat(app.stopped_at) if app.stopped_at else datetime.now(timezone.utc)
+        return max((stopped_at - created_at).total_seconds() / 60.0, 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _format_uptime(minutes: float) -> str:
+    """Uptime such as ``2d 3h``, ``4h 12m`` or ``7m``."""
+    hours, mins = divmod(int(minutes), 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {mins}m"
+    return f"{mins}m"
+
+
 class ModalDashboard:
     """Dashboard for monitoring and managing Modal deployments."""
 
     def __init__(self):
         self.deployments: list[ModalDeployment] = []
         self.refresh_interval = 30  # seconds
+        self.modal_api = ModalAPI()
 
     async def fetch_deployments(self) -> list[ModalDeployment]:
-        """Fetch current deployments from Modal CLI."""
+        """Fetch current deployments through the shared, cached app list."""
         try:
-            # Run modal app list command
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                logger.error(f"Failed to fetch deployments: {stderr.decode()}")
-                return []
-
-            # Parse text output - Modal CLI doesn't support JSON yet
-            return await self._parse_text_output(stdout.decode())
-
+            return await self._build_deployments(await self.modal_api.list_deployments())
         except Exception as e:
             logger.error(f"Error fetching deployments: {e}")
             return []
 
-    async def _parse_text_output(self, output: str) -> list[ModalDeployment]:
-        """Parse text output from modal app list command with enhanced parsing."""
-        deployments = []
-        lines = output.strip().split("\n")
-
-        # Look for actual deployment lines (skip headers and separators)
-        for line in lines:
-            line = line.strip()
-            if not line or "─" in line or line.startswith("app_id") or line.startswith("App"):
-                continue
-
-            # Parse app lines - format varies but typically: app_id state created_at
-            parts = line.split()
-            if len(parts) >= 2:
-                app_id = parts[0]
-                state = parts[1] if len(parts) > 1 else "unknown"
-                created_at = " ".join(parts[2:]) if len(parts) > 2 else "Unknown"
-
-                # Try to extract more details for each app
-                app_details = await self._get_app_details(app_id)
-
-                deployment = ModalDeployment(
-                    app_id=app_id,
-                    app_name=app_details.get("name", app_id),
-                    created_at=created_at,
-                    state=state,
-                    url=app_details.get("url"),
-                    gpu_type=app_details.get("gpu_type", "CPU"),
-                    runtime_minutes=app_details.get("runtime_minutes", 0.0),
-                    estimated_cost=0.0,  # Calculate based on runtime
-                    uptime=app_details.get("uptime", "Unknown"),
-                    containers=app_details.get("containers", 1),
-                    functions=app_details.get("functions", []),
-                )
-
-                # Calculate estimated cost
-                deployment.estimated_cost = deployment.calculate_running_cost()
-                deployments.append(deployment)
-
-        return deployments
-
-    async def _get_app_details(self, app_id: str) -> dict[str, Any]:
-        """Get detailed information about a specific app."""
-        details = {
-            "name": app_id,
-            "url": None,
-            "gpu_type": "CPU",
-            "runtime_minutes": 0.0,
-            "uptime": "Unknown",
-            "containers": 1,
-            "functions": [],
-        }
+    async def _build_deployments(self, apps: list[AppInfo]) -> list[ModalDeployment]:
+        """Turn listed apps into deployments, with details fetched concurrently."""
+        details = await self.modal_api.get_many_app_details([app.app_id for app in apps])
 
-        try:
-            # Try to get app logs to extract more information
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "logs", app_id, "--lines", "5", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        deployments = []
+        for app in apps:
+            app_details = details[app.app_id]
+            runtime_minutes = _runtime_minutes(app)
+
+            deployment = ModalDeployment(
+                app_id=app.app_id,
+                app_name=app.name,
+                created_at=app.created_at or "Unknown",
+                state=app.state,
+                url=app.url or app_details.get("url"),
+                # Unknown when the backend cannot tell, rather than guessing CPU
+                gpu_type=app_details.get("gpu_type", "Unknown"),
+                runtime_minutes=runtime_minutes,
+                estimated_cost=0.0,  # Calculate based on runtime
+                uptime=_format_uptime(runtime_minutes) if runtime_minutes else "Unknown",
+                containers=app.tasks,
+                functions=app_details.get("functions", []),
             )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                logs = stdout.decode()
-
-                # Extract URL from logs
-                url_match = re.search(r"https://[^\s]+\.modal\.run[^\s]*", logs)
-                if url_match:
-                    details["url"] = url_match.group()
-
-                # Look for GPU mentions in logs
-                if "T4" in logs:
-                    details["gpu_type"] = "T4"
-                elif "L4" in logs:
-                    details["gpu_type"] = "L4"
-                elif "A10G" in logs:
-                    details["gpu_type"] = "A10G"
-                elif "A100" in logs:
-                    details["gpu_type"] = "A100"
-                elif "H100" in logs:
-                    details["gpu_type"] = "H100"
-
-                # Estimate runtime from timestamps in logs
-                timestamps = re.findall(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", logs)
-                if len(timestamps) >= 2:
-                    try:
-                        start_time = datetime.fromisoformat(timestamps[0].replace("Z", "+00:00"))
-                        end_time = datetime.fromisoformat(timestamps[-1].replace("Z", "+00:00"))
-                        runtime = (end_time - start_time).total_seconds() / 60.0
-                        details["runtime_minutes"] = runtime
-                    except Exception:
-                        pass
 
-        except Exception as e:
-            logger.debug(f"Could not get details for app {app_id}: {e}")
+            # Calculate estimated cost
+            deployment.estimated_cost = deployment.calculate_running_cost()
+            deployments.append(deployment)
 
-        return details
+        return deployments
 
     async def stop_deployment(self, app_id: str) -> dict[str, Any]:
         """Stop a specific deployment."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "stop", app_id, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            result = await run_modal("app", "stop", app_id)
 
-            if process.returncode == 0:
+            if result.ok:
+                invalidate_apps()
                 return {"success": True, "message": f"Successfully stopped {app_id}"}
             else:
-                return {"success": False, "message": stderr.decode()}
+                return {"success": False, "message": result.error}
 
         except Exception as e:
             return {"success": False, "message": str(e)}
@@ -210,18 +161,12 @@ class ModalDashboard:
     async def fetch_logs(self, app_id: str, lines: int = 100) -> str:
         """Fetch logs for a specific deployment."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "logs", app_id, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            result = await run_modal("app", "logs", app_id, "--tail", str(lines), "--timestamps")
 
-            if process.returncode == 0:
-                logs = stdout.decode()
-                # Return last N lines
-                log_lines = logs.split("\n")
-                return "\n".join(log_lines[-lines:])
+            if result.ok:
+                return "\n".join(format_record(record) for record in parse_log_text(result.stdout))
             else:
-                return f"Error fetching logs: {stderr.decode()}"
+                return f"Error fetching logs: {result.error}"
 
         except Exception as e:
             return f"Error fetching logs: {str(e)}"
@@ -0,0 +1,143 @@
+"""Local ledger of successful Modal deployments.
+
+Each successful ``modal deploy`` records the digest of the deployed file along
+with the URL and app ID Modal reported. A later deploy of a byte-identical file
+can then be answered from the ledger instead of rebuilding and re-uploading.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from modal_for_noobs.render_cache import atomic_write_text, default_state_dir
+
+
+def file_digest(path: Path) -> str:
+    """Get the SHA-256 digest of a file's contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@dataclass
+class LedgerEntry:
+    """Record of the last successful deployment of an app."""
+
+    app_name: str
+    digest: str
+    url: str | None = None
+    app_id: str | None = None
+    deployment_file: str | None = None
+    deployed_at: str | None = None
+    deployment_time: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LedgerEntry":
+        """Create from dictionary, ignoring unknown keys."""
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
+
+
+class DeploymentLedger:
+    """Per-app records of the last successful deploy, one JSON file per app."""
+
+    def __init__(self, ledger_dir: Path | None = None):
+        """Initialize the ledger.
+
+        Args:
+            ledger_dir: Directory holding ledger entries. Defaults to
+                ``deployments`` under the modal-for-noobs state directory.
+        """
+        self._ledger_dir = ledger_dir
+
+    @property
+    def ledger_dir(self) -> Path:
+        """Directory holding one JSON record per app."""
+        return self._ledger_dir or default_state_dir() / "deployments"
+
+    def _entry_path(self, app_name: str) -> Path:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", app_name)
+        return self.ledger_dir / f"{safe_name}.json"
+
+    def get(self, app_name: str) -> LedgerEntry | None:
+        """Get the last successful deployment of an app, if any."""
+        try:
+            return LedgerEntry.from_dict(json.loads(self._entry_path(app_name).read_text()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable ledger entry for {app_name}: {e}")
+            return None
+
+    def is_unchanged(self, app_name: str, digest: str) -> LedgerEntry | None:
+        """Get the ledger entry if the app was last deployed with ``digest``."""
+        entry = self.get(app_name)
+        if entry and entry.digest == digest:
+            return entry
+        return None
+
+    def record(
+        self,
+        app_name: str,
+        digest: str,
+        url: str | None = None,
+        app_id: str | None = None,
+        deployment_file: Path | None = None,
+        deployment_time: float | None = None,
+    ) -> LedgerEntry:
+        """Record a successful deployment."""
+        entry = LedgerEntry(
+            app_name=app_name,
+            digest=digest,
+            url=url,
+            app_id=app_id,
+            deployment_file=str(deployment_file) if deployment_file else None,
+            deployed_at=datetime.now(timezone.utc).isoformat(),
+            deployment_time=deployment_time,
+        )
+        try:
+            atomic_write_text(self._entry_path(app_name), json.dumps(entry.to_dict(), indent=2))
+        except OSError as e:
+            logger.warning(f"Could not update deployment ledger for {app_name}: {e}")
+        return entry
+
+    def forget(self, identifier: str) -> bool:
+        """Drop the records matching an app name or app ID.
+
+        Returns:
+            bool: True if any record was removed.
+        """
+        removed = False
+        direct = self._entry_path(identifier)
+        if direct.exists():
+            direct.unlink(missing_ok=True)
+            removed = True
+
+        for entry in self.entries():
+            if entry.app_id == identifier:
+                self._entry_path(entry.app_name).unlink(missing_ok=True)
+                removed = True
+        return removed
+
+    def entries(self) -> list[LedgerEntry]:
+        """Get all ledger entries."""
+        if not self.ledger_dir.exists():
+            return []
+        entries = []
+        for path in sorted(self.ledger_dir.glob("*.json")):
+            try:
+                entries.append(LedgerEntry.from_dict(json.loads(path.read_text())))
+            except (OSError, ValueError, TypeError):
+                continue
+        return entries
+
+
+# Global deployment ledger instance
+deployment_ledger = DeploymentLedger()
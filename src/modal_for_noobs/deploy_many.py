@@ -0,0 +1,171 @@
+"""Concurrent deployment of many Gradio apps.
+
+Targets come from a glob pattern or a YAML manifest. Each target runs through
+``ModalDeployer.deploy`` behind a shared semaphore, so image builds and uploads
+for independent apps overlap instead of running one after another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import glob
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import yaml
+from loguru import logger
+
+if TYPE_CHECKING:
+    from modal_for_noobs.modal_deploy import DeploymentResult
+
+MANIFEST_SUFFIXES = (".yml", ".yaml")
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass
+class DeployTarget:
+    """One app to deploy in a batch."""
+
+    app_file: Path
+    mode: str = "minimum"
+    app_name: str | None = None
+
+    @property
+    def name(self) -> str:
+        """Modal app name of the target."""
+        return self.app_name or self.app_file.stem
+
+
+@dataclass
+class BatchItem:
+    """Live state and outcome of one target in a batch deploy."""
+
+    target: DeployTarget
+    status: str = "queued"
+    result: DeploymentResult | None = None
+    started_at: float | None = None
+    elapsed: float | None = None
+    last_line: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "app_file": str(self.target.app_file),
+            "app_name": self.target.name,
+            "mode": self.target.mode,
+            "status": self.status,
+            "elapsed": self.elapsed,
+            "result": self.result.to_dict() if self.result else None,
+        }
+
+
+def load_manifest(manifest: Path, default_mode: str = "minimum") -> list[DeployTarget]:
+    """Load deploy targets from a YAML manifest.
+
+    The manifest is either a list of entries or a mapping with an ``apps`` list.
+    Each entry is a path string or a mapping with ``path`` and optional
+    ``mode`` and ``name``. Relative paths resolve against the manifest folder.
+
+    Raises:
+        ValueError: If the manifest is not shaped as described above.
+    """
+    data = yaml.safe_load(manifest.read_text()) or []
+    entries = data.get("apps", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError(f"Manifest {manifest} must contain a list of apps")
+
+    targets = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        if not isinstance(entry, dict) or "path" not in entry:
+            raise ValueError(f"Invalid manifest entry in {manifest}: {entry!r}")
+        app_file = Path(entry["path"])
+        if not app_file.is_absolute():
+            app_file = manifest.parent / app_file
+        targets.append(DeployTarget(app_file=app_file, mode=entry.get("mode", default_mode), app_name=entry.get("name")))
+    return targets
+
+
+def discover_targets(source: str, default_mode: str = "minimum") -> list[DeployTarget]:
+    """Resolve a glob pattern or manifest path into deploy targets.
+
+    Generated ``modal_*.py`` files are skipped when globbing so a second run
+    does not try to deploy the previous run's output.
+    """
+    path = Path(source)
+    if path.suffix in MANIFEST_SUFFIXES and path.is_file():
+        return load_manifest(path, default_mode)
+
+    app_files = sorted(Path(match) for match in glob.glob(source, recursive=True))
+    return [
+        DeployTarget(app_file=app_file, mode=default_mode)
+        for app_file in app_files
+        if app_file.suffix == ".py" and app_file.is_file() and not app_file.name.startswith("modal_")
+    ]
+
+
+async def deploy_many(
+    targets: list[DeployTarget],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    skip_unchanged: bool = False,
+    use_cache: bool = True,
+    dashboard_runtime: str = "embedded",
+    on_update: Callable[[list[BatchItem]], None] | None = None,
+) -> list[BatchItem]:
+    """Deploy targets concurrently with at most ``concurrency`` in flight.
+
+    Args:
+        targets: Apps to deploy.
+        concurrency: Maximum number of simultaneous deployments.
+        skip_unchanged: Passed through to ``ModalDeployer.deploy``.
+        use_cache: Whether deployers use the shared render cache.
+        dashboard_runtime: How generated files get the dashboard module, see ``DASHBOARD_RUNTIMES``.
+        on_update: Called with every item whenever one changes state, for live display.
+
+    Returns:
+        list[BatchItem]: One item per target, in target order.
+    """
+    from modal_for_noobs.modal_deploy import DeploymentConfig, DeploymentResult, ModalDeployer
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    items = [BatchItem(target=target) for target in targets]
+
+    def notify() -> None:
+        if on_update:
+            on_update(items)
+
+    async def run(item: BatchItem) -> None:
+        async with semaphore:
+            target = item.target
+            item.status = "deploying"
+            item.started_at = time.perf_counter()
+            notify()
+
+            def on_output(stream: str, line: str) -> None:
+                if line.strip():
+                    item.last_line = line.strip()
+                    notify()
+
+            config = DeploymentConfig(mode=target.mode, app_name=target.name, dashboard_runtime=dashboard_runtime)
+            deployer = ModalDeployer(app_file=target.app_file, mode=target.mode, config=config, use_cache=use_cache, on_output=on_output)
+            try:
+                item.result = await deployer.deploy(skip_unchanged=skip_unchanged)
+            except Exception as e:
+                logger.error(f"Deployment of {target.name} failed: {e}")
+                item.result = DeploymentResult(success=False, error=str(e), config=config)
+            finally:
+                await deployer.close()
+
+            item.elapsed = time.perf_counter() - item.started_at
+            if item.result.skipped:
+                item.status = "skipped"
+            else:
+                item.status = "deployed" if item.result.success else "failed"
+            notify()
+
+    await asyncio.gather(*(run(item) for item in items))
+    return items
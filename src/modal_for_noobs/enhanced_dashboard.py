@@ -22,8 +22,8 @@ from modal_for_noobs.easy_auth import easy_modal_auth
 from modal_for_noobs.template_generator import (
     RemoteFunctionConfig,
     TemplateConfig,
-    TemplateGenerator,
     generate_from_wizard_input,
+    get_template_generator,
 )
 
 
@@ -32,7 +32,7 @@ class EnhancedModalDashboard:
 
     def __init__(self):
         """Initialize the enhanced dashboard."""
-        self.template_generator = TemplateGenerator()
+        self.template_generator = get_template_generator()
         self.is_authenticated = False
         self.current_workspace = None
 
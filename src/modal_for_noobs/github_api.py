@@ -12,6 +12,8 @@ from typing import Any, Dict, List, Optional
 import httpx
 from loguru import logger
 
+from modal_for_noobs.app_analyzer import analyze_source
+
 
 class GitHubAPI:
     """Enhanced async GitHub API client for Modal examples with advanced functionality."""
@@ -344,14 +346,14 @@ class ModalExamplesAPI(GitHubAPI):
             return {"valid": False, "reason": "Could not fetch file content"}
 
         # Check for Modal-specific patterns
-        has_gradio = "import gradio" in content or "from gradio" in content
-        has_modal = "import modal" in content or "from modal" in content
+        analysis = analyze_source(content)
+        has_gradio = analysis.has_gradio
+        has_modal = "modal" in analysis.imports
         has_main_block = "if __name__" in content
-        has_fastapi = "FastAPI" in content or "from fastapi" in content
+        has_fastapi = "fastapi" in analysis.imports
 
         # Check for ML libraries
-        ml_libraries = ["torch", "tensorflow", "transformers", "sklearn", "numpy", "pandas"]
-        detected_ml = [lib for lib in ml_libraries if lib in content]
+        detected_ml = analysis.ml_libraries
 
         # Determine deployment compatibility
         if has_modal:
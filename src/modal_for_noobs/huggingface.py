@@ -13,6 +13,8 @@ from huggingface_hub import hf_hub_download, list_repo_files
 from loguru import logger
 from rich import print as rprint
 
+from modal_for_noobs.requirements import RequirementSet, read_requirements
+
 
 class HuggingFaceSpacesMigrator:
     """Async-first HuggingFace Spaces to Modal migrator."""
@@ -104,8 +106,7 @@ class HuggingFaceSpacesMigrator:
         requirements_file = local_dir / "requirements.txt"
         extra_packages = []
         if requirements_file.exists():
-            requirements_content = await asyncio.to_thread(requirements_file.read_text, encoding="utf-8")
-            extra_packages = [line.strip() for line in requirements_content.split("\n") if line.strip() and not line.startswith("#")]
+            extra_packages = (await asyncio.to_thread(read_requirements, requirements_file)).to_list()
 
         # Generate Modal deployment
         mode = "optimized" if optimized else "minimum"
@@ -128,8 +129,8 @@ class HuggingFaceSpacesMigrator:
                 "pandas>=1.3.0",
             ]
 
-        # Combine packages
-        all_packages = base_packages + extra_packages
+        # Combine packages, one merged entry per distribution
+        all_packages = RequirementSet([*base_packages, *extra_packages]).to_list()
         packages_str = ",\n    ".join(f'"{pkg}"' for pkg in all_packages)
 
         # GPU configuration
@@ -0,0 +1,198 @@
+"""Minimal image package resolution from an app's import graph.
+
+Walks the imports of the app and of the local modules next to it, maps them
+to distributions with the offline table in ``config/import_packages.yml``, and
+drops the heavy optional packages of a mode's base list that nothing imports.
+Imports the table does not know are reported, never guessed.
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from modal_for_noobs.app_analyzer import analyze_source
+from modal_for_noobs.config_loader import config_loader
+
+# Upper bound on local modules followed from one app
+MAX_LOCAL_MODULES = 200
+
+_DIST_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def distribution_name(requirement: str) -> str:
+    """Normalized distribution name of a requirement such as ``torch>=2.0.0``."""
+    match = _DIST_NAME.match(requirement)
+    name = match.group(1) if match else requirement.strip()
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclass
+class ImageResolution:
+    """Packages for a minimal image and what the import graph changed."""
+
+    packages: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    unknown_imports: list[str] = field(default_factory=list)
+    local_modules: list[Path] = field(default_factory=list)
+    estimated_saved_mb: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "packages": self.packages,
+            "dropped": self.dropped,
+            "added": self.added,
+            "unknown_imports": self.unknown_imports,
+            "local_modules": [str(path) for path in self.local_modules],
+            "estimated_saved_mb": self.estimated_saved_mb,
+        }
+
+
+def _local_module_files(root: Path, name: str) -> list[Path]:
+    """Source files of the local module or package ``name`` under ``root``."""
+    module_file = root / f"{name}.py"
+    if module_file.is_file():
+        return [module_file]
+    package_dir = root / name
+    if (package_dir / "__init__.py").is_file():
+        return sorted(package_dir.rglob("*.py"))
+    return []
+
+
+def _walk_import_graph(app_file: Path, source: str | None = None) -> tuple[set[str], list[Path], set[str]]:
+    """Follow imports from ``app_file`` through the local modules next to it.
+
+    Returns:
+        tuple: All imported top-level names, the local module files visited,
+        and the names that resolved to local modules.
+    """
+    root = app_file.parent
+    pending = [(app_file, source)]
+    seen: set[Path] = {app_file.resolve()}
+    imports: set[str] = set()
+    local_names: set[str] = set()
+    local_files: list[Path] = []
+
+    while pending:
+        path, text = pending.pop()
+        if text is None:
+            try:
+                text = path.read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+        for name in analyze_source(text).third_party_imports:
+            files = _local_module_files(root, name)
+            if not files:
+                imports.add(name)
+                continue
+            local_names.add(name)
+            for module_file in files:
+                resolved = module_file.resolve()
+                if resolved in seen or len(local_files) >= MAX_LOCAL_MODULES:
+                    continue
+                seen.add(resolved)
+                local_files.append(module_file)
+                pending.append((module_file, None))
+
+    return imports - local_names, sorted(local_files), local_names
+
+
+def find_local_modules(app_file: Path, source: str | None = None) -> list[Path]:
+    """Local module files reachable from ``app_file`` through its imports."""
+    return _walk_import_graph(app_file, source)[1]
+
+
+def resolve_image_packages(
+    app_file: Path,
+    mode: str,
+    base_packages: list[str],
+    extra_packages: Iterable[str] = (),
+    source: str | None = None,
+    mapping: dict[str, Any] | None = None,
+) -> ImageResolution:
+    """Trim a mode's base packages to what the app's import graph needs.
+
+    Base packages marked ``optional`` in the mapping are kept only when the
+    app, its local modules or the mode's generated code import them. Mapped
+    distributions the app imports but neither list provides are added.
+
+    Args:
+        app_file: Path to the app; sibling modules it imports are followed.
+        mode: Deployment mode, selecting the imports the mode itself needs.
+        base_packages: The mode's package list from ``base_packages.yml``.
+        extra_packages: Packages from the requirements file or the config.
+        source: Source of ``app_file``, read from disk when not given.
+        mapping: Import mapping, ``config/import_packages.yml`` when not given.
+
+    Returns:
+        ImageResolution: The package list, in base order followed by additions.
+    """
+    mapping = mapping if mapping is not None else config_loader.load_import_packages()
+    distributions: dict[str, dict[str, Any]] = {
+        distribution_name(name): info or {} for name, info in (mapping.get("distributions") or {}).items()
+    }
+    provided = set(mapping.get("provided_imports") or [])
+
+    imports, local_files, _ = _walk_import_graph(app_file, source)
+    needed = (imports | set((mapping.get("mode_imports") or {}).get(mode) or [])) - provided
+
+    def provides(dist: str) -> set[str]:
+        return set(distributions.get(dist, {}).get("imports") or [dist.replace("-", "_")])
+
+    # Keep required base packages and optional ones something imports
+    kept: dict[str, str] = {}
+    dropped: dict[str, str] = {}
+    for requirement in base_packages:
+        dist = distribution_name(requirement)
+        info = distributions.get(dist, {})
+        if info.get("optional") and not provides(dist) & needed:
+            dropped[dist] = requirement
+        else:
+            kept[dist] = requirement
+
+    # Add mapped distributions for imports nothing installs yet
+    covered = {distribution_name(pkg) for pkg in extra_packages} | set(kept)
+    covered_imports = set().union(*(provides(dist) for dist in covered)) if covered else set()
+    import_index = {module: dist for dist, info in distributions.items() for module in info.get("imports") or []}
+    added: list[str] = []
+    unknown: list[str] = []
+    for name in sorted(needed - covered_imports):
+        dist = import_index.get(name)
+        if dist is None:
+            unknown.append(name)
+        elif dist in dropped:
+            kept[dist] = dropped.pop(dist)
+        elif dist not in covered:
+            kept[dist] = dist
+            added.append(dist)
+        covered.add(dist or name)
+
+    # Pull in runtime requirements of everything kept
+    queue = list(kept)
+    while queue:
+        for required in distributions.get(queue.pop(), {}).get("requires") or []:
+            required = distribution_name(required)
+            if required in kept or required in covered - set(kept):
+                continue
+            if required in dropped:
+                kept[required] = dropped.pop(required)
+            else:
+                kept[required] = required
+                added.append(required)
+            queue.append(required)
+
+    base_order = [distribution_name(pkg) for pkg in base_packages]
+    packages = [kept[dist] for dist in base_order if dist in kept]
+    packages += [kept[dist] for dist in kept if dist not in base_order]
+
+    return ImageResolution(
+        packages=packages,
+        dropped=list(dropped.values()),
+        added=added,
+        unknown_imports=unknown,
+        local_modules=local_files,
+        estimated_saved_mb=sum(int(distributions.get(dist, {}).get("size_mb") or 0) for dist in dropped),
+    )
@@ -0,0 +1,135 @@
+"""Pinned dependency locks for generated deployments.
+
+Resolves an image's package list to exact pins with ``uv pip compile`` for
+the container's Python version and platform, and stores the result next to
+the generated deployment file. The lock records a digest of its inputs, so
+unchanged packages reuse it without resolving again and every build installs
+the same versions.
+"""
+
+import hashlib
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+from modal_for_noobs.render_cache import atomic_write_text
+
+# Python version and platform of the generated images
+LOCK_PYTHON_VERSION = "3.11"
+LOCK_PYTHON_PLATFORM = "x86_64-manylinux_2_28"
+
+# First line of every lock, followed by the digest of its inputs
+LOCK_HEADER = "# modal-for-noobs lock"
+
+# Seconds allowed for one resolution
+LOCK_TIMEOUT = 600
+
+
+class LockError(Exception):
+    """Raised when a lock cannot be resolved."""
+
+
+def lock_path_for(deployment_file: Path) -> Path:
+    """Lock file stored next to a generated deployment file."""
+    return deployment_file.with_suffix(".lock")
+
+
+def lock_inputs_digest(packages: list[str], find_links: Path | None = None, index_url: str | None = None) -> str:
+    """Digest of everything a resolution depends on."""
+    payload = json.dumps(
+        {
+            "packages": sorted(set(packages)),
+            "python_version": LOCK_PYTHON_VERSION,
+            "python_platform": LOCK_PYTHON_PLATFORM,
+            "find_links": str(find_links) if find_links else None,
+            "index_url": index_url,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_pins(text: str) -> list[str]:
+    """Requirement lines of a compiled lock, without comments or options."""
+    pins = []
+    for line in text.splitlines():
+        line = line.split(" #")[0].strip()
+        if line and not line.startswith(("#", "-")):
+            pins.append(line)
+    return pins
+
+
+def read_lock(lock_file: Path, digest: str | None = None) -> list[str] | None:
+    """Pins from ``lock_file``, or None if it is missing or locks other inputs."""
+    try:
+        text = lock_file.read_text()
+    except OSError:
+        return None
+    header = text.partition("\n")[0]
+    if not header.startswith(LOCK_HEADER) or (digest is not None and header != f"{LOCK_HEADER}: {digest}"):
+        return None
+    return parse_pins(text)
+
+
+def compile_lock(
+    packages: list[str],
+    lock_file: Path,
+    find_links: Path | None = None,
+    index_url: str | None = None,
+) -> list[str]:
+    """Pin ``packages`` and their dependencies, reusing ``lock_file`` when current.
+
+    Args:
+        packages: Requirements to resolve.
+        lock_file: Where the lock is read from and written to.
+        find_links: Wheelhouse directory; when given without ``index_url``,
+            resolution uses only its wheels.
+        index_url: Package index to resolve against instead of PyPI.
+
+    Returns:
+        list[str]: Exact ``name==version`` pins, sorted by ``uv``.
+
+    Raises:
+        LockError: If ``uv`` is missing or the resolution fails.
+    """
+    digest = lock_inputs_digest(packages, find_links, index_url)
+    pins = read_lock(lock_file, digest)
+    if pins is not None:
+        return pins
+
+    uv = shutil.which("uv")
+    if uv is None:
+        raise LockError("uv is not installed; install it with 'pip install uv' to lock dependencies")
+
+    command = [
+        uv,
+        "pip",
+        "compile",
+        "-",
+        "--quiet",
+        "--no-header",
+        "--no-annotate",
+        "--python-version",
+        LOCK_PYTHON_VERSION,
+        "--python-platform",
+        LOCK_PYTHON_PLATFORM,
+    ]
+    if find_links:
+        command += ["--find-links", str(find_links)]
+        if not index_url:
+            command.append("--no-index")
+    if index_url:
+        command += ["--index-url", index_url]
+
+    try:
+        result = subprocess.run(command, input="\n".join(packages) + "\n", capture_output=True, text=True, timeout=LOCK_TIMEOUT)
+    except subprocess.TimeoutExpired as e:
+        raise LockError(f"Dependency resolution timed out after {LOCK_TIMEOUT}s") from e
+    if result.returncode != 0:
+        raise LockError(f"Dependency resolution failed: {result.stderr.strip() or result.stdout.strip()}")
+
+    pins = parse_pins(result.stdout)
+    header = f"{LOCK_HEADER}: {digest}\n# uv pip compile for Python {LOCK_PYTHON_VERSION} on {LOCK_PYTHON_PLATFORM}\n"
+    atomic_write_text(lock_file, header + "\n".join(pins) + "\n")
+    return pins
@@ -0,0 +1,353 @@
+"""Local, append-only archive of Modal app logs.
+
+``milk-logs --archive`` appends the lines it fetches to one SQLite file per app
+under ``logs/`` in the modal-for-noobs state directory, and ``logs query``
+searches those files without calling Modal again.
+
+Lines are stored in zlib-compressed segments of up to ``SEGMENT_LINES`` lines.
+Each line also gets a small index row with its timestamp, level and position in
+its segment, and an FTS5 index over the text answers full-text searches. When
+SQLite was built without FTS5, text searches scan the matching segments instead.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from loguru import logger
+
+from modal_for_noobs.log_parser import LEVELS, LogParser, LogRecord
+from modal_for_noobs.render_cache import default_state_dir
+
+# Lines compressed together; larger segments compress better but cost more to read back
+SEGMENT_LINES = 1000
+# Bump when the schema changes; older archives are left alone and a new file is started
+ARCHIVE_SCHEMA = 1
+
+_LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+_RELATIVE_TIME = re.compile(r"^(\d+)\s*([smhdw])$")
+_TIME_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (id INTEGER PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    level INTEGER NOT NULL,
+    segment INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    digest BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_ts ON lines (ts);
+CREATE INDEX IF NOT EXISTS lines_level_ts ON lines (level, ts);
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class ArchivedLine:
+    """One archived log line."""
+
+    app: str
+    ts: float
+    level: str
+    text: str
+
+    @property
+    def time(self) -> datetime:
+        """The line's timestamp in local time."""
+        return datetime.fromtimestamp(self.ts).astimezone()
+
+    def to_record(self) -> LogRecord:
+        """The line parsed into a record, with its archived timestamp and level."""
+        return replace(LogParser().parse(self.text), ts=self.ts, level=self.level)
+
+
+def parse_time(value: str, now: datetime | None = None) -> float:
+    """Epoch seconds for an ISO 8601 time or a relative one such as ``30m``, ``2h`` or ``1d`` ago."""
+    now = now or datetime.now(timezone.utc)
+    relative = _RELATIVE_TIME.match(value.strip())
+    if relative:
+        amount, unit = relative.groups()
+        return (now - timedelta(**{_TIME_UNITS[unit]: int(amount)})).timestamp()
+    try:
+        stamp = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}', expected ISO 8601 or a relative time like 30m, 2h or 1d") from None
+    return (stamp if stamp.tzinfo else stamp.astimezone()).timestamp()
+
+
+def _digest(line: str) -> bytes:
+    return hashlib.blake2b(line.encode(), digest_size=8).digest()
+
+
+def _fts_query(text: str) -> str:
+    """Every word of ``text`` as a quoted FTS5 term, so punctuation is never query syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class AppLogArchive:
+    """The archive of one app: compressed segments plus a time, level and text index."""
+
+    def __init__(self, path: Path, app: str):
+        self.path = path
+        self.app = app
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        self.has_fts = self._create_fts()
+        # Kept across appends, so a traceback split over two segments is still parsed as one
+        self._parser = LogParser()
+        self._db.execute(f"PRAGMA user_version = {ARCHIVE_SCHEMA}")
+        self._db.commit()
+
+    def _create_fts(self) -> bool:
+        try:
+            # Contentless: the text lives in the compressed segments, the index only maps words to rowids
+            self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(text, content='')")
+        except sqlite3.OperationalError:
+            logger.debug("SQLite has no FTS5, archived logs are searched by scanning")
+            return False
+        return True
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def tail_digests(self, count: int) -> list[bytes]:
+        """Digests of the last ``count`` archived lines, oldest first."""
+        rows = self._db.execute("SELECT digest FROM lines ORDER BY id DESC LIMIT ?", (count,)).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def append(self, lines: list[str], skip_overlap: bool = False) -> int:
+        """Append lines as one compressed segment; returns how many were stored.
+
+        With ``skip_overlap``, leading lines that repeat the end of the archive
+        are dropped. A fetch of the last N lines usually overlaps the previous
+        fetch, and this keeps it from being stored twice.
+        """
+        digests = [_digest(line) for line in lines]
+        if skip_overlap and digests:
+            skip = _overlap(self.tail_digests(len(digests)), digests)
+            lines, digests = lines[skip:], digests[skip:]
+        if not lines:
+            return 0
+
+        # Timestamps go to the index, so only the rest of each line is stored.
+        # Lines without one inherit the previous line's, keeping multi-line tracebacks together.
+        now = time.time()
+        records = [self._parser.parse(line) for line in lines]
+        texts = [record.text for record in records]
+        stamps = [record.ts or now for record in records]
+
+        with self._db:
+            cursor = self._db.execute("INSERT INTO segments (data) VALUES (?)", (zlib.compress("\n".join(texts).encode()),))
+            segment = cursor.lastrowid
+            rows = [
+                (ts, record.level_no, segment, position, digest)
+                for position, (ts, record, digest) in enumerate(zip(stamps, records, digests, strict=True))
+            ]
+            first_id = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM lines").fetchone()[0]
+            self._db.executemany(
+                "INSERT INTO lines (id, ts, level, segment, position, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                [(first_id + i, *row) for i, row in enumerate(rows)],
+            )
+            if self.has_fts:
+                self._db.executemany(
+                    "INSERT INTO lines_fts (rowid, text) VALUES (?, ?)", [(first_id + i, text) for i, text in enumerate(texts)]
+                )
+        return len(lines)
+
+    def query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        min_level: int | None = None,
+        text: str | None = None,
+        limit: int | None = None,
+    ) -> list[ArchivedLine]:
+        """Matching lines, oldest first; with ``limit``, only the newest ``limit`` of them."""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(until)
+        if min_level is not None:
+            clauses.append("level >= ?")
+            params.append(min_level)
+        scan_words = []
+        if text and text.strip():
+            if self.has_fts:
+                clauses.append("id IN (SELECT rowid FROM lines_fts WHERE lines_fts MATCH ?)")
+                params.append(_fts_query(text))
+            else:
+                scan_words = text.lower().split()
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._db.execute(f"SELECT ts, level, segment, position FROM lines {where} ORDER BY ts DESC, id DESC", params)
+
+        found: list[ArchivedLine] = []
+        segments: dict[int, list[str]] = {}
+        for ts, level, segment, position in rows:
+            if segment not in segments:
+                segments[segment] = self._read_segment(segment)
+            line = segments[segment][position]
+            if scan_words and not all(word in line.lower() for word in scan_words):
+                continue
+            found.append(ArchivedLine(self.app, ts, _LEVEL_NAMES.get(level, str(level)), line))
+            if limit is not None and len(found) >= limit:
+                break
+        found.reverse()
+        return found
+
+    def _read_segment(self, segment: int) -> list[str]:
+        (data,) = self._db.execute("SELECT data FROM segments WHERE id = ?", (segment,)).fetchone()
+        return zlib.decompress(data).decode().split("\n")
+
+    def stats(self) -> dict[str, int]:
+        """Line and segment counts and the file size in bytes."""
+        lines = self._db.execute("SELECT COUNT(*) FROM lines").fetchone()[0]
+        segments = self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        return {"lines": lines, "segments": segments, "bytes": self.path.stat().st_size}
+
+
+def _overlap(tail: list[bytes], new: list[bytes]) -> int:
+    """Length of the longest end of ``tail`` that ``new`` starts with."""
+    if not tail or not new:
+        return 0
+    # Candidate starts are where the first new line appears; the earliest gives the longest overlap
+    for start in (i for i, digest in enumerate(tail) if digest == new[0]):
+        length = len(tail) - start
+        if tail[start:] == new[:length]:
+            return length
+    return 0
+
+
+class LogArchive:
+    """One append-only log archive per app, under a shared directory."""
+
+    def __init__(self, archive_dir: Path | None = None):
+        """Initialize the archive.
+
+        Args:
+            archive_dir: Directory holding one SQLite file per app. Defaults to
+                ``logs`` under the modal-for-noobs state directory.
+        """
+        self._archive_dir = archive_dir
+
+    @property
+    def archive_dir(self) -> Path:
+        """Directory holding one archive file per app."""
+        return self._archive_dir or default_state_dir() / "logs"
+
+    def _path(self, app: str) -> Path:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", app)
+        return self.archive_dir / f"{safe_name}.v{ARCHIVE_SCHEMA}.sqlite3"
+
+    def open(self, app: str) -> AppLogArchive:
+        """Open (creating if needed) the archive of an app."""
+        return AppLogArchive(self._path(app), app)
+
+    def apps(self) -> list[str]:
+        """Apps that have an archive."""
+        suffix = f".v{ARCHIVE_SCHEMA}.sqlite3"
+        if not self.archive_dir.exists():
+            return []
+        return sorted(path.name[: -len(suffix)] for path in self.archive_dir.glob(f"*{suffix}"))
+
+    def append(self, app: str, lines: list[str], skip_overlap: bool = True) -> int:
+        """Append fetched lines to an app's archive; returns how many were new."""
+        archive = self.open(app)
+        try:
+            return archive.append(lines, skip_overlap=skip_overlap)
+        finally:
+            archive.close()
+
+    def writer(self, app: str) -> "ArchiveWriter":
+        """A buffered writer for lines that arrive one at a time, e.g. while following."""
+        return ArchiveWriter(self.open(app))
+
+    def query(
+        self,
+        apps: Iterable[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        min_level: int | None = None,
+        text: str | None = None,
+        limit: int | None = None,
+    ) -> list[ArchivedLine]:
+        """Matching lines of several apps (all archived apps by default), oldest first.
+
+        With ``limit``, only the newest ``limit`` lines across all apps are kept.
+        """
+        found: list[ArchivedLine] = []
+        for app in apps or self.apps():
+            if not self._path(app).exists():
+                continue
+            archive = self.open(app)
+            try:
+                found.extend(archive.query(since, until, min_level, text, limit))
+            finally:
+                archive.close()
+        found.sort(key=lambda line: line.ts)
+        return found[-limit:] if limit else found
+
+
+class ArchiveWriter:
+    """Buffers lines and appends them to an archive in segments.
+
+    Only the first segment is checked for overlap with lines already archived;
+    a followed stream may start by replaying lines that an earlier fetch stored.
+    """
+
+    def __init__(self, archive: AppLogArchive, segment_lines: int = SEGMENT_LINES):
+        self.archive = archive
+        self.segment_lines = segment_lines
+        self.written = 0
+        self._buffer: list[str] = []
+        self._first = True
+
+    def add(self, line: str) -> None:
+        """Buffer a line, writing a segment once enough lines are buffered."""
+        if line.strip():
+            self._buffer.append(line)
+            if len(self._buffer) >= self.segment_lines:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines."""
+        if self._buffer:
+            self.written += self.archive.append(self._buffer, skip_overlap=self._first)
+            self._buffer = []
+            self._first = False
+
+    def close(self) -> None:
+        """Write what is buffered and close the archive."""
+        try:
+            self.flush()
+        finally:
+            self.archive.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def iter_lines(lines: Iterable[ArchivedLine], show_app: bool = True) -> Iterator[str]:
+    """Archived lines formatted for printing."""
+    for line in lines:
+        prefix = f"{line.app} " if show_app else ""
+        yield f"{prefix}{line.time.isoformat(sep=' ', timespec='seconds')} {line.level.upper():<8} {line.text}"
+
+
+# Global log archive instance
+log_archive = LogArchive()
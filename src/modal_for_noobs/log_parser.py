@@ -0,0 +1,240 @@
+"""Structured parsing of Modal app log lines.
+
+``modal app logs`` prints one line per log entry, optionally prefixed with a
+timestamp (``--timestamps``) and with the Function, FunctionCall and Container
+IDs (``--show-function-id`` and friends). What follows is whatever the app
+printed: loguru or ``logging`` output, uvicorn access logs, tracebacks, or JSON
+from ``logger.add(sys.stdout, serialize=True)``.
+
+``LogParser`` turns those lines into ``LogRecord`` objects one at a time, so
+callers can consume them from a generator while a stream is still running.
+"""
+
+import io
+import json
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+# Same numbers as the logging module, so "at least warning" also matches errors
+LEVELS = {"trace": 5, "debug": 10, "info": 20, "warning": 30, "error": 40, "critical": 50}
+_LEVEL_ALIASES = {"warn": "warning", "fatal": "critical", "exception": "error", "success": "info", "err": "error"}
+
+# `modal app logs --timestamps` prefixes lines with e.g. "2026-03-01 05:00:00+00:00"; loguru's default
+# format starts with "2026-03-01 05:00:00.123"
+_TIMESTAMP = re.compile(r"^\s*(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?) ?")
+# Function, FunctionCall and Container IDs that `modal app logs --show-*-id` put before the text
+_MODAL_ID = re.compile(r"(fu|fc|ta)-[0-9A-Za-z]+\s+")
+# Loguru's default format after the time: "| INFO     | module:function:42 - message"
+_LOGURU = re.compile(r"^\|\s*(?P<level>[A-Z]+)\s*\|\s*(?P<module>[\w.<>-]+):(?P<function>[\w<>]+):\d+\s+-\s?(?P<message>.*)$")
+# uvicorn and similar: "INFO:     message"
+_LEVEL_PREFIX = re.compile(r"^(?P<level>TRACE|DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|FATAL):\s+(?P<message>.*)$")
+_LEVEL_WORD = re.compile(r"\b(TRACE|DEBUG|INFO|SUCCESS|WARNING|WARN|ERROR|EXCEPTION|CRITICAL|FATAL)\b")
+# Status code after the request line of an access log, e.g. '"GET / HTTP/1.1" 503'
+_HTTP_STATUS = re.compile(r'HTTP/\d(?:\.\d)?"?\s+([1-5]\d\d)\b')
+# Last line of a traceback, e.g. "ValueError: boom" or "torch.OutOfMemoryError"
+_EXCEPTION_LINE = re.compile(r"^[\w.]+(?:Error|Exception|Interrupt|Exit)\b")
+
+
+@dataclass(slots=True, frozen=True)
+class LogRecord:
+    """One parsed log line."""
+
+    # The line without Modal's timestamp and ID prefixes
+    text: str
+    message: str
+    level: str = "info"
+    ts: float | None = None
+    container_id: str | None = None
+    function_id: str | None = None
+    function_call_id: str | None = None
+    # Python function that logged the line, when the log format names it
+    function: str | None = None
+    # The decoded object of a JSON line, e.g. a serialized loguru record
+    payload: dict[str, Any] | None = None
+
+    @property
+    def level_no(self) -> int:
+        """Numeric level, comparable with ``LEVELS`` values."""
+        return LEVELS.get(self.level, LEVELS["info"])
+
+    @property
+    def time(self) -> datetime | None:
+        """The record's timestamp in local time."""
+        return datetime.fromtimestamp(self.ts).astimezone() if self.ts is not None else None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict, e.g. for JSON exports."""
+        return asdict(self)
+
+
+def level_number(name: str) -> int:
+    """Numeric level for a name such as ``warning`` or ``WARN``."""
+    key = name.lower()
+    key = _LEVEL_ALIASES.get(key, key)
+    if key not in LEVELS:
+        raise ValueError(f"Unknown log level '{name}', expected one of {', '.join(LEVELS)}")
+    return LEVELS[key]
+
+
+def _level_name(word: str) -> str:
+    key = word.lower()
+    key = _LEVEL_ALIASES.get(key, key)
+    return key if key in LEVELS else "info"
+
+
+def _parse_time(value: str) -> float | None:
+    try:
+        stamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return (stamp if stamp.tzinfo else stamp.astimezone()).timestamp()
+
+
+def split_timestamp(line: str) -> tuple[float | None, str]:
+    """Epoch seconds of a line's leading timestamp, if it has one, and the rest of the line.
+
+    Only the space after the timestamp is removed, so indentation survives.
+    """
+    match = _TIMESTAMP.match(line)
+    if match:
+        ts = _parse_time(match.group(1))
+        if ts is not None:
+            return ts, line[match.end() :]
+    return None, line
+
+
+def text_level(text: str) -> str:
+    """Level of a line from its level word, ``info`` if it has none.
+
+    Tracebacks count as errors, and access logs as errors for 5xx responses and
+    warnings for 4xx ones, even when they were logged at ``INFO``.
+    """
+    match = _LEVEL_WORD.search(text)
+    level = _level_name(match.group(1)) if match else "info"
+    if text.lstrip().startswith("Traceback"):
+        return _max_level(level, "error")
+    status = _HTTP_STATUS.search(text)
+    if status:
+        code = status.group(1)[0]
+        if code == "5":
+            return _max_level(level, "error")
+        if code == "4":
+            return _max_level(level, "warning")
+    return level
+
+
+def _max_level(level: str, other: str) -> str:
+    return level if LEVELS[level] >= LEVELS[other] else other
+
+
+def line_level(line: str) -> int:
+    """Numeric level of a raw line; see ``text_level``."""
+    return LEVELS[text_level(line)]
+
+
+def _from_json(text: str) -> dict[str, Any] | None:
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+class LogParser:
+    """Parses log lines one at a time.
+
+    The parser remembers the previous line, so lines without a timestamp (such
+    as traceback frames) take the previous line's timestamp, and every line of
+    a traceback is an error.
+    """
+
+    def __init__(self) -> None:
+        self.last_ts: float | None = None
+        self._in_traceback = False
+
+    def parse(self, line: str) -> LogRecord:
+        """The record of one raw line."""
+        line = line.rstrip("\r\n")
+        ts, text = split_timestamp(line)
+        ids: dict[str, str] = {}
+        while match := _MODAL_ID.match(text):
+            ids[match.group(1)] = match.group().strip()
+            text = text[match.end() :]
+
+        function = None
+        payload = None
+        message = text
+        level = None
+        if text.startswith("{") and (payload := _from_json(text)) is not None:
+            record = payload.get("record")
+            if isinstance(record, dict):
+                # `logger.add(sys.stdout, serialize=True)`
+                message = str(record.get("message", ""))
+                level_field = record.get("level")
+                level = _level_name(str(level_field.get("name", "info") if isinstance(level_field, dict) else level_field))
+                function = record.get("function")
+                time_field = record.get("time")
+                if not ts and isinstance(time_field, dict) and isinstance(time_field.get("timestamp"), int | float):
+                    ts = float(time_field["timestamp"])
+            else:
+                message = str(payload.get("message") or payload.get("msg") or payload.get("text") or text)
+                word = payload.get("level") or payload.get("levelname") or payload.get("severity")
+                level = _level_name(str(word)) if word else None
+        else:
+            # Loguru's own time comes first; Modal's timestamp, if any, was before it
+            loguru_ts, rest = split_timestamp(text)
+            if (match := _LOGURU.match(rest)) is not None:
+                ts = ts or loguru_ts
+                level = _level_name(match.group("level"))
+                function = match.group("function")
+                message = match.group("message")
+            elif (match := _LEVEL_PREFIX.match(text)) is not None:
+                message = match.group("message")
+
+        if level is None:
+            level = text_level(text)
+        if text.startswith("Traceback"):
+            self._in_traceback = True
+        elif self._in_traceback:
+            if text[:1].isspace():
+                level = _max_level(level, "error")
+            else:
+                # The exception line ends the traceback
+                self._in_traceback = False
+                if _EXCEPTION_LINE.match(text):
+                    level = _max_level(level, "error")
+
+        self.last_ts = ts = ts or self.last_ts
+        return LogRecord(
+            text=text,
+            message=message,
+            level=level,
+            ts=ts,
+            container_id=ids.get("ta"),
+            function_id=ids.get("fu"),
+            function_call_id=ids.get("fc"),
+            function=function,
+            payload=payload,
+        )
+
+
+def format_record(record: LogRecord) -> str:
+    """A record as one line of ``time level text``, for log viewers."""
+    clock = record.time.strftime("%H:%M:%S") if record.ts is not None else "--:--:--"
+    return f"{clock} {record.level.upper():<8} {record.text}"
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[LogRecord]:
+    """Records of the non-empty lines, lazily."""
+    parser = LogParser()
+    for line in lines:
+        if line.strip():
+            yield parser.parse(line)
+
+
+def parse_log_text(text: str) -> Iterator[LogRecord]:
+    """Records of a block of log output, lazily, without splitting it up front."""
+    return parse_lines(io.StringIO(text))
@@ -0,0 +1,340 @@
+"""Backends that ``ModalAPI`` uses to list, stop, and read apps and secrets.
+
+- ``SdkBackend`` calls the ``modal`` Python client in-process. The calls run on
+  Modal's own event loop thread, so every event loop in this process shares one
+  long-lived client and gRPC connection instead of paying interpreter startup
+  for a ``modal`` CLI process per call.
+- ``CliBackend`` runs the ``modal`` CLI through the shared subprocess runner.
+- ``FakeBackend`` keeps apps, logs and secrets in memory for offline tests.
+
+The backend is chosen with ``MODAL_FOR_NOOBS_BACKEND`` (``sdk``, ``cli`` or
+``fake``). ``sdk`` is the default and falls back to ``cli`` when the ``modal``
+package is not installed, or is a version whose client internals
+``SdkBackend`` cannot bind to.
+"""
+
+import asyncio
+import functools
+import inspect
+import itertools
+import os
+import re
+from collections.abc import Iterable
+from types import SimpleNamespace
+from typing import Any
+
+from loguru import logger
+
+from modal_for_noobs.modal_listings import AppInfo, SecretInfo, app_from_row, parse_apps, parse_secrets
+from modal_for_noobs.subprocess_runner import run_modal
+
+BACKEND_ENV = "MODAL_FOR_NOOBS_BACKEND"
+DEFAULT_BACKEND = "sdk"
+
+_fake_ids = itertools.count(1)
+
+_WEB_URL = re.compile(r"https://[^\s]+\.modal\.run[^\s]*")
+# Checked in order; the first one mentioned in an app's logs wins
+_LOGGED_GPUS = ("T4", "L4", "A10G", "A100", "H100")
+
+
+class ModalBackendError(Exception):
+    """A Modal operation failed; the message is suitable for users."""
+
+
+def parse_secret_entries(value: str) -> dict[str, str]:
+    """Parse ``KEY=VALUE`` pairs, separated by whitespace, into a secret's environment."""
+    env: dict[str, str] = {}
+    for entry in value.split():
+        key, sep, entry_value = entry.partition("=")
+        if not sep or not key:
+            raise ModalBackendError(f"Secret values must be KEY=VALUE pairs, got '{entry}'")
+        env[key] = entry_value
+    if not env:
+        raise ModalBackendError("Secret needs at least one KEY=VALUE pair")
+    return env
+
+
+def parse_app_logs_details(logs: str) -> dict[str, Any]:
+    """Best-effort URL and GPU type from an app's recent log lines."""
+    details: dict[str, Any] = {}
+    url_match = _WEB_URL.search(logs)
+    if url_match:
+        details["url"] = url_match.group()
+    gpu_type = next((gpu for gpu in _LOGGED_GPUS if gpu in logs), None)
+    if gpu_type:
+        details["gpu_type"] = gpu_type
+    return details
+
+
+class CliBackend:
+    """Runs ``modal`` CLI commands through the shared subprocess runner."""
+
+    name = "cli"
+    # Key of this backend's entry in the shared app-list cache
+    cache_key = "cli"
+
+    async def _run(self, *args: str, **kwargs: Any) -> str:
+        result = await run_modal(*args, **kwargs)
+        if not result.ok:
+            raise ModalBackendError(result.error)
+        return result.stdout
+
+    async def list_apps(self) -> list[AppInfo]:
+        """Apps from ``modal app list --json``, or its table if JSON is not printed."""
+        return parse_apps(await self._run("app", "list", "--json"))
+
+    async def stop_app(self, app: str) -> None:
+        """Stop an app by name or ID."""
+        await self._run("app", "stop", app)
+
+    async def app_logs(self, app: str, lines: int = 100) -> str:
+        """The last ``lines`` log lines of an app."""
+        return await self._run("app", "logs", app, "--tail", str(lines))
+
+    async def app_details(self, app: str) -> dict[str, Any]:
+        """URL and GPU type of an app.
+
+        The CLI has no structured source for these, so they are read from the
+        app's last few log lines.
+        """
+        return parse_app_logs_details(await self.app_logs(app, lines=5))
+
+    async def create_secret(self, name: str, value: str) -> None:
+        """Create a secret from ``KEY=VALUE`` pairs."""
+        # Not retried: a retry after a lost response would fail on the existing secret
+        await self._run("secret", "create", name, value, retries=0)
+
+    async def list_secrets(self) -> list[SecretInfo]:
+        """The workspace's secrets, from ``modal secret list --json``."""
+        return parse_secrets(await self._run("secret", "list", "--json"))
+
+
+def function_gpu(function: Any) -> str | None:
+    """GPU of a function definition (``api_pb2.FunctionData``), e.g. ``A100-80GB`` or ``H100:2``.
+
+    Reads the top-ranked variant's resources, formatted like ``modal function``
+    prints them; ``None`` for CPU-only functions.
+    """
+    for ranked in sorted(function.ranked_functions, key=lambda ranked: ranked.rank):
+        gpu = ranked.function.resources.gpu_config
+        if gpu.count > 0:
+            return gpu.gpu_type if gpu.count == 1 else f"{gpu.gpu_type}:{gpu.count}"
+        return None
+    return None
+
+
+@functools.cache
+def _sdk_calls() -> SimpleNamespace:
+    """Modal client calls, wrapped to run on Modal's event loop thread.
+
+    The client from ``_Client.from_env()`` is a process-wide singleton bound to
+    that loop, so the wrapped calls reuse one connection across event loops.
+    """
+    from modal._logs import _FETCH_LIMIT, tail_logs
+    from modal._object import _get_environment_name
+    from modal._utils.async_utils import synchronize_api
+    from modal._utils.time_utils import timestamp_to_localized_str
+    from modal.cli.app import APP_STATE_TO_MESSAGE, resolve_app_identifier
+    from modal.client import _Client
+    from modal.secret import _Secret
+    from modal_proto import api_pb2
+
+    # These are private client APIs; check their shape up front so that an
+    # untested modal version falls back to the CLI instead of failing per call
+    if len(inspect.signature(resolve_app_identifier).parameters) != 3:
+        raise TypeError("modal.cli.app.resolve_app_identifier has an unexpected signature")
+    required = (
+        (_Secret, "objects"),
+        (api_pb2, "AppListRequest"),
+        (api_pb2, "AppStopRequest"),
+        (api_pb2, "AppGetObjectsRequest"),
+        (api_pb2, "FunctionGetByIdRequest"),
+    )
+    for owner, attribute in required:
+        if not hasattr(owner, attribute):
+            raise AttributeError(f"{owner.__name__} has no attribute '{attribute}'")
+
+    async def list_apps() -> list[AppInfo]:
+        client = await _Client.from_env()
+        response = await client._stub.AppList(api_pb2.AppListRequest(environment_name=_get_environment_name()))
+        # Same fields as `modal app list --json`
+        return [
+            AppInfo(
+                app_id=app.app_id,
+                name=app.description or app.app_id,
+                state=APP_STATE_TO_MESSAGE[app.state].plain if app.state in APP_STATE_TO_MESSAGE else "unknown",
+                tasks=app.n_running_tasks,
+                created_at=timestamp_to_localized_str(app.created_at),
+                stopped_at=timestamp_to_localized_str(app.stopped_at),
+            )
+            for app in response.apps
+        ]
+
+    async def stop_app(app: str) -> None:
+        client = await _Client.from_env()
+        app_id, _, _ = await resolve_app_identifier(app, None, client)
+        await client._stub.AppStop(api_pb2.AppStopRequest(app_id=app_id, source=api_pb2.APP_STOP_SOURCE_PYTHON_CLIENT))
+
+    async def app_logs(app: str, lines: int) -> str:
+        client = await _Client.from_env()
+        app_id, _, _ = await resolve_app_identifier(app, None, client)
+        chunks = []
+        async for batch in tail_logs(client, app_id, min(lines, _FETCH_LIMIT)):
+            chunks.extend(item.data for item in batch.items if item.data)
+        return "".join(chunks)
+
+    async def app_details(app: str) -> dict[str, Any]:
+        client = await _Client.from_env()
+        app_id, _, _ = await resolve_app_identifier(app, None, client)
+        response = await client._stub.AppGetObjects(api_pb2.AppGetObjectsRequest(app_id=app_id))
+        functions = [item.object for item in response.items if item.object.HasField("function_handle_metadata")]
+        metadata = [function.function_handle_metadata for function in functions]
+        details: dict[str, Any] = {
+            "url": next((function.web_url for function in metadata if function.web_url), None),
+            "functions": [function.function_name for function in metadata],
+        }
+        # GPUs are part of each function's definition, not of the app's objects
+        definitions = await asyncio.gather(
+            *(client._stub.FunctionGetById(api_pb2.FunctionGetByIdRequest(function_id=function.object_id)) for function in functions),
+            return_exceptions=True,
+        )
+        read = [definition.function for definition in definitions if not isinstance(definition, BaseException)]
+        if read and len(read) == len(definitions):
+            details["gpu_type"] = next((gpu for function in read if (gpu := function_gpu(function))), "CPU")
+        return details
+
+    async def create_secret(name: str, env: dict[str, str]) -> None:
+        await _Secret.objects.create(name, env)
+
+    async def list_secrets() -> list[SecretInfo]:
+        return [SecretInfo(name=secret.name) for secret in await _Secret.objects.list()]
+
+    calls = (list_apps, stop_app, app_logs, app_details, create_secret, list_secrets)
+    return SimpleNamespace(**{call.__name__: synchronize_api(call, target_module=__name__) for call in calls})
+
+
+class SdkBackend:
+    """Uses the ``modal`` Python client in-process."""
+
+    name = "sdk"
+    cache_key = "sdk"
+
+    async def _call(self, name: str, *args: Any) -> Any:
+        try:
+            return await getattr(_sdk_calls(), name).aio(*args)
+        except ModalBackendError:
+            raise
+        except Exception as e:
+            raise ModalBackendError(str(e) or type(e).__name__) from e
+
+    async def list_apps(self) -> list[AppInfo]:
+        """Apps with the same fields as ``modal app list --json``."""
+        return await self._call("list_apps")
+
+    async def stop_app(self, app: str) -> None:
+        """Stop an app by name or ID."""
+        await self._call("stop_app", app)
+
+    async def app_logs(self, app: str, lines: int = 100) -> str:
+        """The last ``lines`` log entries of an app."""
+        return await self._call("app_logs", app, lines)
+
+    async def app_details(self, app: str) -> dict[str, Any]:
+        """Web URL, function names and GPU type from the app's deployed objects.
+
+        ``gpu_type`` is ``CPU`` when no function uses a GPU, and missing when
+        the function definitions could not be read.
+        """
+        return await self._call("app_details", app)
+
+    async def create_secret(self, name: str, value: str) -> None:
+        """Create a secret from ``KEY=VALUE`` pairs."""
+        await self._call("create_secret", name, parse_secret_entries(value))
+
+    async def list_secrets(self) -> list[SecretInfo]:
+        """The workspace's secrets, by name."""
+        return await self._call("list_secrets")
+
+
+class FakeBackend:
+    """In-memory stand-in for Modal, for tests and offline use."""
+
+    name = "fake"
+
+    def __init__(
+        self,
+        apps: Iterable[dict[str, Any]] = (),
+        logs: dict[str, list[str]] | None = None,
+        secrets: dict[str, dict[str, str]] | None = None,
+    ):
+        self.apps = [dict(app) for app in apps]
+        self.logs = dict(logs or {})
+        self.secrets = dict(secrets or {})
+        self.calls: list[tuple[str, ...]] = []
+        # Each fake is its own workspace, so fakes never share cached app lists
+        self.cache_key = f"fake-{next(_fake_ids)}"
+
+    def _find(self, app: str) -> dict[str, Any]:
+        for entry in self.apps:
+            if app in (entry.get("app_id"), entry.get("description")):
+                return entry
+        raise ModalBackendError(f"No App with name '{app}' found")
+
+    async def list_apps(self) -> list[AppInfo]:
+        """The stored apps, parsed like ``modal app list --json`` rows."""
+        self.calls.append(("list_apps",))
+        return [app for row in self.apps if (app := app_from_row(row)) is not None]
+
+    async def stop_app(self, app: str) -> None:
+        """Mark an app as stopped."""
+        self.calls.append(("stop_app", app))
+        self._find(app).update(state="stopped", tasks="0")
+
+    async def app_logs(self, app: str, lines: int = 100) -> str:
+        """The last ``lines`` stored log lines of an app."""
+        self.calls.append(("app_logs", app))
+        entry = self._find(app)
+        stored = self.logs.get(entry.get("description")) or self.logs.get(entry.get("app_id")) or []
+        return "\n".join(stored[-lines:])
+
+    async def app_details(self, app: str) -> dict[str, Any]:
+        """The ``url``, ``gpu_type`` and ``functions`` stored on an app."""
+        self.calls.append(("app_details", app))
+        entry = self._find(app)
+        return {key: entry[key] for key in ("url", "gpu_type", "functions") if key in entry}
+
+    async def create_secret(self, name: str, value: str) -> None:
+        """Store a secret, failing if it already exists like Modal does."""
+        self.calls.append(("create_secret", name))
+        if name in self.secrets:
+            raise ModalBackendError(f"Secret '{name}' already exists")
+        self.secrets[name] = parse_secret_entries(value)
+
+    async def list_secrets(self) -> list[SecretInfo]:
+        """The stored secrets."""
+        self.calls.append(("list_secrets",))
+        return [SecretInfo(name=name) for name in self.secrets]
+
+
+ModalBackend = SdkBackend | CliBackend | FakeBackend
+
+
+def create_backend(name: str | None = None) -> ModalBackend:
+    """Backend named ``name``, or the one selected by ``MODAL_FOR_NOOBS_BACKEND``."""
+    name = (name or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND).lower()
+    if name == "sdk":
+        try:
+            _sdk_calls()
+        except ImportError:
+            logger.warning("The modal package is not installed, using the modal CLI instead")
+            return CliBackend()
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"This modal version is not supported by the SDK backend ({e}), using the modal CLI instead")
+            return CliBackend()
+        return SdkBackend()
+    if name == "cli":
+        return CliBackend()
+    if name == "fake":
+        return FakeBackend()
+    raise ValueError(f"Unknown Modal backend '{name}', expected sdk, cli or fake")
@@ -11,9 +11,13 @@ This module provides comprehensive Modal deployment capabilities including:
 
 import asyncio
 import base64
-import json
 import os
 import subprocess
+import textwrap
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -23,14 +27,39 @@ from loguru import logger
 from rich import print as rprint
 
 # Import Modal's official color palette from common module
+from modal_for_noobs.app_analyzer import analyze_source, validate_app_file
+from modal_for_noobs.app_list_cache import app_details_cache, app_list_cache, invalidate_apps
 from modal_for_noobs.cli_helpers.common import MODAL_DARK_GREEN, MODAL_GREEN, MODAL_LIGHT_GREEN
 from modal_for_noobs.config_loader import config_loader
+from modal_for_noobs.deploy_ledger import DeploymentLedger, LedgerEntry, deployment_ledger, file_digest
+from modal_for_noobs.image_resolver import find_local_modules, resolve_image_packages
+from modal_for_noobs.lockfile import LockError, compile_lock, lock_path_for
+from modal_for_noobs.log_parser import LogRecord, parse_log_text
+from modal_for_noobs.modal_backends import ModalBackend, create_backend
+from modal_for_noobs.modal_listings import AppInfo
+from modal_for_noobs.render_cache import RenderCache, compute_render_key
+from modal_for_noobs.render_cache import render_cache as default_render_cache
+from modal_for_noobs.requirements import RequirementSet, read_requirements
+from modal_for_noobs.subprocess_runner import stream_modal
+from modal_for_noobs.wheelhouse import image_wheel_dir
 from modal_for_noobs.templates.deployment import (
     generate_modal_deployment,
     generate_modal_deployment_legacy,
     get_image_config,
 )
 
+# Lines of `modal deploy` output kept per stream in DeploymentResult
+OUTPUT_BUFFER_LINES = 500
+
+# Seconds allowed for `modal deploy`, including the image build
+DEPLOY_TIMEOUT = 60 * 60
+
+# App details fetched at once when a dashboard lists many apps
+APP_DETAILS_CONCURRENCY = 8
+
+# Receives (stream name, line) for each line of subprocess output
+OutputCallback = Callable[[str, str], None]
+
 
 @dataclass
 class DeploymentConfig:
@@ -72,6 +101,19 @@ class DeploymentConfig:
     custom_packages: list[str] = field(default_factory=list)
     system_packages: list[str] = field(default_factory=list)
 
+    # How the dashboard module reaches the container, see DASHBOARD_RUNTIMES
+    dashboard_runtime: str = "embedded"
+
+    # Drop optional base packages the app's import graph does not use
+    minimal_image: bool = True
+
+    # Pin every package with a lock stored next to the generated file
+    lock_dependencies: bool = False
+
+    # Local wheel directory the image installs from, see wheelhouse.prefetch;
+    # locks are then resolved from it too
+    wheelhouse: Path | None = None
+
     # Deployment metadata
     app_name: str | None = None
     description: str | None = None
@@ -102,6 +144,10 @@ class DeploymentConfig:
             "requirements_path": str(self.requirements_path) if self.requirements_path else None,
             "custom_packages": self.custom_packages,
             "system_packages": self.system_packages,
+            "dashboard_runtime": self.dashboard_runtime,
+            "minimal_image": self.minimal_image,
+            "lock_dependencies": self.lock_dependencies,
+            "wheelhouse": str(self.wheelhouse) if self.wheelhouse else None,
             "app_name": self.app_name,
             "description": self.description,
             "tags": self.tags,
@@ -113,13 +159,26 @@ class DeploymentConfig:
         config = cls()
         for key, value in data.items():
             if hasattr(config, key):
-                if key == "requirements_path" and value:
+                if key in ("requirements_path", "wheelhouse") and value:
                     setattr(config, key, Path(value))
                 else:
                     setattr(config, key, value)
         return config
 
 
+@dataclass
+class PhaseSpan:
+    """Timing of one deployment phase, relative to the start of the deploy."""
+
+    name: str
+    start: float
+    duration: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {"name": self.name, "start": round(self.start, 6), "duration": round(self.duration, 6)}
+
+
 @dataclass
 class DeploymentResult:
     """Result of a Modal deployment operation."""
@@ -132,6 +191,9 @@ class DeploymentResult:
     output: str | None = None
     config: DeploymentConfig | None = None
     deployment_time: float | None = None
+    render_cache_hit: bool | None = None
+    skipped: bool = False
+    phases: list[PhaseSpan] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -144,87 +206,67 @@ class DeploymentResult:
             "output": self.output,
             "config": self.config.to_dict() if self.config else None,
             "deployment_time": self.deployment_time,
+            "render_cache_hit": self.render_cache_hit,
+            "skipped": self.skipped,
+            "phases": [phase.to_dict() for phase in self.phases],
         }
 
 
 class ModalAPI:
     """Enhanced async Modal API client for advanced deployment management."""
 
-    def __init__(self, timeout: int = 30):
-        """Initialize Modal API client."""
+    def __init__(self, timeout: int = 30, backend: ModalBackend | str | None = None):
+        """Initialize Modal API client.
+
+        Args:
+            timeout: HTTP client timeout in seconds.
+            backend: A backend instance or name (``sdk``, ``cli`` or ``fake``);
+                defaults to ``MODAL_FOR_NOOBS_BACKEND``, then ``sdk``.
+        """
         self.client = httpx.AsyncClient(timeout=timeout)
+        self.backend = create_backend(backend) if backend is None or isinstance(backend, str) else backend
 
     async def close(self) -> None:
         """Close the HTTP client."""
         await self.client.aclose()
 
-    async def list_deployments(self) -> list[dict[str, Any]]:
-        """List active Modal deployments with enhanced metadata."""
+    async def list_deployments(self) -> list[AppInfo]:
+        """List active Modal deployments, served from the shared app-list cache."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "list", "--json", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                try:
-                    # Try to parse JSON output
-                    deployments = json.loads(stdout.decode())
-                    return deployments if isinstance(deployments, list) else []
-                except json.JSONDecodeError:
-                    # Fallback to text parsing
-                    return await self._parse_deployment_list(stdout.decode())
-            else:
-                logger.error(f"Failed to list deployments: {stderr.decode()}")
-                return []
-
+            return await app_list_cache.get(self.backend.cache_key, self.backend.list_apps)
         except Exception as e:
             logger.error(f"Error listing deployments: {e}")
             return []
 
-    async def _parse_deployment_list(self, output: str) -> list[dict[str, Any]]:
-        """Parse deployment list from text output."""
-        deployments = []
-        lines = output.strip().split("\n")
+    async def get_app_details(self, app_id: str) -> dict[str, Any]:
+        """URL, GPU type and functions of an app, as far as the backend knows them."""
+        try:
+            return await app_details_cache.get(
+                f"{self.backend.cache_key}:{app_id}", lambda: self.backend.app_details(app_id)
+            )
+        except Exception as e:
+            logger.debug(f"Could not get details for app {app_id}: {e}")
+            return {}
 
-        for line in lines[1:]:  # Skip header
-            if line.strip():
-                parts = line.split()
-                if len(parts) >= 2:
-                    deployment = {
-                        "name": parts[0],
-                        "status": parts[1] if len(parts) > 1 else "unknown",
-                        "url": self._extract_url_from_line(line),
-                        "created_at": parts[2] if len(parts) > 2 else None,
-                    }
-                    deployments.append(deployment)
+    async def get_many_app_details(
+        self, app_ids: list[str], concurrency: int = APP_DETAILS_CONCURRENCY
+    ) -> dict[str, dict[str, Any]]:
+        """Details of several apps, fetched at most ``concurrency`` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
 
-        return deployments
+        async def bounded(app_id: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.get_app_details(app_id)
 
-    def _extract_url_from_line(self, line: str) -> str | None:
-        """Extract URL from a deployment line."""
-        if "https://" in line:
-            parts = line.split()
-            for part in parts:
-                if part.startswith("https://"):
-                    return part
-        return None
+        return dict(zip(app_ids, await asyncio.gather(*(bounded(app_id) for app_id in app_ids)), strict=True))
 
     async def kill_deployment(self, app_name: str) -> bool:
         """Kill a specific deployment."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "stop", app_name, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                logger.info(f"Successfully killed deployment: {app_name}")
-                return True
-            else:
-                logger.error(f"Failed to kill deployment {app_name}: {stderr.decode()}")
-                return False
-
+            await self.backend.stop_app(app_name)
+            invalidate_apps()
+            logger.info(f"Successfully killed deployment: {app_name}")
+            return True
         except Exception as e:
             logger.error(f"Error killing deployment {app_name}: {e}")
             return False
@@ -232,59 +274,33 @@ class ModalAPI:
     async def get_app_logs(self, app_name: str, lines: int = 100) -> str:
         """Get logs for a specific app."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "app", "logs", app_name, "--lines", str(lines), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                return stdout.decode()
-            else:
-                logger.error(f"Failed to get logs for {app_name}: {stderr.decode()}")
-                return f"Error getting logs: {stderr.decode()}"
-
+            return await self.backend.app_logs(app_name, lines)
         except Exception as e:
             logger.error(f"Error getting logs for {app_name}: {e}")
             return f"Error getting logs: {e}"
 
-    async def create_secret(self, name: str, value: str) -> bool:
-        """Create a Modal secret."""
+    async def get_app_log_records(self, app_name: str, lines: int = 100) -> list[LogRecord]:
+        """Parsed log records of an app, empty if its logs cannot be fetched."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "secret", "create", name, value, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                logger.info(f"Successfully created secret: {name}")
-                return True
-            else:
-                logger.error(f"Failed to create secret {name}: {stderr.decode()}")
-                return False
+            return list(parse_log_text(await self.backend.app_logs(app_name, lines)))
+        except Exception as e:
+            logger.error(f"Error getting logs for {app_name}: {e}")
+            return []
 
+    async def create_secret(self, name: str, value: str) -> bool:
+        """Create a Modal secret from ``KEY=VALUE`` pairs."""
+        try:
+            await self.backend.create_secret(name, value)
+            logger.info(f"Successfully created secret: {name}")
+            return True
         except Exception as e:
             logger.error(f"Error creating secret {name}: {e}")
             return False
 
     async def list_secrets(self) -> list[str]:
-        """List available Modal secrets."""
+        """List the names of available Modal secrets."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                "modal", "secret", "list", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                secrets = []
-                lines = stdout.decode().strip().split("\n")
-                for line in lines[1:]:  # Skip header
-                    if line.strip():
-                        secrets.append(line.split()[0])
-                return secrets
-            else:
-                logger.error(f"Failed to list secrets: {stderr.decode()}")
-                return []
-
+            return [secret.name for secret in await self.backend.list_secrets()]
         except Exception as e:
             logger.error(f"Error listing secrets: {e}")
             return []
@@ -293,13 +309,35 @@ class ModalAPI:
 class ModalDeployer:
     """Enhanced async-first Modal deployment handler with advanced features."""
 
-    def __init__(self, app_file: Path, mode: str = "minimum", br_huehuehue: bool = False, config: DeploymentConfig | None = None):
-        """Initialize the deployer with app file and deployment configuration."""
+    def __init__(
+        self,
+        app_file: Path,
+        mode: str = "minimum",
+        br_huehuehue: bool = False,
+        config: DeploymentConfig | None = None,
+        render_cache: RenderCache | None = None,
+        use_cache: bool = True,
+        ledger: DeploymentLedger | None = None,
+        on_output: OutputCallback | None = None,
+    ):
+        """Initialize the deployer with app file and deployment configuration.
+
+        ``render_cache`` defaults to the shared on-disk cache; pass
+        ``use_cache=False`` to always re-render the deployment file.
+        ``ledger`` defaults to the shared ledger of successful deployments.
+        ``on_output`` receives each ``modal deploy`` output line as it arrives.
+        """
         self.app_file = app_file
         self.mode = mode
         self.br_huehuehue = br_huehuehue
         self.config_loader = config_loader
         self.modal_api = ModalAPI()
+        self.render_cache = (render_cache or default_render_cache) if use_cache else None
+        self.ledger = ledger or deployment_ledger
+        self.on_output = on_output
+        self.phases: list[PhaseSpan] = []
+        self._phase_origin = time.perf_counter()
+        self.last_render_cache_hit: bool | None = None
 
         # Use provided config or create default
         self.config = config or DeploymentConfig(mode=mode, app_name=app_file.stem)
@@ -308,6 +346,19 @@ class ModalDeployer:
         """Close resources."""
         await self.modal_api.close()
 
+    def _record_phase(self, name: str, start: float, end: float) -> None:
+        """Record a phase from two ``time.perf_counter()`` readings."""
+        self.phases.append(PhaseSpan(name=name, start=start - self._phase_origin, duration=end - start))
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a deployment phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_phase(name, start, time.perf_counter())
+
     async def check_modal_auth_async(self) -> bool:
         """Check if Modal is authenticated (async).
 
@@ -357,69 +408,7 @@ class ModalDeployer:
 
     async def validate_app_file(self, app_file: Path) -> dict[str, Any]:
         """Validate a Gradio app file for Modal deployment."""
-        if not app_file.exists():
-            return {"valid": False, "error": f"File not found: {app_file}", "recommendations": ["Create the file first"]}
-
-        if not app_file.suffix == ".py":
-            return {"valid": False, "error": "File must be a Python file (.py)", "recommendations": ["Rename file with .py extension"]}
-
-        try:
-            content = app_file.read_text()
-
-            # Check for Gradio imports
-            has_gradio = "import gradio" in content or "from gradio" in content
-            has_blocks = "gr.Blocks" in content or "gradio.Blocks" in content
-            has_interface = "gr.Interface" in content or "gradio.Interface" in content
-            has_launch = ".launch(" in content
-
-            recommendations = []
-            warnings = []
-
-            if not has_gradio:
-                recommendations.append("Add 'import gradio as gr' to your file")
-
-            if not (has_blocks or has_interface):
-                recommendations.append("Create a Gradio interface using gr.Blocks() or gr.Interface()")
-
-            if not has_launch:
-                warnings.append("Consider adding .launch() for local testing")
-
-            # Check for common ML libraries
-            ml_libraries = ["torch", "tensorflow", "transformers", "sklearn", "numpy", "pandas"]
-            detected_ml = [lib for lib in ml_libraries if lib in content]
-
-            if detected_ml:
-                recommendations.append(f"Consider using 'optimized' mode for ML libraries: {', '.join(detected_ml)}")
-
-            # Check for Jupyter-related imports
-            jupyter_imports = ["jupyter", "notebook", "ipywidgets", "matplotlib", "plotly"]
-            detected_jupyter = [lib for lib in jupyter_imports if lib in content]
-
-            if detected_jupyter:
-                recommendations.append("Consider using 'gra_jupy' mode for Jupyter features")
-
-            return {
-                "valid": has_gradio and (has_blocks or has_interface),
-                "has_gradio": has_gradio,
-                "has_interface": has_blocks or has_interface,
-                "has_launch": has_launch,
-                "detected_ml_libraries": detected_ml,
-                "detected_jupyter": detected_jupyter,
-                "recommendations": recommendations,
-                "warnings": warnings,
-                "suggested_mode": self._suggest_deployment_mode(detected_ml, detected_jupyter),
-            }
-
-        except Exception as e:
-            return {"valid": False, "error": f"Failed to read file: {e}", "recommendations": ["Check file permissions and content"]}
-
-    def _suggest_deployment_mode(self, ml_libraries: list[str], jupyter_libraries: list[str]) -> str:
-        """Suggest the best deployment mode based on detected libraries."""
-        if jupyter_libraries:
-            return "gra_jupy"
-        if ml_libraries:
-            return "optimized"
-        return "minimum"
+        return validate_app_file(app_file)
 
     async def setup_environment_variables(self, env_vars: dict[str, str]) -> bool:
         """Setup environment variables for deployment."""
@@ -462,85 +451,156 @@ class ModalDeployer:
         deployment_config = config or self.config
         deployment_file = app_file.parent / f"modal_{app_file.stem}.py"
 
-        # Parse requirements.txt if provided
-        custom_packages = deployment_config.custom_packages.copy()
-        if deployment_config.requirements_path and deployment_config.requirements_path.exists():
-            try:
-                requirements_content = deployment_config.requirements_path.read_text().strip()
-                for line in requirements_content.split("\n"):
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        # Remove version numbers and git URLs
-                        package_name = (
-                            line.split("==")[0]
-                            .split(">=")[0]
-                            .split("<=")[0]
-                            .split("~=")[0]
-                            .split("!=")[0]
-                            .split(">")[0]
-                            .split("<")[0]
-                            .split("@")[0]
-                            .strip()
-                        )
-                        if package_name and package_name not in custom_packages:
-                            custom_packages.append(package_name)
-            except Exception as e:
-                logger.warning(f"Could not parse requirements.txt: {e}")
+        with self._phase("render"):
+            deployment_template, render_key = await self._prepare_deployment(app_file, deployment_file, deployment_config)
+        if deployment_template is None:
+            return deployment_file
 
-        # Load base packages from config
-        package_config = config_loader.load_base_packages()
-        base_packages_list = package_config.get(deployment_config.mode, package_config.get("minimum", []))
+        # Write deployment file (async file writing)
+        def write_file():
+            with open(deployment_file, "w") as f:
+                f.write(deployment_template)
 
-        # Combine base packages with custom ones (avoiding duplicates)
-        all_packages = base_packages_list.copy()
-        for pkg in custom_packages:
-            pkg_clean = pkg.lower()
-            if not any(pkg_clean in base_pkg.lower() for base_pkg in base_packages_list):
-                all_packages.append(pkg)
+        with self._phase("write"):
+            await asyncio.to_thread(write_file)
 
-        # Create enhanced image configuration
-        image_config = self._get_enhanced_image_config(deployment_config.mode, all_packages, deployment_config.system_packages)
+            if render_key is not None:
+                self.render_cache.record(deployment_file, render_key)
+
+        if self.last_render_cache_hit:
+            rprint(f"[{MODAL_GREEN}]♻️ Restored deployment file from render cache: {deployment_file}[/{MODAL_GREEN}]")
+        else:
+            rprint(f"[{MODAL_GREEN}]✅ Created enhanced deployment file: {deployment_file}[/{MODAL_GREEN}]")
+        return deployment_file
+
+    async def _prepare_deployment(
+        self, app_file: Path, deployment_file: Path, deployment_config: DeploymentConfig
+    ) -> tuple[str | None, str | None]:
+        """Get the rendered deployment from the render cache or the templates.
 
+        Returns:
+            tuple[str | None, str | None]: The content to write, or None if
+            ``deployment_file`` already holds it, and the render key if the
+            cache is enabled.
+        """
         # Read the original app code
         original_code = app_file.read_text()
 
+        # Content-address the render so unchanged deployments skip package
+        # resolution, rendering and writing
+        render_key = None
+        if self.render_cache is not None:
+            input_files = [config_loader.config_dir / "base_packages.yml", deployment_config.requirements_path]
+            if deployment_config.requirements_path and deployment_config.requirements_path.exists():
+                # Files pulled in with -r change the packages too
+                try:
+                    input_files += read_requirements(deployment_config.requirements_path).files[1:]
+                except (OSError, UnicodeDecodeError):
+                    pass
+            if deployment_config.minimal_image:
+                input_files += [config_loader.config_dir / "import_packages.yml", *find_local_modules(app_file, original_code)]
+            if deployment_config.lock_dependencies:
+                input_files.append(lock_path_for(deployment_file))
+            render_key = compute_render_key(original_code, deployment_config.to_dict(), app_file.name, input_files)
+            if self.render_cache.is_current(deployment_file, render_key):
+                self.last_render_cache_hit = True
+                rprint(f"[{MODAL_GREEN}]♻️ Deployment file unchanged (render cache hit): {deployment_file}[/{MODAL_GREEN}]")
+                return None, render_key
+
+            deployment_template = self.render_cache.lookup(render_key)
+            self.last_render_cache_hit = deployment_template is not None
+        else:
+            deployment_template = None
+            self.last_render_cache_hit = None
+
+        if deployment_template is None:
+            # Render off the event loop so concurrent deploys render in parallel
+            lock_file = lock_path_for(deployment_file) if deployment_config.lock_dependencies else None
+            deployment_template = await asyncio.to_thread(self._render_deployment, app_file, original_code, deployment_config, lock_file)
+
+            if render_key is not None:
+                self.render_cache.store(render_key, deployment_template)
+
+        return deployment_template, render_key
+
+    def _render_deployment(self, app_file: Path, original_code: str, config: DeploymentConfig, lock_file: Path | None = None) -> str:
+        """Resolve packages and render the deployment file contents.
+
+        With a ``lock_file``, packages are pinned through it and installed
+        with ``uv_pip_install``; if locking fails the image stays unpinned.
+        """
+        all_packages = self._resolve_packages(config, app_file, original_code)
+
+        installer = "pip_install"
+        if lock_file is not None:
+            try:
+                wheels = image_wheel_dir(config.wheelhouse, config.mode) if config.wheelhouse else None
+                all_packages = compile_lock(all_packages, lock_file, find_links=wheels)
+                installer = "uv_pip_install"
+                rprint(f"[{MODAL_GREEN}]🔒 Pinned {len(all_packages)} packages in {lock_file}[/{MODAL_GREEN}]")
+            except LockError as e:
+                logger.warning(f"Could not lock dependencies: {e}")
+                rprint(f"[yellow]⚠️  Could not lock dependencies, building an unpinned image: {e}[/yellow]")
+
+        # Create enhanced image configuration
+        image_config = self._get_enhanced_image_config(config.mode, all_packages, config.system_packages, installer, config.wheelhouse)
+
         # Generate enhanced deployment using template system
-        deployment_template = self._generate_enhanced_deployment(
+        return self._generate_enhanced_deployment(
             app_file=app_file,
             original_code=original_code,
-            config=deployment_config,
+            config=config,
             image_config=image_config,
-        )
+        ).strip()
 
-        # Write deployment file (async file writing)
-        def write_file():
-            with open(deployment_file, "w") as f:
-                f.write(deployment_template.strip())
+    def _resolve_packages(self, config: DeploymentConfig, app_file: Path | None = None, original_code: str | None = None) -> list[str]:
+        """Resolve the image package list from the mode's base packages and the requirements file.
 
-        await asyncio.to_thread(write_file)
-
-        rprint(f"[{MODAL_GREEN}]✅ Created enhanced deployment file: {deployment_file}[/{MODAL_GREEN}]")
-        return deployment_file
-
-    def _get_enhanced_image_config(self, mode: str, packages: list[str], system_packages: list[str] = None) -> str:
-        """Get enhanced image configuration using the template system."""
-        system_packages = system_packages or []
+        With ``config.minimal_image`` and an ``app_file``, optional base
+        packages the app's import graph does not use are left out.
+        """
+        # Parse requirements.txt if provided, following -r includes
+        requirements = RequirementSet(config.custom_packages)
+        if config.requirements_path and config.requirements_path.exists():
+            try:
+                requirements.read(config.requirements_path)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"Could not parse requirements.txt: {e}")
+            if requirements.index_options:
+                rprint(f"[yellow]⚠️  Index options in requirements.txt are not applied to the image: {', '.join(requirements.index_options)}[/yellow]")
+        custom_packages = requirements.to_list()
 
-        # Use the existing template system's image configuration
-        base_config = get_image_config(mode, packages)
+        # Load base packages from config
+        package_config = config_loader.load_base_packages()
+        base_packages_list = package_config.get(config.mode, package_config.get("minimum", []))
+
+        if config.minimal_image and app_file is not None:
+            resolution = resolve_image_packages(app_file, config.mode, base_packages_list, custom_packages, source=original_code)
+            base_packages_list = resolution.packages
+            if resolution.dropped:
+                rprint(
+                    f"[{MODAL_GREEN}]📦 Minimal image: skipped {len(resolution.dropped)} unused packages "
+                    f"(~{resolution.estimated_saved_mb / 1024:.1f} GB saved): {', '.join(resolution.dropped)}[/{MODAL_GREEN}]"
+                )
+            if resolution.unknown_imports:
+                rprint(
+                    f"[yellow]⚠️  No known package for imports: {', '.join(resolution.unknown_imports)}. "
+                    f"Add them to requirements.txt if the image needs them.[/yellow]"
+                )
 
-        # If we have additional system packages, enhance the base config
-        if system_packages:
-            system_pkgs_str = '", "'.join(system_packages)
-            # Add system packages to the base configuration
-            if ".pip_install(" in base_config:
-                # Insert apt_install before pip_install
-                base_config = base_config.replace(".pip_install(", f'.apt_install("{system_pkgs_str}").pip_install(')
-            else:
-                # Add apt_install to the end
-                base_config = base_config.rstrip(")") + f'.apt_install("{system_pkgs_str}")'
+        # Combine base packages with custom ones, one merged entry per distribution
+        return RequirementSet([*base_packages_list, *custom_packages]).to_list()
 
-        return base_config
+    def _get_enhanced_image_config(
+        self,
+        mode: str,
+        packages: list[str],
+        system_packages: list[str] = None,
+        installer: str = "pip_install",
+        wheelhouse: Path | None = None,
+    ) -> str:
+        """Get the layered image configuration, with system packages in their own layer."""
+        return get_image_config(mode, packages, system_packages, installer, wheelhouse)
 
     def _generate_enhanced_deployment(self, app_file: Path, original_code: str, config: DeploymentConfig, image_config: str) -> str:
         """Generate enhanced deployment using the template system with advanced Modal features."""
@@ -566,13 +626,24 @@ class ModalDeployer:
                 timeout_seconds=config.timeout_minutes * 60,
                 scaledown_window=config.scaledown_window,
                 image_config=image_config,
+                dashboard_runtime=config.dashboard_runtime,
             )
 
         # For advanced configurations, create enhanced template
         return self._create_enhanced_template(app_file=app_file, original_code=original_code, config=config, image_config=image_config)
 
     def _create_enhanced_template(self, app_file: Path, original_code: str, config: DeploymentConfig, image_config: str) -> str:
-        """Create enhanced template with advanced Modal features."""
+        """Create enhanced template with advanced Modal features.
+
+        Raises:
+            ValueError: If ``config`` asks for the image dashboard runtime; this
+                template does not include the dashboard.
+        """
+        if config.dashboard_runtime != "embedded":
+            raise ValueError(
+                f"The '{config.dashboard_runtime}' dashboard runtime is not supported with GPU, resource, scaling, "
+                "secret, volume or environment settings"
+            )
         # Build function parameters dynamically
         function_params = ["image=image"]
 
@@ -657,7 +728,11 @@ class ModalDeployer:
         queue_size = config.concurrent_inputs * 10
 
         # Import template constants
-        from modal_for_noobs.templates.template_constants import APP_EXECUTION, DEMO_QUEUE_CONFIG, GRADIO_DETECTION, MODAL_IMPORTS
+        from modal_for_noobs.templates.template_constants import APP_EXECUTION, DEMO_QUEUE_CONFIG, MODAL_IMPORTS, build_gradio_detection
+
+        # Check the interface variables the app really defines first
+        gradio_detection = build_gradio_detection(analyze_source(original_code).detection_names(), indent="    ")
+        queue_config = textwrap.indent(DEMO_QUEUE_CONFIG.replace("20", str(queue_size)), "    ")
 
         # Build template using safe string concatenation
         header_section = f"""# 🚀 Enhanced Modal Deployment Script
@@ -699,9 +774,9 @@ def deploy_gradio():
     logger.info("Starting enhanced Modal deployment: {app_name_expr}")
     logger.info("Mode: {mode_info} | GPU: {gpu_info}")
     
-    {GRADIO_DETECTION}
+{gradio_detection}
     
-    {DEMO_QUEUE_CONFIG.replace("20", str(queue_size))}
+{queue_config}
     
     # Enhanced FastAPI integration
     fastapi_app = FastAPI(
@@ -729,34 +804,66 @@ def deploy_gradio():
 
         try:
             # Enhanced deployment command with additional flags
-            cmd = ["modal", "deploy", str(deployment_file)]
+            cmd = ["deploy", str(deployment_file)]
 
             # Add deployment-specific flags
             if deployment_config.app_name:
                 cmd.extend(["--name", deployment_config.app_name])
 
-            process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-            stdout, stderr = await process.communicate()
+            # Stream both pipes so progress, the URL and the app ID show up as
+            # soon as Modal prints them; only the tail of the output is kept
+            stdout_tail: deque[str] = deque(maxlen=OUTPUT_BUFFER_LINES)
+            stderr_tail: deque[str] = deque(maxlen=OUTPUT_BUFFER_LINES)
+            url = None
+            app_id = None
+            url_seen_at = None
+
+            def handle_line(stream: str, line: str) -> None:
+                nonlocal url, app_id, url_seen_at
+                (stdout_tail if stream == "stdout" else stderr_tail).append(line)
+                if url is None:
+                    url = self._extract_url_from_output(line)
+                    if url:
+                        url_seen_at = time.perf_counter()
+                        rprint(f"[{MODAL_GREEN}]🌐 App URL: {url}[/{MODAL_GREEN}]")
+                if app_id is None:
+                    app_id = self._extract_app_id_from_output(line)
+                if self.on_output:
+                    self.on_output(stream, line)
+                else:
+                    logger.debug(f"modal deploy: {line}")
+
+            spawn_started_at = time.perf_counter()
+            command = await stream_modal(*cmd, on_line=handle_line, timeout=DEPLOY_TIMEOUT)
+            # Even a failed deploy may have created or changed the app
+            invalidate_apps()
+            spawned_at = command.spawned_at or spawn_started_at
+            self._record_phase("spawn", spawn_started_at, spawned_at)
+
+            # Image build and upload run until Modal prints the URL; the rest is serving the app
+            exited_at = time.perf_counter()
+            self._record_phase("build", spawned_at, url_seen_at or exited_at)
+            if url_seen_at is not None:
+                self._record_phase("serve", url_seen_at, exited_at)
 
             deployment_time = asyncio.get_event_loop().time() - start_time
-            output = stdout.decode()
-            error_output = stderr.decode()
+            output = "\n".join(stdout_tail)
+            error_output = "\n".join(stderr_tail)
 
-            if process.returncode != 0:
-                logger.error(f"Deployment failed with exit code {process.returncode}")
+            if not command.ok:
+                if command.timed_out:
+                    logger.error(f"Deployment failed: {command.error}")
+                else:
+                    logger.error(f"Deployment failed with exit code {command.returncode}")
                 return DeploymentResult(
                     success=False,
-                    error=error_output,
+                    error=command.error if command.timed_out else error_output,
                     output=output,
                     deployment_file=deployment_file,
                     config=deployment_config,
                     deployment_time=deployment_time,
                 )
 
-            # Extract URL and app ID from output
-            url = self._extract_url_from_output(output)
-            app_id = self._extract_app_id_from_output(output)
-
             logger.success(f"Deployment successful in {deployment_time:.2f}s")
 
             return DeploymentResult(
@@ -800,41 +907,102 @@ def deploy_gradio():
                         return parts[i + 1]
         return None
 
-    async def deploy(self, config: DeploymentConfig | None = None) -> DeploymentResult:
+    async def _is_live(self, entry: LedgerEntry) -> bool:
+        """Check that a ledger entry's app is still deployed on Modal."""
+        for app in await self.modal_api.list_deployments():
+            if app.matches(entry.app_name) or (entry.app_id and app.matches(entry.app_id)):
+                return app.is_live
+        return False
+
+    async def deploy(self, config: DeploymentConfig | None = None, skip_unchanged: bool = False) -> DeploymentResult:
         """Enhanced main deployment method with comprehensive configuration support.
 
+        Args:
+            config: Deployment configuration, defaults to the deployer's config.
+            skip_unchanged: Return the ledger's last result without running
+                ``modal deploy`` when the generated file is byte-identical to
+                the last successful deploy of this app and the app is still
+                listed as live by ``modal app list``.
+
         Returns:
-            DeploymentResult: Comprehensive deployment result with metadata.
+            DeploymentResult: Comprehensive deployment result with metadata,
+            including per-phase timings in ``phases``.
         """
+        self.phases = []
+        self._phase_origin = time.perf_counter()
+        result = await self._deploy(config, skip_unchanged)
+        result.phases = list(self.phases)
+        return result
+
+    async def _deploy(self, config: DeploymentConfig | None, skip_unchanged: bool) -> DeploymentResult:
+        """Run the deployment phases for :meth:`deploy`."""
         deployment_config = config or self.config
+        app_name = deployment_config.app_name or self.app_file.stem
 
         try:
             # Validate app file
-            validation = await self.validate_app_file(self.app_file)
+            with self._phase("validate"):
+                validation = await self.validate_app_file(self.app_file)
             if not validation["valid"]:
                 logger.error(f"App validation failed: {validation['error']}")
                 return DeploymentResult(success=False, error=f"App validation failed: {validation['error']}", config=deployment_config)
 
             # Check authentication
-            if not await self.check_modal_auth_async():
-                logger.info("Modal authentication not found, setting up...")
-                if not await self.setup_modal_auth_async():
-                    return DeploymentResult(success=False, error="Failed to setup Modal authentication", config=deployment_config)
+            with self._phase("auth"):
+                authenticated = await self.check_modal_auth_async()
+                if not authenticated:
+                    logger.info("Modal authentication not found, setting up...")
+                    authenticated = await self.setup_modal_auth_async()
+            if not authenticated:
+                return DeploymentResult(success=False, error="Failed to setup Modal authentication", config=deployment_config)
 
             # Setup environment variables and secrets
-            if deployment_config.environment_variables:
-                await self.setup_environment_variables(deployment_config.environment_variables)
+            with self._phase("secrets"):
+                if deployment_config.environment_variables:
+                    await self.setup_environment_variables(deployment_config.environment_variables)
 
-            if deployment_config.secrets:
-                secrets_ok = await self.setup_secrets(deployment_config.secrets)
-                if not secrets_ok:
-                    logger.warning("Some secrets are missing, deployment may fail")
+                if deployment_config.secrets:
+                    secrets_ok = await self.setup_secrets(deployment_config.secrets)
+                    if not secrets_ok:
+                        logger.warning("Some secrets are missing, deployment may fail")
 
             # Create enhanced deployment file
             deployment_file = await self.create_modal_deployment_async(self.app_file, deployment_config)
+            digest = await asyncio.to_thread(file_digest, deployment_file)
+
+            if skip_unchanged:
+                entry = self.ledger.is_unchanged(app_name, digest)
+                if entry is not None and await self._is_live(entry):
+                    rprint(f"[{MODAL_GREEN}]⏭️ {app_name} is unchanged since its last deploy, skipping modal deploy[/{MODAL_GREEN}]")
+                    if entry.url:
+                        rprint(f"[{MODAL_GREEN}]🌐 Your app is live at: {entry.url}[/{MODAL_GREEN}]")
+                    return DeploymentResult(
+                        success=True,
+                        url=entry.url,
+                        app_id=entry.app_id,
+                        deployment_file=deployment_file,
+                        config=deployment_config,
+                        deployment_time=entry.deployment_time,
+                        render_cache_hit=self.last_render_cache_hit,
+                        skipped=True,
+                    )
+                if entry is not None:
+                    logger.info(f"{app_name} is no longer live on Modal, redeploying")
+                    self.ledger.forget(app_name)
 
             # Deploy to Modal with enhanced configuration
             result = await self.deploy_to_modal_async(deployment_file, deployment_config)
+            result.render_cache_hit = self.last_render_cache_hit
+
+            if result.success:
+                self.ledger.record(
+                    app_name,
+                    digest,
+                    url=result.url,
+                    app_id=result.app_id,
+                    deployment_file=deployment_file,
+                    deployment_time=result.deployment_time,
+                )
 
             if result.success:
                 rprint(f"[{MODAL_GREEN}]🎉 Enhanced deployment successful![/{MODAL_GREEN}]")
@@ -868,17 +1036,17 @@ def deploy_gradio():
             deployments = await self.modal_api.list_deployments()
 
             for deployment in deployments:
-                if deployment.get("name") == app_name:
+                if deployment.matches(app_name):
                     # Get additional metadata
                     logs = await self.modal_api.get_app_logs(app_name, lines=10)
 
                     return {
                         "found": True,
-                        "status": deployment.get("status"),
-                        "url": deployment.get("url"),
-                        "created_at": deployment.get("created_at"),
+                        "status": deployment.state,
+                        "url": deployment.url,
+                        "created_at": deployment.created_at,
                         "recent_logs": logs[:500] if logs else "No logs available",
-                        "metadata": deployment,
+                        "metadata": deployment.to_dict(),
                     }
 
             return {"found": False, "error": f"App '{app_name}' not found"}
@@ -893,6 +1061,7 @@ def deploy_gradio():
             success = await self.modal_api.kill_deployment(app_name)
 
             if success:
+                self.ledger.forget(app_name)
                 rprint(f"[{MODAL_GREEN}]✅ Successfully killed deployment: {app_name}[/{MODAL_GREEN}]")
             else:
                 rprint(f"[red]❌ Failed to kill deployment: {app_name}[/red]")
@@ -0,0 +1,234 @@
+"""Typed parsing of ``modal app list`` and ``modal secret list`` output.
+
+Listings are requested with ``--json`` where Modal supports it. Older CLIs and
+captured output fall back to a table parser that understands Rich box tables
+(including cells wrapped over several lines) and plain, space-aligned tables.
+Rows become small slotted dataclasses instead of ad-hoc dicts.
+"""
+
+import functools
+import json
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Column separators of Rich box styles, plus ASCII tables
+_CELL_SEPARATORS = re.compile(r"[│┃║|]")
+_HAS_TEXT = re.compile(r"[0-9A-Za-z]")
+_WIDE_GAP = re.compile(r"\s{2,}")
+_URL = re.compile(r"https://\S+")
+_JSON_KEY = re.compile(r"[^a-zA-Z0-9]+")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# States in which an app no longer serves requests
+STOPPED_STATES = frozenset({"stopped", "stopping"})
+
+
+@functools.cache
+def json_key(column: str) -> str:
+    """``App ID`` -> ``app_id``, the same keys ``modal ... --json`` uses."""
+    return _JSON_KEY.sub("_", column).lower().strip("_")
+
+
+@dataclass(slots=True, frozen=True)
+class AppInfo:
+    """One row of ``modal app list``."""
+
+    app_id: str
+    name: str
+    state: str = "unknown"
+    tasks: int = 0
+    created_at: str | None = None
+    stopped_at: str | None = None
+    url: str | None = None
+
+    @property
+    def is_live(self) -> bool:
+        """Whether the app is deployed or running rather than stopped."""
+        return self.state.lower() not in STOPPED_STATES
+
+    def matches(self, app: str) -> bool:
+        """Whether ``app`` is this app's ID or name."""
+        return app in (self.app_id, self.name)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict, e.g. for JSON responses."""
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class SecretInfo:
+    """One row of ``modal secret list``."""
+
+    name: str
+    created_at: str | None = None
+    created_by: str | None = None
+    last_used_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict, e.g. for JSON responses."""
+        return asdict(self)
+
+
+def _text(value: Any) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def app_from_row(row: Mapping[str, Any]) -> AppInfo | None:
+    """An app from a JSON object or table row, or ``None`` if it has no ID or name.
+
+    Keys are matched case-insensitively, so ``App ID`` and ``app_id`` both work,
+    as do the ``name``/``status``/``created`` columns of older listings.
+    """
+    values = {json_key(str(key)): value for key, value in row.items()}
+    app_id = _text(values.get("app_id")) or _text(values.get("name")) or _text(values.get("app"))
+    if not app_id:
+        return None
+    tasks = _text(values.get("tasks")) or ""
+    url = _text(values.get("url"))
+    if url is None:
+        url = next((match.group() for value in values.values() if isinstance(value, str) and (match := _URL.search(value))), None)
+    return AppInfo(
+        app_id=app_id,
+        name=_text(values.get("description")) or _text(values.get("name")) or app_id,
+        state=_text(values.get("state")) or _text(values.get("status")) or "unknown",
+        tasks=int(tasks) if tasks.isdigit() else 0,
+        created_at=_text(values.get("created_at")) or _text(values.get("created")),
+        stopped_at=_text(values.get("stopped_at")),
+        url=url,
+    )
+
+
+def secret_from_row(row: Mapping[str, Any]) -> SecretInfo | None:
+    """A secret from a JSON object or table row, or ``None`` if it has no name."""
+    values = {json_key(str(key)): value for key, value in row.items()}
+    name = _text(values.get("name"))
+    if not name:
+        return None
+    return SecretInfo(
+        name=name,
+        created_at=_text(values.get("created_at")),
+        created_by=_text(values.get("created_by")),
+        last_used_at=_text(values.get("last_used_at")),
+    )
+
+
+def _split_boxed(line: str) -> tuple[list[str], list[int]]:
+    """Cells of a box-table line and the inner width of each."""
+    segments = _CELL_SEPARATORS.split(line)
+    # The outer borders leave empty segments at both ends
+    if segments and not segments[0].strip():
+        segments = segments[1:]
+    if segments and not segments[-1].strip():
+        segments = segments[:-1]
+    return [segment.strip() for segment in segments], [max(len(segment) - 2, 0) for segment in segments]
+
+
+def _join_wrapped(cell: str, previous_line: str, fragment: str, width: int) -> str:
+    """Append a cell's continuation line.
+
+    A previous line that fills the column is taken to be a word folded in the
+    middle, except for the date of a timestamp. Other words that happen to end
+    exactly at the column edge lose their space; ``--json`` output avoids the
+    ambiguity.
+    """
+    if not cell:
+        return fragment
+    if len(previous_line) >= width and not _DATE.fullmatch(previous_line):
+        return cell + fragment
+    return f"{cell} {fragment}"
+
+
+def _parse_boxed(lines: list[str]) -> list[dict[str, str]]:
+    header: list[str] = []
+    header_done = False
+    rows: list[list[str]] = []
+    # Inner cell widths and the latest physical line of each cell in the last row
+    widths: list[int] = []
+    last_lines: list[str] = []
+    for line in lines:
+        if not _HAS_TEXT.search(line):
+            # Rules: the first one after the header closes it
+            if header:
+                header_done = True
+            continue
+        if not _CELL_SEPARATORS.search(line):
+            continue  # Title or caption
+        cells, cell_widths = _split_boxed(line)
+        if not header_done:
+            if header:
+                header = [
+                    _join_wrapped(name, previous, fragment, width) if fragment else name
+                    for name, previous, fragment, width in zip(header, last_lines, cells, cell_widths, strict=False)
+                ]
+            else:
+                header = list(cells)
+            last_lines = [fragment or previous for previous, fragment in zip(last_lines or cells, cells, strict=False)]
+            continue
+        if rows and cells and not cells[0]:
+            # A wrapped row continues in the cells of the previous one
+            last = rows[-1]
+            for i, fragment in enumerate(cells[: len(last)]):
+                if fragment:
+                    last[i] = _join_wrapped(last[i], last_lines[i], fragment, widths[i])
+                    last_lines[i] = fragment
+            continue
+        rows.append(cells)
+        widths = cell_widths
+        last_lines = list(cells)
+    return [dict(zip(header, row, strict=False)) for row in rows]
+
+
+def _parse_plain(lines: list[str]) -> list[dict[str, str]]:
+    lines = [line for line in lines if line.strip() and _HAS_TEXT.search(line)]
+    if not lines:
+        return []
+    header = _WIDE_GAP.split(lines[0].strip())
+    rows = []
+    for line in lines[1:]:
+        cells = _WIDE_GAP.split(line.strip())
+        if len(cells) == len(header):
+            rows.append(dict(zip(header, cells, strict=True)))
+            continue
+        # Not aligned: one word per column, with any leftover words kept apart
+        words = line.split()
+        row = dict(zip(header, words, strict=False))
+        if len(words) > len(header):
+            row["extra"] = " ".join(words[len(header) :])
+        rows.append(row)
+    return rows
+
+
+def parse_table(output: str) -> list[dict[str, str]]:
+    """Rows of a Rich box table or plain, space-aligned table, keyed by column header."""
+    lines = output.splitlines()
+    if any(_CELL_SEPARATORS.search(line) for line in lines):
+        return _parse_boxed(lines)
+    return _parse_plain(lines)
+
+
+def _rows(output: str) -> Iterable[Mapping[str, Any]]:
+    """JSON objects of a ``--json`` listing, or table rows when the output is not JSON."""
+    text = output.strip()
+    if text[:1] in ("[", "{"):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        else:
+            return [row for row in (data if isinstance(data, list) else [data]) if isinstance(row, dict)]
+    return parse_table(text)
+
+
+def parse_apps(output: str) -> list[AppInfo]:
+    """Apps from ``modal app list [--json]`` output."""
+    return [app for row in _rows(output) if (app := app_from_row(row)) is not None]
+
+
+def parse_secrets(output: str) -> list[SecretInfo]:
+    """Secrets from ``modal secret list [--json]`` output."""
+    return [secret for row in _rows(output) if (secret := secret_from_row(row)) is not None]
@@ -0,0 +1,239 @@
+"""Content-addressed render cache for generated Modal deployment files.
+
+Rendering a deployment reads the base package config and the requirements file,
+resolves the package list, loads the mode template and the embedded dashboard
+module, base64-encodes the dashboard and formats the whole script. When none of
+the inputs changed the output is byte-identical, so the rendered file is stored
+under a digest of the raw inputs and reused on the next deploy instead of being
+resolved, rendered and rewritten.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+# Bump when the key layout or the stored entry format changes
+RENDER_CACHE_SCHEMA = 2
+
+PACKAGE_DIR = Path(__file__).parent
+TEMPLATES_DIR = PACKAGE_DIR / "templates"
+TEMPLATE_SUFFIXES = (".py", ".j2")
+
+# Modules outside templates/ that build parts of the rendered file
+RENDER_SOURCES = ("modal_deploy.py",)
+
+
+def default_state_dir() -> Path:
+    """Get the per-user modal-for-noobs state directory.
+
+    Defaults to ``~/.modal-for-noobs`` and honors ``MODAL_FOR_NOOBS_HOME``.
+
+    Returns:
+        Path: The state directory, which may not exist yet.
+    """
+    override = os.getenv("MODAL_FOR_NOOBS_HOME")
+    if override:
+        return Path(override)
+    return Path.home() / ".modal-for-noobs"
+
+
+def default_cache_dir() -> Path:
+    """Get the root cache directory for modal-for-noobs.
+
+    Honors ``MODAL_FOR_NOOBS_CACHE_DIR`` so CI runners can point it at a
+    persisted volume.
+
+    Returns:
+        Path: The cache root, which may not exist yet.
+    """
+    override = os.getenv("MODAL_FOR_NOOBS_CACHE_DIR")
+    if override:
+        return Path(override)
+    return default_state_dir() / "cache"
+
+
+@lru_cache(maxsize=1)
+def template_version() -> str:
+    """Get a digest of every source that shapes a rendered deployment.
+
+    Covers the bundled templates, the deployer code that assembles the image and
+    the advanced template, and the package version. Computed once per process;
+    any edit or upgrade produces a new version and invalidates old renders.
+
+    Returns:
+        str: Hex digest identifying the current template set.
+    """
+    from modal_for_noobs import __version__
+
+    digest = hashlib.sha256(f"schema:{RENDER_CACHE_SCHEMA}:version:{__version__}".encode())
+    template_paths = [path for path in TEMPLATES_DIR.rglob("*") if path.suffix in TEMPLATE_SUFFIXES and "__pycache__" not in path.parts]
+    for path in sorted(template_paths) + [PACKAGE_DIR / name for name in RENDER_SOURCES]:
+        digest.update(str(path.relative_to(PACKAGE_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _file_digest(path: Path | None) -> str | None:
+    """Get the digest of an input file, or None if it is absent."""
+    if path is None:
+        return None
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def compute_render_key(original_code: str, config: dict[str, Any], app_name: str, input_files: list[Path | None] | None = None) -> str:
+    """Compute the content address of a rendered deployment.
+
+    The key is built from raw inputs only, so a hit is known before the base
+    package config or the requirements file are parsed.
+
+    Args:
+        original_code: Source of the Gradio app being embedded.
+        config: ``DeploymentConfig.to_dict()`` of the deployment.
+        app_name: File name of the app, which names the Modal app.
+        input_files: Files the package list is resolved from, such as
+            ``base_packages.yml`` and the requirements file. Missing files
+            are keyed as absent.
+
+    Returns:
+        str: Hex digest of all render inputs.
+    """
+    payload = json.dumps(
+        {
+            "template_version": template_version(),
+            "app_name": app_name,
+            "config": config,
+            "input_files": [[str(path) if path else None, _file_digest(path)] for path in input_files or []],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode())
+    digest.update(b"\0")
+    digest.update(original_code.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write a file atomically so concurrent deploys never see partial output.
+
+    Every write gets its own temporary file, so writers in different threads
+    or processes never share one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as tmp:
+        tmp.write(content)
+    Path(tmp.name).replace(path)
+
+
+class RenderCache:
+    """Store of rendered deployment files keyed by their render inputs."""
+
+    def __init__(self, cache_dir: Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache entries. Defaults to ``render``
+                under :func:`default_cache_dir`, resolved at use time.
+        """
+        self._cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self) -> Path:
+        """Directory holding rendered entries and the file index."""
+        return self._cache_dir or default_cache_dir() / "render"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / "entries" / key[:2] / f"{key}.py"
+
+    def _index_path(self, deployment_file: Path) -> Path:
+        path_digest = hashlib.sha256(str(deployment_file.resolve()).encode()).hexdigest()
+        return self.cache_dir / "files" / f"{path_digest[:32]}.json"
+
+    def lookup(self, key: str) -> str | None:
+        """Get a rendered deployment by key.
+
+        Returns:
+            str | None: The rendered content, or None on a miss.
+        """
+        entry = self._entry_path(key)
+        try:
+            content = entry.read_text()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read render cache entry {entry}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return content
+
+    def store(self, key: str, content: str) -> None:
+        """Store a rendered deployment under its key."""
+        try:
+            atomic_write_text(self._entry_path(key), content)
+        except OSError as e:
+            logger.warning(f"Could not write render cache entry: {e}")
+
+    def is_current(self, deployment_file: Path, key: str) -> bool:
+        """Check whether a deployment file on disk is already the render for ``key``.
+
+        The check compares the recorded key, size and mtime of the file, so an
+        unchanged deployment is detected without reading or rewriting it.
+        """
+        try:
+            record = json.loads(self._index_path(deployment_file).read_text())
+            stat = deployment_file.stat()
+        except (OSError, ValueError):
+            return False
+
+        current = record.get("key") == key and record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns
+        if current:
+            self.hits += 1
+        return current
+
+    def record(self, deployment_file: Path, key: str) -> None:
+        """Remember that ``deployment_file`` currently holds the render for ``key``."""
+        try:
+            stat = deployment_file.stat()
+            record = {"key": key, "path": str(deployment_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            atomic_write_text(self._index_path(deployment_file), json.dumps(record))
+        except OSError as e:
+            logger.warning(f"Could not update render cache index: {e}")
+
+    def clear(self) -> int:
+        """Remove every cached entry and index record.
+
+        Returns:
+            int: Number of files removed.
+        """
+        removed = 0
+        for subdir in ("entries", "files"):
+            root = self.cache_dir / subdir
+            if not root.exists():
+                continue
+            for path in root.rglob("*"):
+                if path.is_file():
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        """Get hit and miss counters for this process."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Global render cache instance
+render_cache = RenderCache()
@@ -0,0 +1,153 @@
+"""Requirements model shared by the deployer, the template generator and the HF migrator.
+
+Parses requirements files with ``packaging.requirements``, following ``-r``
+includes, and merges everything into one normalized set with a single entry
+per distribution. Environment markers are evaluated for the container (Linux,
+Python 3.11), so requirements for other platforms never reach the image.
+"""
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from loguru import logger
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+# Marker environment of the generated images
+TARGET_ENVIRONMENT = {
+    "implementation_name": "cpython",
+    "os_name": "posix",
+    "platform_machine": "x86_64",
+    "platform_python_implementation": "CPython",
+    "platform_system": "Linux",
+    "python_full_version": "3.11.0",
+    "python_version": "3.11",
+    "sys_platform": "linux",
+}
+
+# Requirement-file options that configure the index rather than name a package
+INDEX_OPTIONS = ("--index-url", "-i", "--extra-index-url", "--find-links", "-f", "--no-index", "--pre", "--trusted-host")
+
+_INLINE_COMMENT = re.compile(r"(^|\s+)#.*$")
+_EGG_FRAGMENT = re.compile(r"[#&]egg=([A-Za-z0-9._-]+)")
+
+
+class RequirementSet:
+    """Deduplicated, normalized requirements in first-seen order.
+
+    Adding a distribution that is already present merges it into the existing
+    entry: specifiers are intersected, extras combined and a direct URL wins.
+    """
+
+    def __init__(self, requirements: Iterable[str | Requirement] = ()):
+        self._requirements: dict[str, Requirement] = {}
+        self.index_options: list[str] = []
+        self.skipped: list[str] = []
+        self.files: list[Path] = []
+        self.update(requirements)
+
+    def __contains__(self, name: str) -> bool:
+        return canonicalize_name(name) in self._requirements
+
+    def __iter__(self):
+        return iter(self._requirements.values())
+
+    def __len__(self) -> int:
+        return len(self._requirements)
+
+    def add(self, requirement: str | Requirement) -> bool:
+        """Add one requirement.
+
+        Returns:
+            bool: False if it is invalid or its marker excludes the container.
+        """
+        if isinstance(requirement, str):
+            try:
+                requirement = Requirement(requirement)
+            except InvalidRequirement as e:
+                logger.warning(f"Skipping invalid requirement '{requirement}': {e}")
+                self.skipped.append(requirement)
+                return False
+
+        if requirement.marker is not None and not requirement.marker.evaluate(TARGET_ENVIRONMENT):
+            return False
+
+        name = canonicalize_name(requirement.name)
+        merged = Requirement(name)
+        merged.extras = set(requirement.extras)
+        merged.specifier = requirement.specifier
+        merged.url = requirement.url
+
+        existing = self._requirements.get(name)
+        if existing is not None:
+            merged.extras |= existing.extras
+            merged.specifier = existing.specifier & merged.specifier
+            merged.url = existing.url or merged.url
+        self._requirements[name] = merged
+        return True
+
+    def update(self, requirements: Iterable[str | Requirement]) -> None:
+        """Add several requirements."""
+        for requirement in requirements:
+            self.add(requirement)
+
+    def read(self, path: Path) -> None:
+        """Add the requirements of a requirements file and the files it includes."""
+        self._read(path, set())
+
+    def _read(self, path: Path, seen: set[Path]) -> None:
+        resolved = path.resolve()
+        if resolved in seen:
+            return
+        seen.add(resolved)
+        self.files.append(path)
+
+        for line in _logical_lines(path.read_text(encoding="utf-8")):
+            option, _, value = line.partition(" ")
+            if option in ("-r", "--requirement") or line.startswith("-r"):
+                include = value.strip() if option in ("-r", "--requirement") else line[2:].strip()
+                self._read(path.parent / include, seen)
+            elif option in ("-c", "--constraint"):
+                logger.warning(f"Ignoring constraints file in {path}: {value.strip()}")
+            elif option.split("=")[0] in INDEX_OPTIONS:
+                self.index_options.append(line)
+            elif option in ("-e", "--editable"):
+                self._add_url(value.strip(), line)
+            elif line.startswith("-"):
+                logger.warning(f"Ignoring unsupported requirements option in {path}: {line}")
+                self.skipped.append(line)
+            elif "://" in line.split(" @ ")[0] or line.startswith("git+"):
+                self._add_url(line, line)
+            else:
+                # Per-requirement options such as --hash do not reach the image
+                self.add(line.split(" --")[0].strip())
+
+    def _add_url(self, url: str, line: str) -> None:
+        """Add a VCS or archive URL, named by its ``#egg=`` fragment."""
+        match = _EGG_FRAGMENT.search(url)
+        if "://" not in url or match is None:
+            logger.warning(f"Skipping requirement without a package name or remote URL: {line}")
+            self.skipped.append(line)
+            return
+        self.add(f"{match.group(1)} @ {url}")
+
+    def to_list(self) -> list[str]:
+        """Requirement strings, normalized and without markers."""
+        return [str(requirement) for requirement in self._requirements.values()]
+
+
+def _logical_lines(text: str) -> Iterable[str]:
+    """Requirement lines with continuations joined and comments removed."""
+    text = re.sub(r"\\\n", "", text)
+    for raw_line in text.splitlines():
+        line = _INLINE_COMMENT.sub("", raw_line).strip()
+        if line:
+            yield line
+
+
+def read_requirements(path: Path, requirements: Iterable[str] = ()) -> RequirementSet:
+    """Merge ``requirements`` with those of the file at ``path``."""
+    requirement_set = RequirementSet(requirements)
+    requirement_set.read(path)
+    return requirement_set
@@ -0,0 +1,304 @@
+"""Shared runner for ``modal`` CLI subprocesses.
+
+Every ``modal`` invocation goes through :data:`runner`, which gives each call
+a timeout, caps the number of concurrent processes, kills the child when the
+caller is cancelled or the timeout expires, keeps at most a bounded tail of
+each output stream, retries transient failures with exponential backoff and
+records per-command latency.
+"""
+
+import asyncio
+import contextlib
+import os
+import re
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+# Seconds allowed for a short ``modal`` command such as ``modal app list``
+DEFAULT_TIMEOUT = 60.0
+
+# Default number of retries after a transient failure
+DEFAULT_RETRIES = 2
+
+# First backoff delay in seconds, doubled after each retry
+BACKOFF_BASE = 0.5
+
+# Bytes of each output stream kept by ``run``; older output is dropped
+OUTPUT_LIMIT = 4 * 1024 * 1024
+
+# Longest single output line ``stream`` accepts
+STREAM_LINE_LIMIT = 1024 * 1024
+
+# Concurrent ``modal`` processes, overridable for large deploy-many runs
+MAX_CONCURRENT_COMMANDS = 8
+MAX_COMMANDS_ENV = "MODAL_FOR_NOOBS_MAX_COMMANDS"
+
+# Failure output that indicates a network or control-plane hiccup worth retrying
+TRANSIENT_ERRORS = re.compile(
+    r"connection (reset|refused|aborted)|temporarily unavailable|timed? ?out|deadline.exceeded|"
+    r"\bunavailable\b|\b50[234]\b|too many requests|\b429\b|rate.?limit",
+    re.IGNORECASE,
+)
+
+_READ_CHUNK = 64 * 1024
+
+# Receives (stream name, line) for each line of streamed output
+LineCallback = Callable[[str, str], Awaitable[None] | None]
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one command, after retries."""
+
+    args: list[str]
+    returncode: int | None
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    attempts: int = 1
+    timed_out: bool = False
+    truncated: bool = False
+    spawned_at: float | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command exited with status 0 within its timeout."""
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def error(self) -> str:
+        """Human-readable failure reason."""
+        if self.timed_out:
+            return f"'{command_name(self.args)}' timed out after {self.duration:.0f}s"
+        return self.stderr.strip() or f"'{command_name(self.args)}' exited with status {self.returncode}"
+
+
+@dataclass
+class CommandStats:
+    """Latency and failure counters for one command name."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    retries: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean latency per call."""
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "mean_seconds": round(self.mean_seconds, 3),
+            "max_seconds": round(self.max_seconds, 3),
+        }
+
+
+def command_name(args: Sequence[str]) -> str:
+    """Metrics key of a command: its leading subcommand words, e.g. ``modal app list``."""
+    words = []
+    for arg in args[:3]:
+        if arg.startswith("-") or not re.fullmatch(r"[a-z][a-z-]*", arg):
+            break
+        words.append(arg)
+    return " ".join(words) or (args[0] if args else "")
+
+
+def is_transient(result: CommandResult) -> bool:
+    """Whether a failed result looks worth retrying."""
+    return not result.ok and not result.timed_out and bool(TRANSIENT_ERRORS.search(result.stderr))
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int) -> tuple[bytes, bool]:
+    """Drain ``stream``, keeping at most its last ``limit`` bytes."""
+    buffer = bytearray()
+    truncated = False
+    while chunk := await stream.read(_READ_CHUNK):
+        buffer += chunk
+        if len(buffer) > limit:
+            del buffer[: len(buffer) - limit]
+            truncated = True
+    if truncated and b"\n" in buffer:
+        # Start on a whole line
+        del buffer[: buffer.index(b"\n") + 1]
+    return bytes(buffer), truncated
+
+
+async def _pump_lines(stream: asyncio.StreamReader, name: str, on_line: LineCallback) -> None:
+    """Feed each line of a subprocess pipe to ``on_line`` as it arrives."""
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            break
+        pending = on_line(name, raw.decode(errors="replace").rstrip("\r\n"))
+        if pending is not None:
+            # An async callback applies backpressure: the pipe is not read until it returns
+            await pending
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """Kill ``process`` if it is still running and reap it."""
+    if process.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        await process.wait()
+
+
+class CommandRunner:
+    """Runs CLI commands with timeouts, a concurrency cap, retries and metrics."""
+
+    def __init__(self, max_concurrency: int | None = None, output_limit: int = OUTPUT_LIMIT):
+        self.max_concurrency = max_concurrency or int(os.environ.get(MAX_COMMANDS_ENV, MAX_CONCURRENT_COMMANDS))
+        self.output_limit = output_limit
+        self.stats: dict[str, CommandStats] = {}
+        # asyncio primitives are bound to one loop, and the CLI starts a new
+        # loop per command, so keep one semaphore per running loop
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(max(1, self.max_concurrency))
+        return semaphore
+
+    async def run(
+        self,
+        *args: str,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        input: bytes | None = None,
+    ) -> CommandResult:
+        """Run a command to completion and capture its output.
+
+        Args:
+            *args: Program and arguments.
+            timeout: Seconds per attempt before the process is killed, or None.
+            retries: Extra attempts after a transient failure.
+            input: Bytes written to the process's stdin.
+
+        Returns:
+            CommandResult: The last attempt's result. Failures to start the
+            program (such as ``FileNotFoundError``) propagate.
+        """
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            result = await self._run_once(list(args), timeout, input)
+            if attempt > retries or not is_transient(result):
+                break
+            delay = BACKOFF_BASE * 2 ** (attempt - 1)
+            logger.debug(f"'{command_name(args)}' failed transiently, retrying in {delay:.1f}s: {result.stderr.strip()}")
+            await asyncio.sleep(delay)
+
+        result.attempts = attempt
+        result.duration = time.perf_counter() - started
+        self._record(result)
+        return result
+
+    async def _run_once(self, args: list[str], timeout: float | None, input: bytes | None) -> CommandResult:
+        async with self._semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            result = CommandResult(args=args, returncode=None, spawned_at=time.perf_counter())
+            try:
+                async with asyncio.timeout(timeout):
+                    if input is not None:
+                        process.stdin.write(input)
+                        await process.stdin.drain()
+                        process.stdin.close()
+                    (stdout, out_cut), (stderr, err_cut) = await asyncio.gather(
+                        _read_tail(process.stdout, self.output_limit), _read_tail(process.stderr, self.output_limit)
+                    )
+                    await process.wait()
+                result.stdout = stdout.decode(errors="replace")
+                result.stderr = stderr.decode(errors="replace")
+                result.truncated = out_cut or err_cut
+            except TimeoutError:
+                result.timed_out = True
+            finally:
+                await _terminate(process)
+            result.returncode = process.returncode
+            return result
+
+    async def stream(self, *args: str, on_line: LineCallback, timeout: float | None = None) -> CommandResult:
+        """Run a command, passing each output line to ``on_line`` as it arrives.
+
+        Nothing is retained, so the caller decides how much output to keep.
+        ``on_line`` may be a coroutine function, to slow reading down to the
+        pace the caller can handle the lines at.
+        The process is killed on timeout or when the caller is cancelled.
+
+        Streams without a timeout, such as ``modal app logs --follow``, run until
+        cancelled, so they do not take one of the ``max_concurrency`` slots;
+        otherwise a few of them would starve every other command.
+        """
+        started = time.perf_counter()
+        async with self._semaphore() if timeout is not None else contextlib.nullcontext():
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LINE_LIMIT,
+            )
+            result = CommandResult(args=list(args), returncode=None, spawned_at=time.perf_counter())
+            try:
+                async with asyncio.timeout(timeout):
+                    await asyncio.gather(_pump_lines(process.stdout, "stdout", on_line), _pump_lines(process.stderr, "stderr", on_line))
+                    await process.wait()
+            except TimeoutError:
+                result.timed_out = True
+            finally:
+                await _terminate(process)
+            result.returncode = process.returncode
+
+        result.duration = time.perf_counter() - started
+        self._record(result)
+        return result
+
+    def _record(self, result: CommandResult) -> None:
+        name = command_name(result.args)
+        stats = self.stats.setdefault(name, CommandStats())
+        stats.calls += 1
+        stats.failures += not result.ok
+        stats.timeouts += result.timed_out
+        stats.retries += result.attempts - 1
+        stats.total_seconds += result.duration
+        stats.max_seconds = max(stats.max_seconds, result.duration)
+        logger.debug(f"'{name}' exited {result.returncode} in {result.duration:.2f}s ({result.attempts} attempt(s))")
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Per-command latency and failure counters."""
+        return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+
+# Process-wide runner shared by every ``modal`` call site
+runner = CommandRunner()
+
+
+async def run_modal(*args: str, **kwargs: Any) -> CommandResult:
+    """Run ``modal <args>`` on the shared runner."""
+    return await runner.run("modal", *args, **kwargs)
+
+
+async def stream_modal(*args: str, **kwargs: Any) -> CommandResult:
+    """Stream ``modal <args>`` on the shared runner."""
+    return await runner.stream("modal", *args, **kwargs)
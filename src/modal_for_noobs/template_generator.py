@@ -4,15 +4,27 @@ This module provides advanced template generation capabilities that avoid
 nested f-string issues by using Jinja2 templating engine.
 """
 
+import hashlib
+import json
 import os
+import shutil
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import BaseLoader, ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, select_autoescape
 from loguru import logger
 
 from modal_for_noobs.config_loader import config_loader
+from modal_for_noobs.render_cache import default_cache_dir
+from modal_for_noobs.requirements import RequirementSet
+
+TEMPLATE_DIR = Path(__file__).parent / "templates" / "jinja2"
+
+# Output of precompile_templates(), built before packaging and shipped in the wheel
+PRECOMPILED_DIR = Path(__file__).parent / "templates" / "jinja2_compiled"
+PRECOMPILED_MANIFEST = "manifest.json"
 
 
 @dataclass
@@ -120,22 +132,17 @@ class TemplateConfig:
 class TemplateGenerator:
     """Advanced template generator using Jinja2."""
 
-    def __init__(self):
-        """Initialize template generator."""
-        # Set up Jinja2 environment
-        template_dir = Path(__file__).parent / "templates" / "jinja2"
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(["py"]),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+    def __init__(self, env: Environment | None = None):
+        """Initialize template generator.
 
-        # Add custom filters
-        self.env.filters["classify"] = self._classify_filter
-        self.env.filters["format_gpu"] = self._format_gpu_filter
+        Args:
+            env: Jinja2 environment to render with. Defaults to the process-wide
+                environment, so compiled templates are shared between instances.
+        """
+        self.env = env or shared_environment()
 
-    def _classify_filter(self, value: str) -> str:
+    @staticmethod
+    def _classify_filter(value: str) -> str:
         """Convert string to class name format."""
         import re
 
@@ -146,7 +153,8 @@ class TemplateGenerator:
             cleaned = "Class" + cleaned
         return cleaned
 
-    def _format_gpu_filter(self, value: str) -> str:
+    @staticmethod
+    def _format_gpu_filter(value: str) -> str:
         """Format GPU type for Modal."""
         gpu_mapping = {
             "any": "gpu.Any()",
@@ -204,15 +212,14 @@ class TemplateGenerator:
             package_config = config_loader.load_base_packages()
             packages = package_config.get(config.deployment_mode, [])
 
-        # Add packages from requirements file if provided
+        # Add packages from requirements file if provided, one entry per distribution
+        requirements = RequirementSet(packages)
         if config.requirements_file and config.requirements_file.exists():
             try:
-                req_content = config.requirements_file.read_text().strip()
-                if req_content:
-                    req_packages = [line.strip() for line in req_content.split("\n") if line.strip() and not line.startswith("#")]
-                    packages.extend(req_packages)
-            except Exception as e:
+                requirements.read(config.requirements_file)
+            except (OSError, UnicodeDecodeError) as e:
                 logger.warning(f"Failed to read requirements file: {e}")
+        packages = requirements.to_list()
 
         # Build image configuration based on mode
         if config.deployment_mode in ["optimized", "marimo"] or config.gpu_type:
@@ -263,6 +270,107 @@ class TemplateGenerator:
         return template.render(**config.to_dict())
 
 
+def bytecode_cache_dir() -> Path:
+    """Get the directory holding compiled Jinja2 template bytecode."""
+    return default_cache_dir() / "jinja2"
+
+
+def _template_digests() -> dict[str, str]:
+    """Get the digest of every bundled template source, by template name."""
+    return {path.name: hashlib.sha256(path.read_bytes()).hexdigest() for path in sorted(TEMPLATE_DIR.glob("*.j2"))}
+
+
+def _template_loader() -> BaseLoader:
+    """Get the template loader, preferring precompiled modules when they are current.
+
+    The precompiled set is only used when its manifest matches the digests of
+    the template sources, so editing a template never renders stale code.
+    """
+    loader = FileSystemLoader(TEMPLATE_DIR)
+    try:
+        compiled_digests = json.loads((PRECOMPILED_DIR / PRECOMPILED_MANIFEST).read_text())
+    except (OSError, ValueError):
+        return loader
+
+    if compiled_digests != _template_digests():
+        logger.debug("Precompiled templates are out of date, compiling from source")
+        return loader
+    return ChoiceLoader([ModuleLoader(PRECOMPILED_DIR), loader])
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache | None:
+    """Get the on-disk bytecode cache, or None if its directory is unusable."""
+    directory = bytecode_cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.debug(f"Template bytecode cache disabled: {e}")
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
+def create_environment(loader: BaseLoader | None = None) -> Environment:
+    """Create a Jinja2 environment for the deployment templates.
+
+    Compiled templates are kept in a bytecode cache under the user cache dir.
+    Jinja2 keys each entry by template name and checks it against the source
+    checksum, and the loader reloads templates whose mtime changed.
+
+    Args:
+        loader: Template loader. Defaults to the precompiled modules when
+            current, falling back to the bundled template files.
+
+    Returns:
+        Environment: Configured environment with the custom filters registered.
+    """
+    env = Environment(
+        loader=loader or _template_loader(),
+        bytecode_cache=_bytecode_cache(),
+        autoescape=select_autoescape(["py"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+    # Add custom filters
+    env.filters["classify"] = TemplateGenerator._classify_filter
+    env.filters["format_gpu"] = TemplateGenerator._format_gpu_filter
+    return env
+
+
+@lru_cache(maxsize=1)
+def shared_environment() -> Environment:
+    """Get the process-wide template environment."""
+    return create_environment()
+
+
+@lru_cache(maxsize=1)
+def get_template_generator() -> TemplateGenerator:
+    """Get the process-wide template generator."""
+    return TemplateGenerator()
+
+
+def precompile_templates(target: Path = PRECOMPILED_DIR) -> Path:
+    """Compile every bundled template into Python modules.
+
+    Run before building the wheel so installs render without compiling
+    templates. A manifest of source digests lets the loader ignore the
+    modules once a template changes.
+
+    Args:
+        target: Directory to write the compiled modules to. Replaced if present.
+
+    Returns:
+        Path: The target directory.
+    """
+    if target.exists():
+        shutil.rmtree(target)
+    env = create_environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    env.compile_templates(str(target), zip=None, ignore_errors=False)
+    (target / PRECOMPILED_MANIFEST).write_text(json.dumps(_template_digests(), indent=2, sort_keys=True))
+    logger.info(f"Precompiled {len(_template_digests())} templates into {target}")
+    return target
+
+
 def generate_from_wizard_input(
     app_name: str,
     deployment_mode: str,
@@ -8,8 +8,9 @@ import asyncio
 import json
 import os
 import sys
-from collections import deque
+from collections.abc import Iterator
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -37,6 +38,68 @@ class LogEntry(BaseModel):
     extra: dict[str, Any] | None = None
 
 
+# A captured log record: loguru's time, level name, message and extra dict, kept as-is
+LogTuple = tuple[datetime, str, str, dict[str, Any]]
+
+
+class LogRing:
+    """Fixed-size ring buffer of log records that overwrites the oldest first.
+
+    Slots are allocated once, and a capture only stores a tuple of references
+    to the loguru record's fields. Timestamps are formatted and entries
+    validated when logs are read, not when they are written.
+    """
+
+    __slots__ = ("_next", "_size", "_slots")
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("Log buffer needs room for at least one record")
+        self._slots: list[LogTuple | None] = [None] * capacity
+        self._next = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of records kept before the oldest are overwritten."""
+        return len(self._slots)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[LogTuple]:
+        return self.tail()
+
+    def append(self, record: LogTuple) -> None:
+        """Store a record, overwriting the oldest one when full."""
+        self._slots[self._next] = record
+        self._next += 1
+        if self._next == len(self._slots):
+            self._next = 0
+        if self._size < len(self._slots):
+            self._size += 1
+
+    def clear(self) -> None:
+        """Drop all records, keeping the allocated slots."""
+        for i in range(len(self._slots)):
+            self._slots[i] = None
+        self._next = 0
+        self._size = 0
+
+    def tail(self, limit: int = 0) -> Iterator[LogTuple]:
+        """The newest ``limit`` records, or all if ``limit <= 0``, oldest first.
+
+        Returns an iterator over the buffer's own slots rather than a copy;
+        consume it before more records are captured.
+        """
+        capacity = len(self._slots)
+        count = self._size if limit <= 0 else min(limit, self._size)
+        start = (self._next - count) % capacity
+        if start + count <= capacity:
+            return islice(self._slots, start, start + count)  # type: ignore[arg-type]
+        return chain(islice(self._slots, start, None), islice(self._slots, 0, start + count - capacity))  # type: ignore[arg-type]
+
+
 class DeploymentInfo(BaseModel):
     """Model for deployment information."""
 
@@ -55,7 +118,7 @@ class DashboardState:
     """Manages dashboard state and logging."""
 
     def __init__(self, max_logs: int = 1000):
-        self.logs: deque[LogEntry] = deque(maxlen=max_logs)
+        self.logs = LogRing(max_logs)
         self.deployment_info: DeploymentInfo | None = None
         self.start_time = datetime.now()
         self._setup_logging()
@@ -76,20 +139,15 @@ class DashboardState:
     def _log_handler(self, message):
         """Custom log handler that stores logs in memory."""
         record = message.record
-        log_entry = LogEntry(
-            timestamp=record["time"].strftime("%Y-%m-%d %H:%M:%S"),
-            level=record["level"].name,
-            message=record["message"],
-            extra=record.get("extra", {}),
-        )
-        self.logs.append(log_entry)
+        # loguru builds a fresh extra dict for every record, so it is stored without copying
+        self.logs.append((record["time"], record["level"].name, record["message"], record["extra"]))
 
     def get_logs(self, limit: int = 100) -> list[dict[str, Any]]:
         """Get the most recent logs."""
-        logs_list = list(self.logs)
-        if limit > 0:
-            logs_list = logs_list[-limit:]
-        return [log.dict() for log in logs_list]
+        return [
+            LogEntry(timestamp=time.strftime("%Y-%m-%d %H:%M:%S"), level=level, message=text, extra=extra).model_dump()
+            for time, level, text, extra in self.logs.tail(limit)
+        ]
 
     def get_deployment_info(self) -> dict[str, Any]:
         """Get deployment information."""
@@ -4,46 +4,154 @@ This module handles loading and generating deployment templates based on
 the selected mode (minimum, optimized, gradio-jupyter, marimo).
 """
 
+import base64
+import hashlib
 import importlib.util
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from modal_for_noobs.app_analyzer import analyze_source
+from modal_for_noobs.image_resolver import distribution_name
+from modal_for_noobs.templates.template_constants import (
+    DASHBOARD_EMBEDDED_SETUP,
+    DASHBOARD_IMPORTS,
+    DASHBOARD_RUNTIME_IMAGE,
+    DASHBOARD_RUNTIME_IMPORTS,
+    DASHBOARD_RUNTIME_SETUP,
+)
+from modal_for_noobs.wheelhouse import WHEELHOUSE_REMOTE_PATH, image_wheel_dir
+
+DASHBOARD_FILE = Path(__file__).parent / "dashboard.py"
+
+# How generated deployments get the dashboard module:
+# "embedded" inlines it as base64 and writes it out at import time,
+# "image" copies the runtime file of the installed package into the container image.
+DASHBOARD_RUNTIMES = ("embedded", "image")
+DASHBOARD_REMOTE_PATH = "/root/dashboard.py"
+
+# Packages at least this large (in MB, per config/import_packages.yml) get their own first image layer
+HEAVY_PACKAGE_MB = 100
+
+
+def image_layers(deployment_mode: str, packages: list[str], system_packages: list[str] | None = None) -> list[tuple[str, list[str]]]:
+    """Split an image's packages into build layers, most stable first.
 
-def get_image_config(deployment_mode: str, packages: list[str]) -> str:
+    Modal caches each image step keyed on everything before it, so heavy
+    dependencies go first, then the mode's core packages, then system
+    packages, and the app's own packages last. Every list is deduplicated
+    and sorted, so the same inputs always give the same layers.
+
+    Args:
+        deployment_mode: The deployment mode, selecting its core packages.
+        packages: Python packages to install.
+        system_packages: Debian packages to install.
+
+    Returns:
+        list[tuple[str, list[str]]]: Non-empty ``("pip" | "apt", packages)`` layers in build order.
+    """
+    from modal_for_noobs.config_loader import config_loader
+
+    distributions = {distribution_name(name): info or {} for name, info in (config_loader.load_import_packages().get("distributions") or {}).items()}
+    core = {distribution_name(pkg) for pkg in config_loader.load_base_packages().get(deployment_mode, [])}
+
+    heavy_layer, core_layer, user_layer = set(), set(), set()
+    for package in packages:
+        dist = distribution_name(package)
+        if int(distributions.get(dist, {}).get("size_mb") or 0) >= HEAVY_PACKAGE_MB:
+            heavy_layer.add(package)
+        elif dist in core:
+            core_layer.add(package)
+        else:
+            user_layer.add(package)
+
+    def ordered(layer: set[str]) -> list[str]:
+        return sorted(layer, key=lambda pkg: (distribution_name(pkg), pkg))
+
+    layers = [
+        ("pip", ordered(heavy_layer)),
+        ("pip", ordered(core_layer)),
+        ("apt", sorted(set(system_packages or []))),
+        ("pip", ordered(user_layer)),
+    ]
+    return [(kind, layer) for kind, layer in layers if layer]
+
+
+def _format_layer(kind: str, packages: list[str], installer: str = "pip_install", offline: bool = False) -> str:
+    """Render one image layer as a chained ``Image`` method call.
+
+    Locked pins (``uv_pip_install``) are a complete closure split across
+    layers, so each layer installs with ``--no-deps``; otherwise an early
+    layer would resolve its dependencies unpinned and a later one re-pin them.
+    """
+    method = installer if kind == "pip" else "apt_install"
+    lines = "".join(f'        "{pkg}",\n' for pkg in packages)
+    if kind == "pip":
+        options = []
+        if offline:
+            lines += f'        find_links="{WHEELHOUSE_REMOTE_PATH}",\n'
+            options.append("--no-index")
+        if installer == "uv_pip_install":
+            options.append("--no-deps")
+        if options:
+            lines += f'        extra_options="{" ".join(options)}",\n'
+    return f"    .{method}(\n{lines}    )\n"
+
+
+def get_image_config(
+    deployment_mode: str,
+    packages: list[str],
+    system_packages: list[str] | None = None,
+    installer: str = "pip_install",
+    wheelhouse: Path | None = None,
+) -> str:
     """Get Modal image configuration based on deployment mode.
 
     Args:
         deployment_mode: The deployment mode ("minimum", "optimized", "gra_jupy", "marimo").
         packages: List of packages to install.
+        system_packages: Debian packages to install, in their own layer.
+        installer: ``Image`` method for Python packages, ``uv_pip_install`` for locked pins.
+        wheelhouse: Local wheel directory installed from without an index, see
+            ``modal-for-noobs prefetch``; only the mode's subdirectory is copied
+            into the image when it has one.
 
     Returns:
-        str: Modal image configuration string.
+        str: Modal image configuration string, layered as in ``image_layers``.
     """
-    packages_str = ",\n    ".join([f'"{pkg}"' for pkg in packages])
+    layers = "".join(
+        _format_layer(kind, layer, installer, offline=wheelhouse is not None)
+        for kind, layer in image_layers(deployment_mode, packages, system_packages)
+    )
+    if wheelhouse is not None:
+        # Only this mode's wheels, so other modes' prefetches leave the layer cached
+        wheels = image_wheel_dir(Path(wheelhouse), deployment_mode).resolve()
+        layers = (
+            "    # Local wheelhouse, Python packages install from it without an index\n"
+            f"    .add_local_dir({str(wheels)!r}, remote_path={WHEELHOUSE_REMOTE_PATH!r}, copy=True)\n"
+            f"{layers}"
+        )
 
     # For optimized and marimo modes, use GPU-optimized base image
     if deployment_mode in ["optimized", "marimo"]:
-        return f"""image = (
-    modal.Image.from_registry("nvidia/cuda:12.1-devel-ubuntu22.04", add_python="3.11")
-    .pip_install(
-        {packages_str}
-    )
-    .run_commands(
-        # Install system dependencies for GPU acceleration
-        "apt-get update && apt-get install -y git build-essential",
-        # Verify GPU setup
-        "nvidia-smi",
-        # Optimize PyTorch for GPU
-        "python -c 'import torch; print(f\\"PyTorch {{torch.__version__}} - CUDA available: {{torch.cuda.is_available()}}\\");'",
-    )
-)"""
-    else:
-        # Standard Debian slim for minimum and gradio-jupyter modes
-        return f"""image = modal.Image.debian_slim(python_version="3.11").pip_install(
-    {packages_str}
-)"""
+        checks = '        "nvidia-smi",\n'
+        if any(distribution_name(pkg) == "torch" for pkg in packages):
+            checks += '''        "python -c 'import torch; print(f\\"PyTorch {torch.__version__} - CUDA available: {torch.cuda.is_available()}\\");'",\n'''
+        return (
+            "image = (\n"
+            '    modal.Image.from_registry("nvidia/cuda:12.1-devel-ubuntu22.04", add_python="3.11")\n'
+            "    # System dependencies for building GPU packages\n"
+            '    .apt_install("build-essential", "git")\n'
+            f"{layers}"
+            "    # Verify GPU setup\n"
+            f"    .run_commands(\n{checks}    )\n"
+            ")"
+        )
+
+    # Standard Debian slim for minimum and gradio-jupyter modes
+    return f'image = (\n    modal.Image.debian_slim(python_version="3.11")\n{layers})'
 
 
 def load_template_module(template_name: str) -> Any:
@@ -74,11 +182,63 @@ def load_dashboard_module() -> str:
     Returns:
         str: The dashboard module content
     """
-    dashboard_file = Path(__file__).parent / "dashboard.py"
-    if not dashboard_file.exists():
+    if not DASHBOARD_FILE.exists():
         raise FileNotFoundError("Dashboard module not found")
 
-    return dashboard_file.read_text()
+    return DASHBOARD_FILE.read_text()
+
+
+@lru_cache(maxsize=1)
+def dashboard_runtime_version() -> str:
+    """Get the version of the dashboard runtime.
+
+    Combines the package version with a digest of the dashboard module, so a
+    local edit gets a new version too.
+
+    Returns:
+        str: Version string such as ``0.2.5+1a2b3c4d5e6f``.
+    """
+    from modal_for_noobs import __version__
+
+    return f"{__version__}+{hashlib.sha256(DASHBOARD_FILE.read_bytes()).hexdigest()[:12]}"
+
+
+def dashboard_runtime_sections(dashboard_runtime: str = "embedded") -> dict[str, str]:
+    """Build the template sections that provide the dashboard module.
+
+    Args:
+        dashboard_runtime: One of ``DASHBOARD_RUNTIMES``.
+
+    Returns:
+        dict[str, str]: ``dashboard_imports`` and ``dashboard_setup`` sections,
+        plus ``image_step`` to append to the image configuration.
+
+    Raises:
+        ValueError: If ``dashboard_runtime`` is not a known runtime.
+    """
+    if dashboard_runtime == "embedded":
+        dashboard_content = load_dashboard_module()
+        logger.debug(f"Dashboard content loaded: {len(dashboard_content)} characters")
+
+        # Encode dashboard content to base64 to avoid quote conflicts
+        dashboard_content_b64 = base64.b64encode(dashboard_content.encode("utf-8")).decode("ascii")
+        logger.debug(f"Dashboard content encoded to base64: {len(dashboard_content_b64)} characters")
+        return {
+            "dashboard_imports": DASHBOARD_IMPORTS,
+            "dashboard_setup": DASHBOARD_EMBEDDED_SETUP.format(dashboard_module_b64=dashboard_content_b64),
+            "image_step": "",
+        }
+
+    if dashboard_runtime == "image":
+        if not DASHBOARD_FILE.exists():
+            raise FileNotFoundError("Dashboard module not found")
+        return {
+            "dashboard_imports": DASHBOARD_RUNTIME_IMPORTS.format(runtime_version=dashboard_runtime_version()),
+            "dashboard_setup": DASHBOARD_RUNTIME_SETUP,
+            "image_step": DASHBOARD_RUNTIME_IMAGE.format(remote_path=DASHBOARD_REMOTE_PATH),
+        }
+
+    raise ValueError(f"Unknown dashboard runtime {dashboard_runtime!r}, expected one of {', '.join(DASHBOARD_RUNTIMES)}")
 
 
 def generate_modal_deployment(
@@ -88,6 +248,7 @@ def generate_modal_deployment(
     timeout_seconds: int = 3600,
     scaledown_window: int = 1200,
     image_config: str = None,
+    dashboard_runtime: str = "embedded",
 ) -> str:
     """Generate Modal deployment code using the new template system.
 
@@ -97,6 +258,7 @@ def generate_modal_deployment(
         deployment_mode: Deployment mode (minimum, optimized, gradio-jupyter, marimo)
         timeout_seconds: Function timeout in seconds
         scaledown_window: Scale down window in seconds
+        dashboard_runtime: How the dashboard module reaches the container, see ``DASHBOARD_RUNTIMES``
 
     Returns:
         str: Complete Modal deployment Python code
@@ -121,15 +283,10 @@ def generate_modal_deployment(
         packages = package_config.get(deployment_mode, package_config.get("minimum", []))
         image_config = get_image_config(deployment_mode, packages)
 
-    # Load dashboard module
-    dashboard_content = load_dashboard_module()
-    logger.debug(f"Dashboard content loaded: {len(dashboard_content)} characters")
-
-    # Encode dashboard content to base64 to avoid quote conflicts
-    import base64
-
-    dashboard_content_b64 = base64.b64encode(dashboard_content.encode("utf-8")).decode("ascii")
-    logger.debug(f"Dashboard content encoded to base64: {len(dashboard_content_b64)} characters")
+    # Provide the dashboard module, embedded or from the image
+    dashboard_sections = dashboard_runtime_sections(dashboard_runtime)
+    if dashboard_sections["image_step"]:
+        image_config = f"{image_config}\n{dashboard_sections['image_step']}"
 
     # Format the template
     template = template_module.TEMPLATE
@@ -141,8 +298,9 @@ def generate_modal_deployment(
             original_code=original_code,
             timeout_seconds=timeout_seconds,
             scaledown_window=scaledown_window,
-            dashboard_module=dashboard_content,
-            dashboard_module_b64=dashboard_content_b64,
+            dashboard_imports=dashboard_sections["dashboard_imports"],
+            dashboard_setup=dashboard_sections["dashboard_setup"],
+            interface_names=repr(analyze_source(original_code).detection_names()),
             image_config=image_config,
         )
         logger.debug("Template formatting successful")
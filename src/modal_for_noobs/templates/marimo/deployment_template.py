@@ -4,12 +4,15 @@ This template provides Gradio deployment with Marimo notebook integration.
 Uses safe template constants to avoid f-string conflicts.
 """
 
+import textwrap
+
 from modal_for_noobs.templates.template_constants import (
     APP_EXECUTION,
     DASHBOARD_IMPORTS,
     DASHBOARD_MODULE_TEMPLATE,
     GPU_DETECTION,
     GRADIO_DETECTION,
+    GRADIO_DETECTION_TEMPLATE,
     MARIMO_DASHBOARD_TAB,
     MARIMO_NOTEBOOK_FOOTER,
     MARIMO_NOTEBOOK_HEADER,
@@ -153,16 +156,25 @@ if not dashboard_path.exists():
 """
 
 
-# Legacy TEMPLATE variable for compatibility
-TEMPLATE = '''# 🚀 Modal Deployment Script (Marimo Configuration)
+def _section(code: str, indent: str = "") -> str:
+    """Escape a template constant for ``str.format`` and indent it."""
+    return textwrap.indent(code.replace("{", "{{").replace("}", "}}"), indent)
+
+
+# Filled in by generate_modal_deployment like the other mode templates; the
+# constants are inlined here so the only format fields left are its own
+TEMPLATE = (
+    """# 🚀 Modal Deployment Script (Marimo Configuration)
 # Generated by modal-for-noobs - https://github.com/arthrod/modal-for-noobs
 # Deployment Mode: marimo
 # Features: Gradio app with Marimo notebooks, ML libraries, dashboard, and logging
-# Timeout: {timeout_seconds}s
+# Timeout: {timeout_seconds}s | Scaledown: {scaledown_window}s
 
-{MODAL_IMPORTS}
+"""
+    + _section(MODAL_IMPORTS)
+    + """
 
-{DASHBOARD_IMPORTS}
+{dashboard_imports}
 
 # Configuration constants
 APP_NAME = "{app_name}"
@@ -170,7 +182,7 @@ APP_TITLE = "{app_name} - Modal Dashboard (Marimo)"
 APP_DESCRIPTION = "Optimized deployment with Marimo notebooks and monitoring"
 DEPLOYMENT_MODE = "marimo"
 TIMEOUT_SECONDS = {timeout_seconds}
-MAX_CONTAINERS = {max_containers}
+MAX_CONTAINERS = 1
 
 # Create Modal App
 app = modal.App(APP_NAME)
@@ -181,24 +193,39 @@ app = modal.App(APP_NAME)
 # Original Application Code
 {original_code}
 
-# Use the template constants defined above
-{MARIMO_SERVER_FUNCTION}
+# Marimo notebook constants
+MARIMO_NOTEBOOK_HEADER = '''"""
+    + _section(MARIMO_NOTEBOOK_HEADER)
+    + """'''
+MARIMO_NOTEBOOK_WELCOME = '''"""
+    + _section(MARIMO_NOTEBOOK_WELCOME)
+    + """'''
+MARIMO_NOTEBOOK_FOOTER = '''"""
+    + _section(MARIMO_NOTEBOOK_FOOTER)
+    + """'''
+
+"""
+    + _section(MARIMO_SERVER_FUNCTION)
+    + """
 
 # Modal Function Configuration with GPU
 @app.function(
     image=image,
     gpu="any",  # GPU support for ML workloads
     min_containers=1,
-    max_containers={max_containers},
+    max_containers=MAX_CONTAINERS,
     timeout={timeout_seconds},
+    scaledown_window={scaledown_window},
     memory=16384,  # 16GB RAM
 )
 @modal.concurrent(max_inputs=100)
 @modal.asgi_app()
 def deploy_gradio():
-    """Deploy Gradio app with Marimo notebooks and dashboard on Modal."""
+    \"\"\"Deploy Gradio app with Marimo notebooks and dashboard on Modal.\"\"\"
 
-    {GPU_DETECTION}
+"""
+    + _section(GPU_DETECTION, "    ")
+    + """
 
     # Initialize deployment info with Marimo specifics
     deployment_info = DeploymentInfo(
@@ -220,12 +247,14 @@ def deploy_gradio():
     )
     dashboard_state.set_deployment_info(deployment_info)
 
-    logger.info("Starting Modal deployment in marimo mode")
+    logger.info("Starting Modal deployment in marimo mode (GPU: " + str(gpu_available) + ")")
 
     # Start Marimo in the background
     asyncio.create_task(start_marimo_server())
 
-    {GRADIO_DETECTION}
+"""
+    + _section(GRADIO_DETECTION_TEMPLATE, "    ").replace("{{interface_names!r}}", "{interface_names}")
+    + """
 
     # Create Dashboard with Marimo integration
     with gr.Blocks() as enhanced_dashboard:
@@ -233,7 +262,9 @@ def deploy_gradio():
         gr.Markdown("Monitor and manage your Modal deployment with Marimo notebook integration")
 
         with gr.Tabs():
-            {MARIMO_DASHBOARD_TAB}
+"""
+    + _section(MARIMO_DASHBOARD_TAB, "            ")
+    + """
 
             # Original dashboard tabs
             dashboard_interface = create_dashboard_interface(demo)
@@ -256,7 +287,9 @@ def deploy_gradio():
         redoc_url="/redoc"
     )
 
-    {MARIMO_PROXY_ENDPOINTS}
+"""
+    + _section(MARIMO_PROXY_ENDPOINTS, "    ")
+    + """
 
     # Add dashboard API endpoints
     fastapi_app = create_dashboard_api(fastapi_app)
@@ -266,13 +299,9 @@ def deploy_gradio():
     # Mount Gradio app
     return mount_gradio_app(fastapi_app, enhanced_dashboard, path="/")
 
-# Dashboard module creation
-dashboard_content = """{DASHBOARD_MODULE_TEMPLATE}"""
-
-# Write dashboard module
-dashboard_path = Path(__file__).parent / "dashboard.py"
-if not dashboard_path.exists():
-    dashboard_path.write_text(dashboard_content)
+{dashboard_setup}
 
-{APP_EXECUTION}
-'''
+"""
+    + _section(APP_EXECUTION)
+    + "\n"
+)
@@ -19,9 +19,7 @@ import gradio as gr
 from gradio.routes import mount_gradio_app
 from loguru import logger
 
-# Import dashboard components
-sys.path.append(str(Path(__file__).parent))
-from dashboard import create_dashboard_interface, create_dashboard_api, dashboard_state, DeploymentInfo
+{dashboard_imports}
 
 # 🎯 Create Modal App
 app = modal.App("{app_name}")
@@ -77,7 +75,7 @@ def deploy_gradio():
 
     # 🔍 Detect Gradio Interface
     demo = None
-    interface_names = ['demo', 'app', 'interface', 'iface']
+    interface_names = {interface_names}
 
     for name in interface_names:
         if name in globals() and hasattr(globals()[name], 'launch'):
@@ -117,18 +115,7 @@ def deploy_gradio():
     # Mount Gradio app
     return mount_gradio_app(fastapi_app, dashboard, path="/")
 
-# Import dashboard module
-import os
-import base64
-
-# Dashboard module content (base64 encoded to avoid quote conflicts)
-dashboard_module_encoded = "{dashboard_module_b64}"
-dashboard_module_code = base64.b64decode(dashboard_module_encoded).decode('utf-8')
-
-# Write dashboard module
-dashboard_path = Path(__file__).parent / "dashboard.py"
-if not dashboard_path.exists():
-    dashboard_path.write_text(dashboard_module_code)
+{dashboard_setup}
 
 if __name__ == "__main__":
     app.run()
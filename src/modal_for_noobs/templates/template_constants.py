@@ -4,6 +4,8 @@ This module contains pre-built template components that can be safely assembled
 without f-string conflicts or nested quote issues.
 """
 
+import textwrap
+
 # Basic imports section
 MODAL_IMPORTS = """import modal
 import sys
@@ -23,6 +25,39 @@ DASHBOARD_IMPORTS = """# Import dashboard components
 sys.path.append(str(Path(__file__).parent))
 from dashboard import create_dashboard_interface, create_dashboard_api, dashboard_state, DeploymentInfo"""
 
+# Embedded dashboard module, decoded and written next to the deployment at import
+DASHBOARD_EMBEDDED_SETUP = """# Import dashboard module
+import os
+import base64
+
+# Dashboard module content (base64 encoded to avoid quote conflicts)
+dashboard_module_encoded = "{dashboard_module_b64}"
+dashboard_module_code = base64.b64decode(dashboard_module_encoded).decode('utf-8')
+
+# Write dashboard module
+dashboard_path = Path(__file__).parent / "dashboard.py"
+if not dashboard_path.exists():
+    dashboard_path.write_text(dashboard_module_code)"""
+
+# Dashboard imports when the runtime is added to the image; it only exists in the container
+DASHBOARD_RUNTIME_IMPORTS = """# Import dashboard components (dashboard runtime {runtime_version}, added to the image)
+sys.path.append(str(Path(__file__).parent))
+if not modal.is_local():
+    from dashboard import create_dashboard_interface, create_dashboard_api, dashboard_state, DeploymentInfo"""
+
+# Image step that copies the dashboard runtime into the image, found through the installed
+# modal-for-noobs package so the file deploys from any machine; Modal caches the layer per version
+DASHBOARD_RUNTIME_IMAGE = """if modal.is_local():
+    import importlib.resources
+
+    dashboard_runtime_path = str(importlib.resources.files("modal_for_noobs.templates").joinpath("dashboard.py"))
+else:
+    # Inside the container the runtime is already part of the image
+    dashboard_runtime_path = {remote_path!r}
+image = image.add_local_file(dashboard_runtime_path, remote_path={remote_path!r}, copy=True)"""
+
+DASHBOARD_RUNTIME_SETUP = "# Dashboard runtime is provided by the image"
+
 # Marimo imports
 MARIMO_IMPORTS = """import marimo as mo
 import torch
@@ -31,9 +66,9 @@ import numpy as np
 import matplotlib.pyplot as plt"""
 
 # Standard Gradio interface detection
-GRADIO_DETECTION = """# Detect Gradio Interface
+GRADIO_DETECTION_TEMPLATE = """# Detect Gradio Interface
 demo = None
-interface_names = ['demo', 'app', 'interface', 'iface']
+interface_names = {interface_names!r}
 
 for name in interface_names:
     if name in globals() and hasattr(globals()[name], 'launch'):
@@ -52,6 +87,22 @@ if demo is None:
     logger.error("No Gradio interface found")
     raise ValueError("Could not find Gradio interface")"""
 
+
+def build_gradio_detection(interface_names: list[str], indent: str = "") -> str:
+    """Build the Gradio detection block, checking ``interface_names`` first.
+
+    Args:
+        interface_names: Candidate variable names, usually from the app analysis.
+        indent: Prefix for every line, for use inside a function body.
+
+    Returns:
+        str: The detection code.
+    """
+    return textwrap.indent(GRADIO_DETECTION_TEMPLATE.format(interface_names=interface_names), indent)
+
+
+GRADIO_DETECTION = build_gradio_detection(["demo", "app", "interface", "iface"])
+
 # Marimo notebook content - using safe string concatenation
 MARIMO_NOTEBOOK_HEADER = '''import marimo
 
@@ -10,7 +10,9 @@ import uvloop
 from loguru import logger
 from rich import print as rprint
 
+from modal_for_noobs.app_analyzer import validate_app_file as analyze_validate_app_file
 from modal_for_noobs.modal_deploy import DeploymentConfig, DeploymentResult, ModalAPI, ModalDeployer
+from modal_for_noobs.modal_listings import STOPPED_STATES
 
 
 def validate_app_file(app_file: str | Path) -> dict[str, Any]:
@@ -22,63 +24,7 @@ def validate_app_file(app_file: str | Path) -> dict[str, Any]:
     Returns:
         dict: Validation result with recommendations
     """
-    app_path = Path(app_file)
-
-    if not app_path.exists():
-        return {"valid": False, "error": f"File not found: {app_path}", "recommendations": ["Create the file first"]}
-
-    if not app_path.suffix == ".py":
-        return {"valid": False, "error": "File must be a Python file (.py)", "recommendations": ["Rename file with .py extension"]}
-
-    try:
-        content = app_path.read_text()
-
-        # Check for Gradio imports
-        has_gradio = "import gradio" in content or "from gradio" in content
-        has_blocks = "gr.Blocks" in content or "gradio.Blocks" in content
-        has_interface = "gr.Interface" in content or "gradio.Interface" in content
-        has_launch = ".launch(" in content
-
-        recommendations = []
-        warnings = []
-
-        if not has_gradio:
-            recommendations.append("Add 'import gradio as gr' to your file")
-
-        if not (has_blocks or has_interface):
-            recommendations.append("Create a Gradio interface using gr.Blocks() or gr.Interface()")
-
-        if not has_launch:
-            warnings.append("Consider adding .launch() for local testing")
-
-        # Check for common ML libraries
-        ml_libraries = ["torch", "tensorflow", "transformers", "sklearn", "numpy", "pandas"]
-        detected_ml = [lib for lib in ml_libraries if lib in content]
-
-        if detected_ml:
-            recommendations.append(f"Consider using 'optimized' mode for ML libraries: {', '.join(detected_ml)}")
-
-        # Check for Jupyter-related imports
-        jupyter_imports = ["jupyter", "notebook", "ipywidgets", "matplotlib", "plotly"]
-        detected_jupyter = [lib for lib in jupyter_imports if lib in content]
-
-        if detected_jupyter:
-            recommendations.append("Consider using 'gra_jupy' mode for Jupyter features")
-
-        return {
-            "valid": has_gradio and (has_blocks or has_interface),
-            "has_gradio": has_gradio,
-            "has_interface": has_blocks or has_interface,
-            "has_launch": has_launch,
-            "detected_ml_libraries": detected_ml,
-            "detected_jupyter": detected_jupyter,
-            "recommendations": recommendations,
-            "warnings": warnings,
-            "suggested_mode": _suggest_deployment_mode(detected_ml, detected_jupyter),
-        }
-
-    except Exception as e:
-        return {"valid": False, "error": f"Failed to read file: {e!s}", "recommendations": ["Check file permissions and content"]}
+    return analyze_validate_app_file(Path(app_file))
 
 
 # Import Modal's color constants from common module
@@ -191,7 +137,7 @@ async def list_modal_deployments() -> list[dict[str, Any]]:
     """
     modal_api = ModalAPI()
     try:
-        return await modal_api.list_deployments()
+        return [app.to_dict() for app in await modal_api.list_deployments()]
     finally:
         await modal_api.close()
 
@@ -229,15 +175,6 @@ async def get_deployment_logs(app_name: str, lines: int = 100) -> str:
         await modal_api.close()
 
 
-def _suggest_deployment_mode(ml_libraries: list[str], jupyter_libraries: list[str]) -> str:
-    """Suggest the best deployment mode based on detected libraries."""
-    if jupyter_libraries:
-        return "gra_jupy"
-    if ml_libraries:
-        return "optimized"
-    return "minimum"
-
-
 def get_modal_status() -> dict[str, Any]:
     """Get comprehensive Modal deployment status with enhanced information.
 
@@ -266,7 +203,7 @@ def get_modal_status() -> dict[str, Any]:
             secrets = []
 
         # Calculate statistics
-        active_deployments = [d for d in deployments if d.get("status") == "running"]
+        active_deployments = [d for d in deployments if d["state"].lower() not in STOPPED_STATES]
 
         return {
             "authenticated": True,
@@ -0,0 +1,186 @@
+"""Local wheelhouse for offline image builds.
+
+``prefetch`` downloads Linux / Python 3.11 wheels for the mode package sets
+in ``base_packages.yml`` into one subdirectory per mode. pip skips wheels that
+are already there and copies wheels another mode already fetched instead of
+downloading them again, and wheels with identical content are hard-linked, so
+a wheel such as torch is stored once. Generated images copy only their mode's
+subdirectory and install from it with ``--no-index``, so a ``minimum`` image
+never carries CUDA wheels and prefetching another mode leaves its layer as is.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from modal_for_noobs.render_cache import atomic_write_text, default_cache_dir
+from modal_for_noobs.requirements import RequirementSet
+
+# Where generated images mount the wheelhouse
+WHEELHOUSE_REMOTE_PATH = "/wheelhouse"
+
+# Index of the wheels in a wheelhouse, stored alongside them
+MANIFEST_FILE = "manifest.json"
+
+# Target of the downloaded wheels, matching the generated images
+WHEEL_PYTHON_VERSION = "3.11"
+WHEEL_PLATFORMS = ("manylinux_2_28_x86_64", "manylinux2014_x86_64", "linux_x86_64")
+
+# Seconds allowed for one pip download
+PREFETCH_TIMEOUT = 3600
+
+
+def default_wheelhouse_dir() -> Path:
+    """Default wheelhouse, under the cache root so CI can persist it."""
+    return default_cache_dir() / "wheelhouse"
+
+
+@dataclass
+class PrefetchResult:
+    """Outcome of prefetching one mode's packages."""
+
+    mode: str
+    packages: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {"mode": self.mode, "packages": self.packages, "failed": self.failed}
+
+
+def mode_dir(wheelhouse: Path, mode: str) -> Path:
+    """Subdirectory holding one mode's wheels."""
+    return wheelhouse / mode
+
+
+def image_wheel_dir(wheelhouse: Path, mode: str) -> Path:
+    """Directory an image of ``mode`` installs from.
+
+    The mode's subdirectory of a prefetched wheelhouse, or ``wheelhouse``
+    itself for a flat directory of wheels.
+    """
+    directory = mode_dir(wheelhouse, mode)
+    return directory if directory.is_dir() else wheelhouse
+
+
+def download_command(packages: list[str], wheelhouse: Path, find_links: list[Path] = ()) -> list[str]:
+    """``pip download`` command fetching Linux wheels for ``packages`` into ``wheelhouse``.
+
+    Wheels already in ``find_links`` directories are copied from there.
+    """
+    command = [sys.executable, "-m", "pip", "download", "--quiet", "--dest", str(wheelhouse), "--only-binary=:all:"]
+    for platform in WHEEL_PLATFORMS:
+        command += ["--platform", platform]
+    command += ["--python-version", WHEEL_PYTHON_VERSION, "--implementation", "cp"]
+    for directory in find_links:
+        command += ["--find-links", str(directory)]
+    return command + packages
+
+
+def _download(packages: list[str], wheelhouse: Path) -> bool:
+    """Download ``packages`` and their dependencies, returning whether pip succeeded."""
+    # Other modes' directories, so shared wheels are copied rather than downloaded
+    siblings = sorted(path for path in wheelhouse.parent.iterdir() if path.is_dir() and path != wheelhouse)
+    try:
+        result = subprocess.run(
+            download_command(packages, wheelhouse, siblings), capture_output=True, text=True, timeout=PREFETCH_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    return result.returncode == 0
+
+
+def prefetch_mode(mode: str, packages: list[str], wheelhouse: Path) -> PrefetchResult:
+    """Fetch wheels for one mode's packages into its subdirectory of ``wheelhouse``.
+
+    The whole set is downloaded in one resolution. If that fails, packages
+    are retried one by one so a single sdist-only package (such as
+    flash-attn) does not block the rest.
+    """
+    target = mode_dir(wheelhouse, mode)
+    target.mkdir(parents=True, exist_ok=True)
+    packages = RequirementSet(packages).to_list()
+    result = PrefetchResult(mode=mode, packages=packages)
+    if packages and not _download(packages, target):
+        result.failed = [package for package in packages if not _download([package], target)]
+    return result
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(wheelhouse: Path) -> dict[str, Any]:
+    """The wheelhouse manifest, or an empty one."""
+    try:
+        return json.loads((wheelhouse / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return {"wheels": {}, "modes": {}}
+
+
+def index_wheelhouse(wheelhouse: Path, results: list[PrefetchResult] = ()) -> dict[str, Any]:
+    """Hash the wheels, hard-link identical ones and write the manifest.
+
+    Wheels are keyed by their path relative to ``wheelhouse``, e.g.
+    ``minimum/gradio-5.0-py3-none-any.whl``. Hashes are reused for wheels whose size and modification time are
+    unchanged, so re-indexing a large wheelhouse stays cheap.
+
+    Returns:
+        dict: The manifest, with per-wheel digests, per-mode results and the
+        bytes saved by deduplication.
+    """
+    manifest = read_manifest(wheelhouse)
+    previous = manifest.get("wheels", {})
+    wheels: dict[str, dict[str, Any]] = {}
+    by_digest: dict[str, Path] = {}
+    saved_bytes = 0
+
+    for wheel in sorted([*wheelhouse.glob("*.whl"), *wheelhouse.glob("*/*.whl")]):
+        stat = wheel.stat()
+        key = wheel.relative_to(wheelhouse).as_posix()
+        entry = previous.get(key)
+        if not entry or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+            entry = {"sha256": _sha256(wheel), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        original = by_digest.setdefault(entry["sha256"], wheel)
+        if original != wheel and not wheel.samefile(original):
+            wheel.unlink()
+            os.link(original, wheel)
+            saved_bytes += stat.st_size
+            entry["mtime_ns"] = wheel.stat().st_mtime_ns
+        wheels[key] = entry
+
+    modes = manifest.get("modes", {})
+    modes.update({result.mode: result.to_dict() for result in results})
+    manifest = {
+        "wheels": wheels,
+        "modes": modes,
+        "total_bytes": sum(entry["size"] for entry in {entry["sha256"]: entry for entry in wheels.values()}.values()),
+        "deduplicated_bytes": manifest.get("deduplicated_bytes", 0) + saved_bytes,
+    }
+    atomic_write_text(wheelhouse / MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def prefetch(packages_by_mode: dict[str, list[str]], wheelhouse: Path | None = None) -> tuple[list[PrefetchResult], dict[str, Any]]:
+    """Prefetch wheels for several modes into one shared wheelhouse, a subdirectory each.
+
+    Args:
+        packages_by_mode: Package lists keyed by deployment mode.
+        wheelhouse: Target directory, ``default_wheelhouse_dir()`` when not given.
+
+    Returns:
+        tuple: Per-mode results and the updated manifest.
+    """
+    wheelhouse = wheelhouse or default_wheelhouse_dir()
+    results = [prefetch_mode(mode, packages, wheelhouse) for mode, packages in packages_by_mode.items()]
+    return results, index_wheelhouse(wheelhouse, results)
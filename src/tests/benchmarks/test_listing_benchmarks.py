@@ -0,0 +1,60 @@
+"""Benchmarks for parsing ``modal app list`` output.
+
+Run with ``nox -s benchmarks`` or ``pytest src/tests/benchmarks -m benchmark``.
+The same listing of many apps is parsed from ``--json`` output and from the
+Rich table the CLI prints without it.
+"""
+
+import io
+import json
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from rich.console import Console
+from rich.table import Table
+
+from modal_for_noobs.modal_listings import parse_apps
+
+pytestmark = pytest.mark.benchmark(group="listings", min_rounds=5, max_time=0.5)
+
+COLUMNS = ["App ID", "Description", "State", "Tasks", "Created at", "Stopped at"]
+APP_COUNTS = [10, 500]
+
+
+def make_rows(count: int) -> list[list[str]]:
+    return [
+        [f"ap-{i:022d}", f"app number {i}", "deployed" if i % 3 else "stopped", str(i % 4), "2025-03-14 09:26:53+00:00", ""]
+        for i in range(count)
+    ]
+
+
+def render_table(rows: list[list[str]], width: int) -> str:
+    buffer = io.StringIO()
+    table = Table(*COLUMNS, title="Apps in environment 'main'")
+    for row in rows:
+        table.add_row(*row)
+    Console(file=buffer, width=width, color_system=None).print(table)
+    return buffer.getvalue()
+
+
+def render_json(rows: list[list[str]]) -> str:
+    keys = ["app_id", "description", "state", "tasks", "created_at", "stopped_at"]
+    return json.dumps([dict(zip(keys, row, strict=True)) for row in rows], indent=2)
+
+
+@pytest.mark.parametrize("count", APP_COUNTS)
+@pytest.mark.parametrize("output_format", ["json", "table", "wrapped-table"])
+def test_parse_apps(benchmark, count, output_format):
+    rows = make_rows(count)
+    output = {
+        "json": lambda: render_json(rows),
+        "table": lambda: render_table(rows, 200),
+        "wrapped-table": lambda: render_table(rows, 80),
+    }[output_format]()
+
+    apps = benchmark(parse_apps, output)
+
+    assert len(apps) == count
+    assert apps[-1].name == f"app number {count - 1}"
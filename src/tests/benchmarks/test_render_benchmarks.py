@@ -0,0 +1,149 @@
+"""Benchmarks for the deployment-file generation path.
+
+Run with ``nox -s benchmarks`` or ``pytest src/tests/benchmarks -m benchmark``.
+Every case also records its peak traced memory in ``extra_info`` and fails if
+it exceeds a budget proportional to the rendered output, so template growth
+shows up as a failure rather than only as a slower number.
+"""
+
+import asyncio
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from modal_for_noobs.huggingface import HuggingFaceSpacesMigrator
+from modal_for_noobs.modal_deploy import DeploymentConfig, ModalDeployer
+from modal_for_noobs.template_generator import TemplateConfig, TemplateGenerator
+from modal_for_noobs.templates.deployment import generate_modal_deployment, get_image_config
+
+pytestmark = pytest.mark.benchmark(group="render", min_rounds=5, max_time=0.5)
+
+# Peak traced memory may be this many times the rendered output, plus a fixed allowance
+PEAK_MEMORY_FACTOR = 8
+PEAK_MEMORY_BASE = 4 * 1024 * 1024
+
+MODES = ["minimum", "optimized", "gra_jupy", "marimo"]
+
+APP_HEADER = """import gradio as gr
+import numpy as np
+"""
+
+APP_FUNCTION = '''
+
+def handler_{index}(text: str) -> str:
+    """Echo handler number {index}."""
+    words = [word.upper() for word in text.split()]
+    return " ".join(words) + " #{index}"
+'''
+
+APP_FOOTER = """
+demo = gr.Interface(fn=handler_0, inputs="text", outputs="text")
+"""
+
+# Number of handler functions in each app size, roughly 0.3 KB, 60 KB and 3 MB of source
+APP_SIZES = {"small": 1, "medium": 200, "huge": 10_000}
+
+ADVANCED_CONFIG = {
+    "gpu_type": "A10G",
+    "cpu_count": 4,
+    "memory_gb": 16,
+    "environment_variables": {f"VAR_{i}": f"value-{i}" for i in range(20)},
+    "secrets": ["hf-token", "openai-key"],
+    "volume_mounts": {"/data": "app-data", "/models": "model-cache"},
+    "max_containers": 20,
+}
+
+
+def make_app_source(size: str) -> str:
+    """Build a Gradio app source of the given size class."""
+    return APP_HEADER + "".join(APP_FUNCTION.format(index=i) for i in range(APP_SIZES[size])) + APP_FOOTER
+
+
+def run_benchmark(benchmark, fn: Callable[[], Any]) -> Any:
+    """Benchmark ``fn``, then record its peak memory and check it against the budget."""
+    result = benchmark(fn)
+
+    tracemalloc.start()
+    try:
+        output = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    output_size = len(output) if isinstance(output, str) else 0
+    benchmark.extra_info["peak_memory_kib"] = round(peak / 1024, 1)
+    benchmark.extra_info["output_kib"] = round(output_size / 1024, 1)
+    assert peak <= PEAK_MEMORY_FACTOR * output_size + PEAK_MEMORY_BASE, f"peak memory {peak} bytes over budget"
+    return result
+
+
+@pytest.fixture(params=list(APP_SIZES))
+def app_source(request) -> str:
+    return make_app_source(request.param)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_generate_modal_deployment(benchmark, mode, app_source):
+    image_config = get_image_config(mode, ["gradio", "fastapi[standard]", "uvicorn"])
+    output = run_benchmark(
+        benchmark,
+        lambda: generate_modal_deployment(Path("bench_app.py"), app_source, deployment_mode=mode, image_config=image_config),
+    )
+    assert "modal.App" in output
+
+
+@pytest.mark.parametrize("mode", ["minimum", "optimized", "gradio-jupyter", "marimo"])
+@pytest.mark.parametrize("advanced", [False, True], ids=["basic", "advanced"])
+def test_template_generator(benchmark, mode, advanced, app_source):
+    generator = TemplateGenerator()
+    extra = {"gpu_type": "a10g", "secrets": ["hf-token"], "environment_variables": {"A": "1"}} if advanced else {}
+    config = TemplateConfig(app_name="bench-app", deployment_mode=mode, original_code=app_source, **extra)
+    output = run_benchmark(benchmark, lambda: generator.generate_deployment(config))
+    assert "modal" in output
+
+
+@pytest.mark.parametrize("mode", ["minimum", "optimized", "gra_jupy", "marimo"])
+@pytest.mark.parametrize("advanced", [False, True], ids=["basic", "advanced"])
+def test_create_enhanced_template(benchmark, tmp_path, mode, advanced, app_source):
+    app_file = tmp_path / "bench_app.py"
+    deployer = ModalDeployer(app_file, mode=mode, use_cache=False)
+    config = DeploymentConfig(mode=mode, app_name="bench-app", **(ADVANCED_CONFIG if advanced else {}))
+    image_config = get_image_config(mode, ["gradio", "fastapi[standard]", "uvicorn"])
+    output = run_benchmark(benchmark, lambda: deployer._create_enhanced_template(app_file, app_source, config, image_config))
+    assert "deploy_gradio" in output
+
+
+@pytest.mark.parametrize("optimized", [False, True], ids=["minimum", "optimized"])
+def test_convert_to_modal(benchmark, tmp_path, optimized, app_source):
+    (tmp_path / "app.py").write_text(app_source)
+    (tmp_path / "requirements.txt").write_text("numpy\npandas>=2.0\n")
+    migrator = HuggingFaceSpacesMigrator()
+
+    def convert() -> str:
+        return asyncio.run(migrator.convert_to_modal_async(tmp_path, optimized=optimized)).read_text()
+
+    output = run_benchmark(benchmark, convert)
+    assert "mount_gradio_app" in output
+
+
+@pytest.mark.parametrize("use_cache", [False, True], ids=["render", "cached"])
+def test_full_deploy_offline(benchmark, tmp_path, monkeypatch, fake_modal_cli, use_cache):
+    """End-to-end ``ModalDeployer.deploy`` against a stub ``modal`` binary."""
+    monkeypatch.setenv("MODAL_TOKEN_ID", "ak-bench")
+    monkeypatch.setenv("MODAL_TOKEN_SECRET", "as-bench")
+    fake_modal_cli("print('Building image')\nprint('Created web function => https://ws--bench-app.modal.run')\n")
+    app_file = tmp_path / "bench_app.py"
+    app_file.write_text(make_app_source("medium"))
+    deployer = ModalDeployer(app_file, mode="minimum", use_cache=use_cache)
+
+    def deploy() -> str:
+        result = asyncio.run(deployer.deploy())
+        assert result.success
+        return result.url
+
+    benchmark(deploy)
@@ -1,5 +1,8 @@
 """Pytest configuration and fixtures for the test suite."""
 
+import io
+import os
+import sys
 import tempfile
 from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
@@ -59,6 +62,72 @@ def configure_test_logging():
     )
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep render caches and ledgers out of the real home directory."""
+    cache_dir = tmp_path / "mfn-cache"
+    monkeypatch.setenv("MODAL_FOR_NOOBS_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("MODAL_FOR_NOOBS_HOME", str(tmp_path / "mfn-home"))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def offline_modal_backend(monkeypatch):
+    """Serve ModalAPI from the in-memory backend unless a test picks another one."""
+    monkeypatch.setenv("MODAL_FOR_NOOBS_BACKEND", "fake")
+
+
+@pytest.fixture
+def fake_modal_cli(tmp_path, monkeypatch):
+    """Put a stub ``modal`` executable running the given Python body first on PATH."""
+
+    def install(body: str) -> Path:
+        bin_dir = tmp_path / "fake-bin"
+        bin_dir.mkdir(exist_ok=True)
+        stub = bin_dir / "modal"
+        stub.write_text(f"#!{sys.executable}\nimport sys, time\nfrom pathlib import Path\n{body}\n")
+        stub.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        return stub
+
+    return install
+
+
+class FakeStream:
+    """In-memory stand-in for a subprocess pipe."""
+
+    def __init__(self, data: bytes):
+        self._buffer = io.BytesIO(data)
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._buffer.read(n)
+
+    async def readline(self) -> bytes:
+        return self._buffer.readline()
+
+
+class FakeProcess:
+    """Finished subprocess with canned output, as returned by ``asyncio.create_subprocess_exec``."""
+
+    def __init__(self, stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0):
+        self.stdin = None
+        self.stdout = FakeStream(stdout)
+        self.stderr = FakeStream(stderr)
+        self.returncode = returncode
+
+    async def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_process():
+    """Build fake processes to return from a patched ``asyncio.create_subprocess_exec``."""
+    return FakeProcess
+
+
 @pytest.fixture
 def mock_environment(monkeypatch):
     """Mock environment variables."""
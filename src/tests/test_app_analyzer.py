@@ -0,0 +1,104 @@
+"""Tests for the AST-based app analyzer."""
+
+import pytest
+
+from modal_for_noobs import app_analyzer
+from modal_for_noobs.app_analyzer import analyze_source, validate_app_file
+
+APP_CODE = '''
+import gradio as gr
+import torch.nn as nn
+from sklearn.linear_model import LinearRegression
+# import tensorflow  -- only mentioned in a comment
+pandas_numpy_helper = "numpy"
+
+def build():
+    with gr.Blocks() as inner:
+        pass
+    return inner
+
+ui = gr.Interface(fn=lambda x: x, inputs="text", outputs="text").queue()
+
+if __name__ == "__main__":
+    ui.launch()
+'''
+
+
+class TestAnalyzeSource:
+    """Test import, interface and launch detection."""
+
+    def test_real_imports_only(self):
+        analysis = analyze_source(APP_CODE)
+        assert analysis.imports == ("gradio", "sklearn", "torch")
+        assert analysis.ml_libraries == ["torch", "sklearn"]
+        assert analysis.suggested_mode == "optimized"
+
+    def test_module_level_interfaces(self):
+        analysis = analyze_source(APP_CODE)
+        assert analysis.has_gradio
+        assert analysis.has_interface
+        assert analysis.interface_names == ("ui",)
+        assert analysis.launch_targets == ("ui",)
+        assert analysis.detection_names() == ["ui", "demo", "app", "interface", "iface"]
+
+    def test_from_import_and_with_block(self):
+        analysis = analyze_source("from gradio import Blocks as B\nwith B() as page:\n    pass\n")
+        assert analysis.interface_names == ("page",)
+        assert not analysis.has_launch
+
+    def test_name_mentions_do_not_suggest_gpu_mode(self):
+        analysis = analyze_source('import gradio as gr\n# uses torch later\nlabel = "numpy"\ndemo = gr.Blocks()\n')
+        assert analysis.ml_libraries == []
+        assert analysis.suggested_mode == "minimum"
+
+    def test_jupyter_mode(self):
+        assert analyze_source("import gradio as gr\nimport matplotlib.pyplot as plt\n").suggested_mode == "gra_jupy"
+
+    def test_third_party_imports(self):
+        analysis = analyze_source("import os\nimport json\nfrom __future__ import annotations\nimport requests\n")
+        assert analysis.third_party_imports == ("requests",)
+
+    def test_syntax_error(self):
+        analysis = analyze_source("def broken(:\n")
+        assert analysis.syntax_error.startswith("line 1")
+
+    def test_results_cached_by_content(self, monkeypatch):
+        calls = []
+        real_analyze = app_analyzer._analyze
+        monkeypatch.setattr(app_analyzer, "_analyze", lambda source: calls.append(source) or real_analyze(source))
+
+        source = APP_CODE + "\n# cache probe\n"
+        first = analyze_source(source)
+        assert analyze_source(source) is first
+        assert len(calls) == 1
+
+
+class TestValidateAppFile:
+    """Test validation built on the analysis."""
+
+    def test_valid_app(self, tmp_path):
+        app_file = tmp_path / "app.py"
+        app_file.write_text(APP_CODE)
+        result = validate_app_file(app_file)
+        assert result["valid"]
+        assert result["suggested_mode"] == "optimized"
+        assert result["detected_ml_libraries"] == ["torch", "sklearn"]
+        assert result["interface_names"] == ["ui"]
+
+    def test_no_interface(self, tmp_path):
+        app_file = tmp_path / "app.py"
+        app_file.write_text("import gradio as gr\n# gr.Interface(...) coming soon\n")
+        result = validate_app_file(app_file)
+        assert not result["valid"]
+        assert "Create a Gradio interface using gr.Blocks() or gr.Interface()" in result["recommendations"]
+
+    @pytest.mark.parametrize(
+        ("name", "content", "error"),
+        [("app.txt", "import gradio", "File must be a Python file"), ("app.py", "def broken(:\n", "Syntax error")],
+    )
+    def test_invalid_files(self, tmp_path, name, content, error):
+        app_file = tmp_path / name
+        app_file.write_text(content)
+        result = validate_app_file(app_file)
+        assert not result["valid"]
+        assert result["error"].startswith(error)
@@ -0,0 +1,107 @@
+"""Tests for the shared modal app list cache."""
+
+import asyncio
+
+from modal_for_noobs.app_list_cache import AppCache
+from modal_for_noobs.modal_backends import FakeBackend
+from modal_for_noobs.modal_deploy import ModalAPI
+
+APPS = [{"app_id": "ap-1", "description": "chat", "state": "deployed", "tasks": "1"}]
+
+
+def counting_fetch(apps=APPS, delay=0.0):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return [dict(app) for app in apps]
+
+    return fetch, calls
+
+
+async def test_serves_cached_list_until_ttl_expires():
+    cache = AppCache(ttl=0.2)
+    fetch, calls = counting_fetch()
+
+    first = await cache.get("sdk", fetch)
+    first[0]["state"] = "changed"
+    assert await cache.get("sdk", fetch) == APPS
+    assert len(calls) == 1
+
+    await asyncio.sleep(0.25)
+    await cache.get("sdk", fetch)
+    assert len(calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2, "coalesced": 0, "hit_rate": 0.333}
+
+
+async def test_concurrent_misses_share_one_fetch():
+    cache = AppCache()
+    fetch, calls = counting_fetch(delay=0.05)
+
+    results = await asyncio.gather(*(cache.get("sdk", fetch) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert all(result == APPS for result in results)
+    assert cache.stats()["coalesced"] == 9
+
+
+async def test_invalidation_during_fetch_is_not_cached():
+    cache = AppCache()
+    fetch, calls = counting_fetch(delay=0.05)
+
+    task = asyncio.create_task(cache.get("sdk", fetch))
+    await asyncio.sleep(0.01)
+    cache.invalidate()
+    await task
+    await cache.get("sdk", fetch)
+
+    assert len(calls) == 2
+
+
+async def test_callers_after_invalidation_do_not_join_the_stale_fetch():
+    cache = AppCache()
+    apps = [{"app_id": "ap-0", "description": "old"}]
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        snapshot = [dict(app) for app in apps]
+        await asyncio.sleep(0.05)
+        return snapshot
+
+    stale = asyncio.create_task(cache.get("sdk", fetch))
+    await asyncio.sleep(0.01)
+    apps.append({"app_id": "ap-1", "description": "new"})
+    cache.invalidate()
+
+    fresh = await cache.get("sdk", fetch)
+    assert [app["description"] for app in fresh] == ["old", "new"]
+    assert [app["description"] for app in await stale] == ["old"]
+    assert len(calls) == 2
+    assert [app["description"] for app in await cache.get("sdk", fetch)] == ["old", "new"]
+    assert len(calls) == 2
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = AppCache()
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ConnectionError("modal is down")
+
+    results = await asyncio.gather(*(cache.get("sdk", failing) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    fetch, calls = counting_fetch()
+    assert await cache.get("sdk", fetch) == APPS
+
+
+async def test_stopping_an_app_refreshes_the_list():
+    backend = FakeBackend(APPS)
+    api = ModalAPI(backend=backend)
+
+    assert (await api.list_deployments())[0].state == "deployed"
+    assert await api.kill_deployment("chat") is True
+    assert (await api.list_deployments())[0].state == "stopped"
+    assert backend.calls.count(("list_apps",)) == 2
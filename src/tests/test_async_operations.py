@@ -1,7 +1,7 @@
 """Tests for async operations and Modal CLI integration."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -31,7 +31,7 @@ class TestAsyncKillDeployment:
             mock_deployer.check_modal_auth_async.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_kill_deployment_list_mode(self):
+    async def test_kill_deployment_list_mode(self, fake_process):
         """Test kill deployment in list mode."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -39,16 +39,8 @@ class TestAsyncKillDeployment:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app list
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"ap-test123 | app-name | deployed | 1", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"ap-test123 | app-name | deployed | 1", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -57,7 +49,7 @@ class TestAsyncKillDeployment:
             mock_subprocess.assert_called()
 
     @pytest.mark.asyncio
-    async def test_kill_specific_deployment(self):
+    async def test_kill_specific_deployment(self, fake_process):
         """Test killing specific deployment."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -65,16 +57,8 @@ class TestAsyncKillDeployment:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app list and stop
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"ap-test123 | app-name | deployed | 1", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"ap-test123 | app-name | deployed | 1", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -84,7 +68,7 @@ class TestAsyncKillDeployment:
             assert mock_subprocess.call_count >= 1
 
     @pytest.mark.asyncio
-    async def test_kill_deployment_already_stopped(self):
+    async def test_kill_deployment_already_stopped(self, fake_process):
         """Test killing deployment that's already stopped."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -92,16 +76,8 @@ class TestAsyncKillDeployment:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app list showing stopped app
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"ap-test123 | app-name | stopped | 0", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"ap-test123 | app-name | stopped | 0", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -111,7 +87,7 @@ class TestAsyncKillDeployment:
             mock_subprocess.assert_called()
 
     @pytest.mark.asyncio
-    async def test_kill_deployment_with_containers(self):
+    async def test_kill_deployment_with_containers(self, fake_process):
         """Test killing deployment with running containers."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -132,15 +108,8 @@ class TestAsyncKillDeployment:
 
             response_iter = iter(responses)
 
-            async def mock_communicate():
-                return next(response_iter)
-
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(*next(response_iter))
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -179,7 +148,7 @@ class TestAsyncLogMilking:
             mock_deployer.check_modal_auth_async.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_milk_logs_list_apps(self):
+    async def test_milk_logs_list_apps(self, fake_process):
         """Test milk logs in list apps mode."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -187,16 +156,8 @@ class TestAsyncLogMilking:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app list
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"ap-test123 | app-name | deployed | 1", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"ap-test123 | app-name | deployed | 1", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -205,7 +166,7 @@ class TestAsyncLogMilking:
             mock_subprocess.assert_called()
 
     @pytest.mark.asyncio
-    async def test_milk_logs_specific_app(self):
+    async def test_milk_logs_specific_app(self, fake_process):
         """Test milking logs for specific app."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -213,16 +174,8 @@ class TestAsyncLogMilking:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app logs
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"2023-01-01 12:00:00 INFO: App started", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"2023-01-01 12:00:00 INFO: App started", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -231,7 +184,7 @@ class TestAsyncLogMilking:
             mock_subprocess.assert_called()
 
     @pytest.mark.asyncio
-    async def test_milk_logs_follow_mode(self):
+    async def test_milk_logs_follow_mode(self, fake_process):
         """Test milking logs in follow mode."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -239,16 +192,8 @@ class TestAsyncLogMilking:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app logs with follow
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"2023-01-01 12:00:00 INFO: App started", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"2023-01-01 12:00:00 INFO: App started", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -257,23 +202,15 @@ class TestAsyncLogMilking:
             mock_subprocess.assert_called()
 
     @pytest.mark.asyncio
-    async def test_milk_logs_custom_lines(self):
+    async def test_milk_logs_custom_lines(self, fake_process):
         """Test milking logs with custom line count."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
             mock_deployer.check_modal_auth_async.return_value = True
             mock_deployer_class.return_value = mock_deployer
 
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"logs", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"logs", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -298,7 +235,7 @@ class TestAsyncSanityCheck:
             mock_deployer.check_modal_auth_async.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_sanity_check_with_auth(self):
+    async def test_sanity_check_with_auth(self, fake_process):
         """Test sanity check with authentication."""
         with patch("modal_for_noobs.cli.ModalDeployer") as mock_deployer_class, patch("asyncio.create_subprocess_exec") as mock_subprocess:
             mock_deployer = AsyncMock()
@@ -306,16 +243,8 @@ class TestAsyncSanityCheck:
             mock_deployer_class.return_value = mock_deployer
 
             # Mock modal app list
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-
-            async def mock_communicate():
-                return (b"ap-test123 | app-name | deployed | 1", b"")
-
-            mock_process.communicate = mock_communicate
-
             async def mock_subprocess_exec(*args, **kwargs):
-                return mock_process
+                return fake_process(b"ap-test123 | app-name | deployed | 1", b"")
 
             mock_subprocess.side_effect = mock_subprocess_exec
 
@@ -4,7 +4,7 @@ import asyncio
 import json
 import os
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from typer.testing import CliRunner
@@ -91,21 +91,14 @@ def mock_modal_auth():
 
 
 @pytest.fixture
-def mock_subprocess():
+def mock_subprocess(fake_process):
     """Mock subprocess calls."""
     with patch("asyncio.create_subprocess_exec") as mock:
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-
-        async def mock_communicate():
-            return (b"success", b"")
-
-        mock_process.communicate = mock_communicate
 
         async def mock_subprocess_exec(*args, **kwargs):
-            return mock_process
+            return fake_process(b"success", b"")
 
-        mock.return_value = mock_subprocess_exec()
+        mock.side_effect = mock_subprocess_exec
         yield mock
 
 
@@ -308,7 +301,7 @@ class TestCLICommands:
         mock_milk.return_value = mock_milk_async()
         result = runner.invoke(app, ["milk-logs", "test-app"])
         assert result.exit_code == 0
-        mock_milk.assert_called_once_with("test-app", False, 100, False)
+        mock_milk.assert_called_once_with("test-app", False, 100, False, False)
 
     @patch("modal_for_noobs.cli._milk_logs_async")
     def test_milk_logs_follow(self, mock_milk, runner):
@@ -320,7 +313,7 @@ class TestCLICommands:
         mock_milk.return_value = mock_milk_async()
         result = runner.invoke(app, ["milk-logs", "test-app", "--follow"])
         assert result.exit_code == 0
-        mock_milk.assert_called_once_with("test-app", True, 100, False)
+        mock_milk.assert_called_once_with("test-app", True, 100, False, False)
 
     def test_sanity_check_help(self, runner):
         """Test sanity-check command help."""
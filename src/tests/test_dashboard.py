@@ -1,11 +1,12 @@
 """Tests for the Modal dashboard functionality."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from modal_for_noobs.dashboard import ModalDashboard, ModalDeployment
+from modal_for_noobs.modal_backends import ModalBackendError
 
 
 class TestModalDeployment:
@@ -61,59 +62,33 @@ class TestModalDashboard:
     @pytest.mark.asyncio
     async def test_fetch_deployments_success(self, dashboard):
         """Test successful deployment fetching."""
-        mock_output = """app_id     state      created_at
-test-app-1  running   2024-01-01T10:00:00
-test-app-2  stopped   2024-01-01T09:00:00"""
+        dashboard.modal_api.backend.apps = [
+            {"app_id": "test-app-1", "description": "test-app", "state": "running", "created_at": "2024-01-01T10:00:00"},
+            {"app_id": "test-app-2", "description": "test-app", "state": "stopped", "created_at": "2024-01-01T09:00:00"},
+        ]
 
-        with patch("asyncio.create_subprocess_exec") as mock_subprocess:
-            # Mock the process
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (mock_output.encode(), b"")
-            mock_subprocess.return_value = mock_process
+        deployments = await dashboard.fetch_deployments()
 
-            # Mock the _get_app_details method
-            with patch.object(dashboard, "_get_app_details") as mock_details:
-                mock_details.return_value = {
-                    "name": "test-app",
-                    "url": "https://test.modal.run",
-                    "gpu_type": "T4",
-                    "runtime_minutes": 30.0,
-                    "uptime": "30m",
-                    "containers": 1,
-                    "functions": [],
-                }
-
-                deployments = await dashboard.fetch_deployments()
-
-                assert len(deployments) == 2
-                assert deployments[0].app_id == "test-app-1"
-                assert deployments[0].state == "running"
-                assert deployments[1].app_id == "test-app-2"
-                assert deployments[1].state == "stopped"
+        assert len(deployments) == 2
+        assert deployments[0].app_id == "test-app-1"
+        assert deployments[0].state == "running"
+        assert deployments[1].app_id == "test-app-2"
+        assert deployments[1].state == "stopped"
 
     @pytest.mark.asyncio
     async def test_fetch_deployments_failure(self, dashboard):
-        """Test deployment fetching when modal command fails."""
-        with patch("asyncio.create_subprocess_exec") as mock_subprocess:
-            # Mock a failed process
-            mock_process = AsyncMock()
-            mock_process.returncode = 1
-            mock_process.communicate.return_value = (b"", b"Authentication failed")
-            mock_subprocess.return_value = mock_process
-
+        """Test deployment fetching when listing apps fails."""
+        with patch.object(dashboard.modal_api.backend, "list_apps", side_effect=ModalBackendError("Authentication failed")):
             deployments = await dashboard.fetch_deployments()
 
             assert deployments == []
 
     @pytest.mark.asyncio
-    async def test_stop_deployment_success(self, dashboard):
+    async def test_stop_deployment_success(self, dashboard, fake_process):
         """Test successful deployment stopping."""
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
             # Mock successful stop
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (b"App stopped successfully", b"")
+            mock_process = fake_process(b"App stopped successfully", b"")
             mock_subprocess.return_value = mock_process
 
             result = await dashboard.stop_deployment("test-app")
@@ -122,13 +97,11 @@ test-app-2  stopped   2024-01-01T09:00:00"""
             assert "Successfully stopped test-app" in result["message"]
 
     @pytest.mark.asyncio
-    async def test_stop_deployment_failure(self, dashboard):
+    async def test_stop_deployment_failure(self, dashboard, fake_process):
         """Test deployment stopping failure."""
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
             # Mock failed stop
-            mock_process = AsyncMock()
-            mock_process.returncode = 1
-            mock_process.communicate.return_value = (b"", b"App not found")
+            mock_process = fake_process(b"", b"App not found", returncode=1)
             mock_subprocess.return_value = mock_process
 
             result = await dashboard.stop_deployment("nonexistent-app")
@@ -149,7 +122,7 @@ test-app-2  stopped   2024-01-01T09:00:00"""
             assert "Connection failed" in result["message"]
 
     @pytest.mark.asyncio
-    async def test_fetch_logs_success(self, dashboard):
+    async def test_fetch_logs_success(self, dashboard, fake_process):
         """Test successful log fetching."""
         mock_logs = """2024-01-01T10:00:00 Starting app...
 2024-01-01T10:01:00 App is running
@@ -157,9 +130,7 @@ test-app-2  stopped   2024-01-01T09:00:00"""
 
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
             # Mock successful logs
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (mock_logs.encode(), b"")
+            mock_process = fake_process(mock_logs.encode(), b"")
             mock_subprocess.return_value = mock_process
 
             logs = await dashboard.fetch_logs("test-app", lines=10)
@@ -169,13 +140,11 @@ test-app-2  stopped   2024-01-01T09:00:00"""
             assert "Processing request" in logs
 
     @pytest.mark.asyncio
-    async def test_fetch_logs_failure(self, dashboard):
+    async def test_fetch_logs_failure(self, dashboard, fake_process):
         """Test log fetching failure."""
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
             # Mock failed logs
-            mock_process = AsyncMock()
-            mock_process.returncode = 1
-            mock_process.communicate.return_value = (b"", b"App not found")
+            mock_process = fake_process(b"", b"App not found", returncode=1)
             mock_subprocess.return_value = mock_process
 
             logs = await dashboard.fetch_logs("nonexistent-app")
@@ -183,23 +152,39 @@ test-app-2  stopped   2024-01-01T09:00:00"""
             assert "Error fetching logs: App not found" in logs
 
     @pytest.mark.asyncio
-    async def test_get_app_details(self, dashboard):
-        """Test app details extraction."""
-        mock_logs = """2024-01-01T10:00:00 App starting on T4 GPU
-2024-01-01T10:01:00 App available at https://test-app.modal.run
-2024-01-01T10:02:00 Processing request"""
-
-        with patch("asyncio.create_subprocess_exec") as mock_subprocess:
-            # Mock successful logs
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (mock_logs.encode(), b"")
-            mock_subprocess.return_value = mock_process
-
-            details = await dashboard._get_app_details("test-app")
-
-            assert details["gpu_type"] == "T4"
-            assert "https://test-app.modal.run" in details["url"]
+    async def test_app_details_fetched_once_per_app(self, dashboard):
+        """Test details come from app metadata, once per app, and are cached."""
+        backend = dashboard.modal_api.backend
+        backend.apps = [
+            {
+                "app_id": f"ap-{i}",
+                "description": f"app-{i}",
+                "state": "deployed",
+                "tasks": "2",
+                "created_at": "2024-01-01T10:00:00+00:00",
+                "stopped_at": "2024-01-01T11:30:00+00:00",
+                "url": f"https://app-{i}.modal.run",
+                "functions": ["serve"],
+            }
+            for i in range(20)
+        ]
+        # What SdkBackend reads from the function definitions; the rest could not be read
+        backend.apps[3]["gpu_type"] = "A100-80GB:2"
+        backend.apps[4]["gpu_type"] = "CPU"
+
+        deployments = await dashboard.fetch_deployments()
+        await dashboard.fetch_deployments()
+
+        assert [call[0] for call in backend.calls].count("app_details") == 20
+        assert deployments[3].url == "https://app-3.modal.run"
+        assert deployments[3].gpu_type == "A100-80GB:2"
+        assert deployments[3].estimate_hourly_cost() == 16.0
+        assert deployments[4].estimate_hourly_cost() == 0.6
+        assert deployments[5].gpu_type == "Unknown"
+        assert deployments[3].functions == ["serve"]
+        assert deployments[3].containers == 2
+        assert deployments[3].runtime_minutes == 90.0
+        assert deployments[3].uptime == "1h 30m"
 
     @pytest.mark.asyncio
     async def test_get_credit_balance(self, dashboard):
@@ -0,0 +1,61 @@
+"""Tests for log capture in the deployed dashboard's state."""
+
+import pytest
+from loguru import logger
+
+from modal_for_noobs.templates.dashboard import DashboardState, LogRing
+
+
+def test_ring_keeps_the_newest_records_in_order():
+    ring = LogRing(3)
+    assert list(ring) == []
+
+    for i in range(5):
+        ring.append(i)
+
+    assert len(ring) == 3
+    assert list(ring) == [2, 3, 4]
+    assert list(ring.tail(2)) == [3, 4]
+    assert list(ring.tail(10)) == [2, 3, 4]
+
+    ring.clear()
+    assert len(ring) == 0
+    assert list(ring) == []
+    ring.append(5)
+    assert list(ring) == [5]
+    assert ring.capacity == 3
+
+    with pytest.raises(ValueError):
+        LogRing(0)
+
+
+@pytest.fixture
+def dashboard_logging(monkeypatch):
+    """Capture into DashboardState without replacing the session's loguru sinks."""
+    handler_ids = []
+
+    def setup_logging(state):
+        handler_ids.append(logger.add(state._log_handler, level="DEBUG"))
+
+    monkeypatch.setattr(DashboardState, "_setup_logging", setup_logging)
+    yield
+    for handler_id in handler_ids:
+        logger.remove(handler_id)
+
+
+def test_records_are_formatted_when_read(dashboard_logging):
+    state = DashboardState(max_logs=2)
+    logger.warning("dropped")
+    logger.info("first")
+    logger.bind(request_id="r-1").error("boom")
+
+    time, level, message, extra = next(state.logs.tail(1))
+    assert (level, message, extra) == ("ERROR", "boom", {"request_id": "r-1"})
+
+    logs = state.get_logs(limit=0)
+    assert [(log["level"], log["message"], log["extra"]) for log in logs] == [
+        ("INFO", "first", {}),
+        ("ERROR", "boom", {"request_id": "r-1"}),
+    ]
+    assert logs[1]["timestamp"] == time.strftime("%Y-%m-%d %H:%M:%S")
+    assert state.get_logs(limit=1) == logs[1:]
@@ -0,0 +1,142 @@
+"""Tests for the local deployment ledger and --skip-unchanged deploys."""
+
+from dataclasses import replace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from modal_for_noobs.deploy_ledger import DeploymentLedger, file_digest
+from modal_for_noobs.modal_deploy import DeploymentResult, ModalDeployer
+from modal_for_noobs.modal_listings import AppInfo
+from modal_for_noobs.render_cache import RenderCache
+
+APP_CODE = """
+import gradio as gr
+
+demo = gr.Interface(fn=lambda name: name, inputs="text", outputs="text")
+"""
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return DeploymentLedger(tmp_path / "ledger")
+
+
+@pytest.fixture
+def deployer(tmp_path, ledger):
+    app_file = tmp_path / "ledger_app.py"
+    app_file.write_text(APP_CODE)
+    return ModalDeployer(app_file, mode="minimum", render_cache=RenderCache(tmp_path / "render"), ledger=ledger)
+
+
+class TestDeploymentLedger:
+    """Test ledger persistence."""
+
+    def test_record_and_get(self, ledger, tmp_path):
+        ledger.record("my-app", "abc", url="https://x--my-app.modal.run", app_id="ap-123", deployment_time=12.5)
+
+        entry = ledger.get("my-app")
+        assert entry.digest == "abc"
+        assert entry.url == "https://x--my-app.modal.run"
+        assert entry.app_id == "ap-123"
+        assert entry.deployed_at is not None
+
+    def test_is_unchanged(self, ledger):
+        ledger.record("my-app", "abc")
+        assert ledger.is_unchanged("my-app", "abc") is not None
+        assert ledger.is_unchanged("my-app", "def") is None
+        assert ledger.is_unchanged("other-app", "abc") is None
+
+    def test_forget_by_name_or_app_id(self, ledger):
+        ledger.record("one", "a", app_id="ap-1")
+        ledger.record("two", "b", app_id="ap-2")
+
+        assert ledger.forget("one")
+        assert ledger.forget("ap-2")
+        assert not ledger.forget("three")
+        assert ledger.entries() == []
+
+    def test_corrupt_entry_is_ignored(self, ledger):
+        ledger.ledger_dir.mkdir(parents=True)
+        (ledger.ledger_dir / "broken.json").write_text("{not json")
+        assert ledger.get("broken") is None
+
+    def test_file_digest(self, tmp_path):
+        path = tmp_path / "f.py"
+        path.write_text("x = 1")
+        assert file_digest(path) == file_digest(path)
+        digest = file_digest(path)
+        path.write_text("x = 2")
+        assert file_digest(path) != digest
+
+
+@pytest.mark.asyncio
+class TestSkipUnchanged:
+    """Test skip-unchanged deploys."""
+
+    @pytest.fixture(autouse=True)
+    def authenticated(self):
+        with patch.object(ModalDeployer, "check_modal_auth_async", AsyncMock(return_value=True)):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def live_apps(self, deployer):
+        apps = [AppInfo(app_id="ap-1", name="ledger_app", state="deployed")]
+        with patch.object(deployer.modal_api, "list_deployments", AsyncMock(return_value=apps)):
+            yield apps
+
+    async def test_successful_deploy_is_recorded(self, deployer, ledger):
+        result = DeploymentResult(success=True, url="https://ws--app.modal.run", app_id="ap-1", deployment_time=3.0)
+        with patch.object(deployer, "deploy_to_modal_async", AsyncMock(return_value=result)):
+            await deployer.deploy()
+
+        entry = ledger.get("ledger_app")
+        assert entry.url == "https://ws--app.modal.run"
+        assert entry.digest == file_digest(deployer.app_file.parent / "modal_ledger_app.py")
+
+    async def test_unchanged_deploy_is_skipped(self, deployer):
+        result = DeploymentResult(success=True, url="https://ws--app.modal.run", app_id="ap-1")
+        with patch.object(deployer, "deploy_to_modal_async", AsyncMock(return_value=result)) as mock_deploy:
+            await deployer.deploy()
+            second = await deployer.deploy(skip_unchanged=True)
+
+        assert mock_deploy.await_count == 1
+        assert second.skipped
+        assert second.success
+        assert second.url == "https://ws--app.modal.run"
+        assert second.app_id == "ap-1"
+
+    async def test_stopped_app_is_redeployed(self, deployer, live_apps, ledger):
+        result = DeploymentResult(success=True, url="https://ws--app.modal.run", app_id="ap-1")
+        with patch.object(deployer, "deploy_to_modal_async", AsyncMock(return_value=result)) as mock_deploy:
+            await deployer.deploy()
+            live_apps[0] = replace(live_apps[0], state="stopped")
+            second = await deployer.deploy(skip_unchanged=True)
+
+        assert mock_deploy.await_count == 2
+        assert not second.skipped
+        assert ledger.get("ledger_app") is not None
+
+    async def test_changed_app_is_redeployed(self, deployer):
+        result = DeploymentResult(success=True, url="https://ws--app.modal.run")
+        with patch.object(deployer, "deploy_to_modal_async", AsyncMock(return_value=result)) as mock_deploy:
+            await deployer.deploy()
+            deployer.app_file.write_text(APP_CODE + "\nVERSION = 2\n")
+            second = await deployer.deploy(skip_unchanged=True)
+
+        assert mock_deploy.await_count == 2
+        assert not second.skipped
+
+    async def test_failed_deploy_is_not_recorded(self, deployer, ledger):
+        result = DeploymentResult(success=False, error="boom")
+        with patch.object(deployer, "deploy_to_modal_async", AsyncMock(return_value=result)):
+            await deployer.deploy()
+
+        assert ledger.get("ledger_app") is None
+
+    async def test_kill_forgets_deployment(self, deployer, ledger):
+        ledger.record("ledger_app", "abc")
+        with patch.object(deployer.modal_api, "kill_deployment", AsyncMock(return_value=True)):
+            await deployer.kill_deployment("ledger_app")
+
+        assert ledger.get("ledger_app") is None
@@ -0,0 +1,98 @@
+"""Tests for concurrent multi-app deployment."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from modal_for_noobs.cli import app
+from modal_for_noobs.deploy_many import DeployTarget, deploy_many, discover_targets, load_manifest
+from modal_for_noobs.modal_deploy import DeploymentResult, ModalDeployer
+
+APP_CODE = """
+import gradio as gr
+
+demo = gr.Interface(fn=lambda name: name, inputs="text", outputs="text")
+"""
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    apps = tmp_path / "apps"
+    apps.mkdir()
+    for name in ("alpha", "beta", "gamma"):
+        (apps / f"{name}.py").write_text(APP_CODE)
+    (apps / "modal_alpha.py").write_text("# generated")
+    (apps / "notes.txt").write_text("not an app")
+    return apps
+
+
+class TestDiscoverTargets:
+    """Test glob and manifest target discovery."""
+
+    def test_glob_skips_generated_files(self, app_dir):
+        targets = discover_targets(str(app_dir / "*.py"))
+        assert [target.name for target in targets] == ["alpha", "beta", "gamma"]
+        assert all(target.mode == "minimum" for target in targets)
+
+    def test_manifest(self, app_dir):
+        manifest = app_dir / "deploy.yml"
+        manifest.write_text("apps:\n  - alpha.py\n  - path: beta.py\n    mode: optimized\n    name: beta-prod\n")
+
+        targets = discover_targets(str(manifest))
+        assert targets[0] == DeployTarget(app_file=app_dir / "alpha.py", mode="minimum")
+        assert targets[1] == DeployTarget(app_file=app_dir / "beta.py", mode="optimized", app_name="beta-prod")
+
+    def test_invalid_manifest_entry(self, tmp_path):
+        manifest = tmp_path / "deploy.yml"
+        manifest.write_text("- mode: optimized\n")
+        with pytest.raises(ValueError):
+            load_manifest(manifest)
+
+
+@pytest.mark.asyncio
+class TestDeployMany:
+    """Test the bounded concurrent fan-out."""
+
+    async def test_concurrency_is_bounded(self, app_dir):
+        in_flight = 0
+        peak = 0
+
+        async def fake_deploy(self, config=None, skip_unchanged=False):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return DeploymentResult(success=True, url=f"https://ws--{self.app_file.stem}.modal.run")
+
+        targets = discover_targets(str(app_dir / "*.py"))
+        with patch.object(ModalDeployer, "deploy", fake_deploy):
+            items = await deploy_many(targets, concurrency=2)
+
+        assert peak == 2
+        assert [item.status for item in items] == ["deployed"] * 3
+        assert items[1].result.url == "https://ws--beta.modal.run"
+        assert all(item.elapsed is not None for item in items)
+
+    async def test_failures_and_skips_are_reported(self, app_dir):
+        async def fake_deploy(self, config=None, skip_unchanged=False):
+            if self.app_file.stem == "alpha":
+                raise RuntimeError("boom")
+            return DeploymentResult(success=True, skipped=self.app_file.stem == "beta")
+
+        updates = []
+        targets = discover_targets(str(app_dir / "*.py"))
+        with patch.object(ModalDeployer, "deploy", fake_deploy):
+            items = await deploy_many(targets, on_update=lambda items: updates.append([item.status for item in items]))
+
+        assert [item.status for item in items] == ["failed", "skipped", "deployed"]
+        assert items[0].result.error == "boom"
+        assert updates[-1] == ["failed", "skipped", "deployed"]
+
+
+def test_deploy_many_no_matches(tmp_path):
+    result = CliRunner().invoke(app, ["deploy-many", str(tmp_path / "*.py")])
+    assert result.exit_code == 1
+    assert "No app files matched" in result.stdout
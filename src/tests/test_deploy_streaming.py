@@ -0,0 +1,69 @@
+"""Tests for streaming `modal deploy` output."""
+
+import pytest
+
+from modal_for_noobs.modal_deploy import OUTPUT_BUFFER_LINES, ModalDeployer
+
+
+@pytest.fixture
+def deployer(tmp_path):
+    app_file = tmp_path / "stream_app.py"
+    app_file.write_text("import gradio as gr\n")
+    return ModalDeployer(app_file, mode="minimum")
+
+
+@pytest.fixture
+def deployment_file(tmp_path):
+    deployment_file = tmp_path / "modal_stream_app.py"
+    deployment_file.write_text("# deployment")
+    return deployment_file
+
+
+@pytest.mark.asyncio
+class TestStreamingDeploy:
+    """Test line-by-line handling of modal deploy output."""
+
+    async def test_url_arrives_before_process_exits(self, deployer, deployment_file, fake_modal_cli, tmp_path):
+        # The stub only finishes once the URL has been seen, which deadlocks if output is buffered
+        seen = tmp_path / "url-seen"
+        fake_modal_cli(
+            f"print('Building image...', flush=True)\n"
+            f"print('App ID: ap-42', flush=True)\n"
+            f"print('Created web function => https://ws--stream-app.modal.run', flush=True)\n"
+            f"deadline = time.time() + 5\n"
+            f"while not Path({str(seen)!r}).exists():\n"
+            f"    if time.time() > deadline:\n"
+            f"        sys.exit(3)\n"
+            f"    time.sleep(0.01)\n"
+            f"print('Deployed', flush=True)\n"
+        )
+        lines = []
+
+        def on_output(stream, line):
+            lines.append((stream, line))
+            if "modal.run" in line:
+                seen.touch()
+
+        deployer.on_output = on_output
+        result = await deployer.deploy_to_modal_async(deployment_file)
+
+        assert result.success
+        assert result.url == "https://ws--stream-app.modal.run"
+        assert result.app_id == "ap-42"
+        assert lines[0] == ("stdout", "Building image...")
+        assert lines[-1] == ("stdout", "Deployed")
+
+    async def test_output_is_capped(self, deployer, deployment_file, fake_modal_cli):
+        fake_modal_cli(
+            "for i in range(2000):\n"
+            "    print(f'line {i}')\n"
+            "    print(f'err {i}', file=sys.stderr)\n"
+            "sys.exit(1)\n"
+        )
+        result = await deployer.deploy_to_modal_async(deployment_file)
+
+        assert not result.success
+        assert len(result.output.splitlines()) == OUTPUT_BUFFER_LINES
+        assert result.output.splitlines()[-1] == "line 1999"
+        assert len(result.error.splitlines()) == OUTPUT_BUFFER_LINES
+        assert result.error.splitlines()[-1] == "err 1999"
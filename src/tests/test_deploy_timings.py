@@ -0,0 +1,67 @@
+"""Tests for per-phase deployment timings."""
+
+import json
+
+import pytest
+
+from modal_for_noobs.cli import _export_timings, _print_timings
+from modal_for_noobs.modal_deploy import DeploymentResult, ModalDeployer, PhaseSpan
+
+APP_CODE = """
+import gradio as gr
+
+demo = gr.Interface(fn=lambda name: name, inputs="text", outputs="text")
+"""
+
+
+@pytest.fixture
+def deployer(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODAL_TOKEN_ID", "ak-test")
+    monkeypatch.setenv("MODAL_TOKEN_SECRET", "as-test")
+    app_file = tmp_path / "timed_app.py"
+    app_file.write_text(APP_CODE)
+    return ModalDeployer(app_file, mode="minimum")
+
+
+@pytest.mark.asyncio
+class TestPhaseTimings:
+    """Test phase spans recorded by ModalDeployer.deploy."""
+
+    async def test_deploy_records_every_phase(self, deployer, fake_modal_cli):
+        fake_modal_cli("print('Building image')\nprint('https://ws--timed-app.modal.run')\nprint('Deployed')\n")
+        result = await deployer.deploy()
+
+        assert result.success
+        assert [phase.name for phase in result.phases] == ["validate", "auth", "secrets", "render", "write", "spawn", "build", "serve"]
+        starts = [phase.start for phase in result.phases]
+        assert starts == sorted(starts)
+        assert all(phase.duration >= 0 for phase in result.phases)
+        assert result.to_dict()["phases"][0]["name"] == "validate"
+
+    async def test_failed_build_has_no_serve_phase(self, deployer, fake_modal_cli):
+        fake_modal_cli("print('boom', file=sys.stderr)\nsys.exit(1)\n")
+        result = await deployer.deploy()
+
+        assert not result.success
+        assert [phase.name for phase in result.phases][-2:] == ["spawn", "build"]
+
+    async def test_phases_reset_between_deploys(self, deployer, fake_modal_cli):
+        fake_modal_cli("print('https://ws--timed-app.modal.run')\n")
+        await deployer.deploy()
+        result = await deployer.deploy()
+
+        assert [phase.name for phase in result.phases].count("validate") == 1
+
+
+def test_export_timings_appends_json_lines(tmp_path):
+    result = DeploymentResult(success=True, phases=[PhaseSpan("validate", 0.0, 0.5), PhaseSpan("build", 0.5, 2.0)])
+    path = tmp_path / "timings.jsonl"
+
+    _export_timings(result, path)
+    _export_timings(result, path)
+    _print_timings(result)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["total"] == 2.5
+    assert records[0]["phases"][1] == {"name": "build", "start": 0.5, "duration": 2.0}
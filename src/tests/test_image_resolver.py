@@ -0,0 +1,74 @@
+"""Tests for import-graph-driven minimal image resolution."""
+
+from modal_for_noobs.config_loader import config_loader
+from modal_for_noobs.image_resolver import distribution_name, find_local_modules, resolve_image_packages
+from modal_for_noobs.modal_deploy import DeploymentConfig, ModalDeployer
+
+OPTIMIZED = config_loader.load_base_packages()["optimized"]
+
+
+def write_app(tmp_path, source: str):
+    app_file = tmp_path / "app.py"
+    app_file.write_text(source)
+    return app_file
+
+
+def test_distribution_name():
+    assert distribution_name("torch>=2.0.0") == "torch"
+    assert distribution_name("fastapi[standard]") == "fastapi"
+    assert distribution_name("Flash_Attn") == "flash-attn"
+
+
+def test_drops_unused_heavy_packages(tmp_path):
+    app_file = write_app(tmp_path, "import gradio as gr\nimport numpy as np\n")
+    resolution = resolve_image_packages(app_file, "optimized", OPTIMIZED)
+
+    for package in ("vllm>=0.2.0", "flash-attn", "xformers", "bitsandbytes", "diffusers", "opencv-python"):
+        assert package in resolution.dropped
+        assert package not in resolution.packages
+    # The optimized template itself imports torch
+    assert "torch>=2.0.0" in resolution.packages
+    assert "numpy" in resolution.packages
+    assert "gradio" in resolution.packages
+    assert resolution.estimated_saved_mb > 1000
+
+
+def test_follows_local_modules(tmp_path):
+    app_file = write_app(tmp_path, "import gradio as gr\nimport pipeline\n")
+    (tmp_path / "pipeline.py").write_text("from helpers import load\nfrom transformers import pipeline\n")
+    (tmp_path / "helpers").mkdir()
+    (tmp_path / "helpers" / "__init__.py").write_text("import cv2\n")
+
+    resolution = resolve_image_packages(app_file, "optimized", OPTIMIZED)
+
+    assert "transformers>=4.30.0" in resolution.packages
+    assert "opencv-python" in resolution.packages
+    assert "pipeline" not in resolution.unknown_imports
+    assert [path.name for path in find_local_modules(app_file)] == ["__init__.py", "pipeline.py"]
+
+
+def test_adds_mapped_and_reports_unknown(tmp_path):
+    app_file = write_app(tmp_path, "import gradio as gr\nimport yaml\nimport sentence_transformers\nimport mystery_lib\n")
+    resolution = resolve_image_packages(app_file, "minimum", ["gradio", "fastapi[standard]"])
+
+    assert resolution.added == ["sentence-transformers", "pyyaml", "torch"]
+    assert resolution.unknown_imports == ["mystery_lib"]
+
+
+def test_requirements_cover_imports(tmp_path):
+    app_file = write_app(tmp_path, "import gradio as gr\nimport mystery_lib\nimport yaml\n")
+    resolution = resolve_image_packages(app_file, "minimum", ["gradio"], extra_packages=["mystery-lib", "PyYAML"])
+
+    assert resolution.added == []
+    assert resolution.unknown_imports == []
+
+
+def test_resolve_packages_honours_full_image(tmp_path):
+    app_file = write_app(tmp_path, "import gradio as gr\n")
+    deployer = ModalDeployer(app_file, mode="optimized", use_cache=False)
+
+    minimal = deployer._resolve_packages(DeploymentConfig(mode="optimized"), app_file, app_file.read_text())
+    full = deployer._resolve_packages(DeploymentConfig(mode="optimized", minimal_image=False), app_file, app_file.read_text())
+
+    assert "vllm>=0.2.0" not in minimal
+    assert full == OPTIMIZED
@@ -0,0 +1,56 @@
+"""Import-time budget for the CLI entry point."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative `python -X importtime` budget for `modal_for_noobs.cli`, in microseconds
+CLI_IMPORT_BUDGET_US = 600_000
+
+# Modules only specific commands need; importing the CLI must not load them
+HEAVY_MODULES = ("modal", "httpx", "huggingface_hub", "jinja2", "dotenv", "gradio")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Import ``module`` in a fresh interpreter and return cumulative import times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def cli_import_times() -> dict[str, int]:
+    return _import_times("modal_for_noobs.cli")
+
+
+@pytest.mark.parametrize("module", HEAVY_MODULES)
+def test_cli_import_skips_heavy_modules(cli_import_times, module):
+    assert module not in cli_import_times
+
+
+def test_cli_import_within_budget(cli_import_times):
+    elapsed = cli_import_times["modal_for_noobs.cli"]
+    assert elapsed <= CLI_IMPORT_BUDGET_US, f"importing modal_for_noobs.cli took {elapsed / 1000:.0f} ms"
+
+
+def test_lazy_attributes_resolve():
+    import modal_for_noobs
+    from modal_for_noobs import cli
+    from modal_for_noobs.modal_deploy import ModalDeployer
+
+    assert cli.ModalDeployer is ModalDeployer
+    assert modal_for_noobs.ModalDeployer is ModalDeployer
+    with pytest.raises(AttributeError):
+        _ = cli.NotAThing
@@ -0,0 +1,103 @@
+"""Tests for lockfile-pinned dependency resolution."""
+
+import os
+import re
+import sys
+
+import pytest
+
+from modal_for_noobs.lockfile import LockError, compile_lock, lock_path_for, read_lock
+from modal_for_noobs.modal_deploy import DeploymentConfig, ModalDeployer
+from modal_for_noobs.templates.deployment import get_image_config
+
+# Pins every requested name to 1.0 and counts its invocations
+FAKE_UV = """
+import re
+with Path(__file__).with_name("uv-calls").open("a") as calls:
+    calls.write(" ".join(sys.argv[1:]) + "\\n")
+names = {re.match(r"[A-Za-z0-9._-]+", line).group(0).lower() for line in sys.stdin if line.strip()}
+if "broken" in names:
+    print("No solution found", file=sys.stderr)
+    sys.exit(1)
+for name in sorted(names):
+    print(f"{name}==1.0")
+"""
+
+
+@pytest.fixture
+def fake_uv(tmp_path, monkeypatch):
+    """Put a stub ``uv`` first on PATH and return the file logging its calls."""
+    bin_dir = tmp_path / "uv-bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "uv"
+    stub.write_text(f"#!{sys.executable}\nimport sys\nfrom pathlib import Path\n{FAKE_UV}")
+    stub.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    return bin_dir / "uv-calls"
+
+
+def test_compile_lock_writes_and_reuses(tmp_path, fake_uv):
+    lock_file = tmp_path / "modal_app.lock"
+
+    pins = compile_lock(["gradio>=4", "numpy"], lock_file)
+    assert pins == ["gradio==1.0", "numpy==1.0"]
+    assert read_lock(lock_file) == pins
+
+    assert compile_lock(["numpy", "gradio>=4"], lock_file) == pins
+    assert len(fake_uv.read_text().splitlines()) == 1
+
+    compile_lock(["numpy"], lock_file)
+    assert len(fake_uv.read_text().splitlines()) == 2
+
+
+def test_wheelhouse_resolves_offline(tmp_path, fake_uv):
+    compile_lock(["numpy"], tmp_path / "app.lock", find_links=tmp_path / "wheels")
+    args = fake_uv.read_text()
+    assert f"--find-links {tmp_path / 'wheels'}" in args
+    assert "--no-index" in args
+    assert "--python-version 3.11" in args
+
+
+def test_failed_resolution_raises(tmp_path, fake_uv):
+    with pytest.raises(LockError, match="No solution found"):
+        compile_lock(["broken"], tmp_path / "app.lock")
+    assert not (tmp_path / "app.lock").exists()
+
+
+def test_missing_uv_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(LockError, match="uv is not installed"):
+        compile_lock(["numpy"], tmp_path / "app.lock")
+
+
+async def test_locked_deployment_uses_pins(tmp_path, fake_uv):
+    app_file = tmp_path / "app.py"
+    app_file.write_text("import gradio as gr\ndemo = gr.Interface(fn=str, inputs='text', outputs='text')\n")
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests>=2.31  # http client\n")
+    config = DeploymentConfig(mode="minimum", requirements_path=requirements, lock_dependencies=True)
+    deployer = ModalDeployer(app_file, use_cache=False)
+
+    content = (await deployer.create_modal_deployment_async(app_file, config)).read_text()
+
+    assert '"requests==1.0"' in content
+    assert ".uv_pip_install(" in content
+    assert ".pip_install(" not in content.replace(".uv_pip_install(", "")
+    assert content.count('extra_options="--no-deps"') == content.count(".uv_pip_install(")
+    assert "requests==1.0" in read_lock(lock_path_for(tmp_path / "modal_app.py"))
+
+
+@pytest.mark.parametrize("offline", [False, True])
+def test_every_locked_layer_installs_only_its_pins(tmp_path, offline):
+    # A lock's closure: torch's own dependencies and the core packages' are pinned too
+    pins = ["filelock==3.13.1", "gradio==4.44.0", "httpx==0.27.0", "nvidia-cublas-cu12==12.1.3.1", "torch==2.3.1"]
+
+    config = get_image_config("optimized", pins, installer="uv_pip_install", wheelhouse=tmp_path if offline else None)
+
+    layers = re.findall(r"\.uv_pip_install\((.*?)\n    \)", config, re.DOTALL)
+    assert len(layers) > 1
+    for layer in layers:
+        options = re.search(r'extra_options="([^"]*)"', layer).group(1).split()
+        assert "--no-deps" in options
+        assert ("--no-index" in options) is offline
+    assert ".pip_install(" not in config.replace(".uv_pip_install(", "")
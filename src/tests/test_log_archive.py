@@ -0,0 +1,138 @@
+"""Tests for the local log archive and `logs query`."""
+
+import io
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+from rich.console import Console
+from typer.testing import CliRunner
+
+from modal_for_noobs import log_archive as archive_module
+from modal_for_noobs.cli import app
+from modal_for_noobs.cli_helpers.logs_helper import LogPrinter, follow_logs
+from modal_for_noobs.log_archive import LogArchive, parse_time
+from modal_for_noobs.log_parser import LEVELS, line_level, split_timestamp
+
+CHAT_LOGS = [
+    '2026-03-01 05:00:00+00:00 INFO:     "GET / HTTP/1.1" 200 OK',
+    '2026-03-01 05:00:01+00:00 INFO:     "POST /api/predict HTTP/1.1" 503 Service Unavailable',
+    "2026-03-01 05:00:02+00:00 Traceback (most recent call last):",
+    '2026-03-01 05:00:02+00:00   File "app.py", line 3, in predict',
+    "2026-03-01 06:00:00+00:00 WARNING: model cache is cold",
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return LogArchive(tmp_path / "logs")
+
+
+def test_lines_are_indexed_by_time_and_level():
+    ts, text = split_timestamp(CHAT_LOGS[0])
+    assert ts == datetime(2026, 3, 1, 5, tzinfo=timezone.utc).timestamp()
+    assert text == 'INFO:     "GET / HTTP/1.1" 200 OK'
+    assert split_timestamp("no timestamp") == (None, "no timestamp")
+
+    assert line_level('"GET / HTTP/1.1" 503 Service Unavailable') == LEVELS["error"]
+    assert line_level('"GET /missing HTTP/1.1" 404') == LEVELS["warning"]
+    assert line_level("2026-03-01 | ERROR | boom") == LEVELS["error"]
+    assert line_level("Traceback (most recent call last):") == LEVELS["error"]
+    assert line_level("Model loaded") == LEVELS["info"]
+
+
+def test_relative_and_absolute_times():
+    now = datetime(2026, 3, 2, 5, tzinfo=timezone.utc)
+    assert parse_time("1d", now) == datetime(2026, 3, 1, 5, tzinfo=timezone.utc).timestamp()
+    assert parse_time("2026-03-01T05:00:00Z") == datetime(2026, 3, 1, 5, tzinfo=timezone.utc).timestamp()
+    with pytest.raises(ValueError, match="Invalid time"):
+        parse_time("yesterday")
+
+
+def test_query_by_time_level_and_text(archive):
+    assert archive.append("chat", CHAT_LOGS) == 5
+    archive.append("vision", ['2026-03-01 05:30:00+00:00 "GET /caption HTTP/1.1" 500 Internal Server Error'])
+
+    errors = archive.query(min_level=LEVELS["error"])
+    assert [(line.app, line.text) for line in errors] == [
+        ("chat", 'INFO:     "POST /api/predict HTTP/1.1" 503 Service Unavailable'),
+        ("chat", "Traceback (most recent call last):"),
+        ("chat", '  File "app.py", line 3, in predict'),
+        ("vision", '"GET /caption HTTP/1.1" 500 Internal Server Error'),
+    ]
+
+    since = parse_time("2026-03-01T05:00:01Z")
+    until = parse_time("2026-03-01T05:45:00Z")
+    assert [line.text for line in archive.query(["chat"], since=since, until=until)] == [
+        'INFO:     "POST /api/predict HTTP/1.1" 503 Service Unavailable',
+        "Traceback (most recent call last):",
+        '  File "app.py", line 3, in predict',
+    ]
+    assert [line.app for line in archive.query(text="HTTP/1.1 predict")] == ["chat"]
+    assert [line.text for line in archive.query(text="cache", limit=1)] == ["WARNING: model cache is cold"]
+    assert [(line.app, line.level) for line in archive.query(limit=2)] == [("vision", "error"), ("chat", "warning")]
+
+
+def test_refetched_lines_are_stored_once(archive):
+    archive.append("chat", CHAT_LOGS[:3])
+    assert archive.append("chat", CHAT_LOGS[1:]) == 2
+    assert archive.append("chat", CHAT_LOGS[2:]) == 0
+
+    chat = archive.open("chat")
+    assert chat.stats()["lines"] == 5
+    assert chat.stats()["segments"] == 2
+    chat.close()
+
+
+def test_segments_are_compressed(archive):
+    lines = [f'2026-03-01 05:{i // 60 % 60:02d}:{i % 60:02d}+00:00 INFO: "GET /health HTTP/1.1" 200 OK' for i in range(3000)]
+    with archive.writer("chat") as writer:
+        for line in lines:
+            writer.add(line)
+
+    chat = archive.open("chat")
+    stored = sum(len(data) for (data,) in chat._db.execute("SELECT data FROM segments"))
+    assert chat.stats()["segments"] == 3
+    assert stored * 10 < sum(len(line) for line in lines)
+    assert len(archive.query(text="health")) == 3000
+    chat.close()
+
+
+def test_text_search_without_fts5(archive, monkeypatch):
+    def no_fts(self):
+        return False
+
+    monkeypatch.setattr(archive_module.AppLogArchive, "_create_fts", no_fts)
+    archive.append("chat", CHAT_LOGS)
+
+    assert [line.text for line in archive.query(text="MODEL cold")] == ["WARNING: model cache is cold"]
+    with sqlite3.connect(next(archive.archive_dir.glob("*.sqlite3"))) as db:
+        assert db.execute("SELECT name FROM sqlite_master WHERE name = 'lines_fts'").fetchone() is None
+
+
+async def test_follow_archives_with_timestamps(fake_modal_cli, tmp_path, archive):
+    args_file = tmp_path / "args"
+    fake_modal_cli(f"Path({str(args_file)!r}).write_text(' '.join(sys.argv[1:]))\nfor line in {CHAT_LOGS!r}: print(line)\n")
+
+    with archive.writer("chat") as writer:
+        async with LogPrinter(Console(file=io.StringIO(), width=200, color_system=None)) as printer:
+            result = await follow_logs("chat", printer, writer)
+
+    assert result.ok
+    assert args_file.read_text() == "app logs chat --follow --timestamps"
+    assert writer.written == 5
+    assert len(archive.query(["chat"], min_level=LEVELS["warning"])) == 4
+
+
+def test_logs_query_command():
+    archive_module.log_archive.append("chat", CHAT_LOGS)
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["logs", "query", "503", "--app", "chat", "--level", "error", "--since", "2026-03-01T00:00:00Z"])
+    assert result.exit_code == 0
+    assert "503 Service Unavailable" in result.stdout
+    assert "Found 1 matching lines" in result.stdout
+
+    result = runner.invoke(app, ["logs", "query", "--level", "loud"])
+    assert result.exit_code == 1
+    assert "Unknown log level" in result.stdout
@@ -0,0 +1,93 @@
+"""Tests for parsing Modal log lines into records."""
+
+import json
+from datetime import datetime, timezone
+
+from typer.testing import CliRunner
+
+from modal_for_noobs import log_archive as archive_module
+from modal_for_noobs.cli import app
+from modal_for_noobs.log_parser import LEVELS, LogParser, format_record, level_number, parse_lines, parse_log_text
+
+FIVE_AM = datetime(2026, 3, 1, 5, tzinfo=timezone.utc).timestamp()
+
+
+def test_modal_prefixes_are_split_off():
+    record = LogParser().parse("2026-03-01 05:00:00+00:00 fu-abc123 fc-def456 ta-ghi789 Model loaded\n")
+
+    assert record.ts == FIVE_AM
+    assert (record.function_id, record.function_call_id, record.container_id) == ("fu-abc123", "fc-def456", "ta-ghi789")
+    assert record.text == record.message == "Model loaded"
+    assert record.level == "info"
+
+
+def test_loguru_text_and_access_logs():
+    parser = LogParser()
+
+    record = parser.parse("2026-03-01 05:00:00.250 | WARNING  | app.main:predict:42 - slow batch")
+    assert (record.level, record.function, record.message) == ("warning", "predict", "slow batch")
+    assert record.ts == FIVE_AM + 0.25 - datetime(2026, 3, 1, 5).astimezone().utcoffset().total_seconds()
+
+    record = parser.parse('INFO:     "POST /api/predict HTTP/1.1" 503 Service Unavailable')
+    assert record.level == "error"
+    assert record.message == '"POST /api/predict HTTP/1.1" 503 Service Unavailable'
+
+
+def test_json_lines():
+    parser = LogParser()
+    serialized = {
+        "text": "boom\n",
+        "record": {"message": "boom", "level": {"name": "ERROR", "no": 40}, "function": "predict", "time": {"timestamp": FIVE_AM}},
+    }
+
+    record = parser.parse(json.dumps(serialized))
+    assert (record.level, record.message, record.function, record.ts) == ("error", "boom", "predict", FIVE_AM)
+    assert record.payload == serialized
+
+    record = parser.parse('{"msg": "cache warm", "severity": "WARN"}')
+    assert (record.level, record.message) == ("warning", "cache warm")
+    assert record.ts == FIVE_AM
+    assert parser.parse("{not json").payload is None
+
+
+def test_tracebacks_are_errors_and_inherit_timestamps():
+    records = list(
+        parse_log_text(
+            "2026-03-01 05:00:00+00:00 Traceback (most recent call last):\n"
+            '  File "app.py", line 3, in predict\n'
+            "ValueError: boom\n"
+            "\n"
+            "Model loaded\n"
+        )
+    )
+
+    assert [record.level for record in records] == ["error", "error", "error", "info"]
+    assert records[1].text == '  File "app.py", line 3, in predict'
+    assert {record.ts for record in records} == {FIVE_AM}
+
+
+def test_records_are_parsed_lazily():
+    def lines():
+        yield "2026-03-01 05:00:00+00:00 ERROR: first"
+        raise AssertionError("read past the first record")
+
+    assert next(parse_lines(lines())).level_no == LEVELS["error"]
+    assert level_number("WARN") == LEVELS["warning"]
+
+
+def test_format_record():
+    record = LogParser().parse("2026-03-01 05:00:00+00:00 WARNING: model cache is cold")
+    clock = datetime.fromtimestamp(FIVE_AM).strftime("%H:%M:%S")
+
+    assert format_record(record) == f"{clock} WARNING  WARNING: model cache is cold"
+    assert format_record(LogParser().parse("no time")) == "--:--:-- INFO     no time"
+
+
+def test_logs_query_json_export():
+    archive_module.log_archive.append("chat", ["2026-03-01 05:00:00+00:00 ta-ghi789 ERROR: boom"])
+
+    result = CliRunner().invoke(app, ["logs", "query", "--app", "chat", "--json"])
+    assert result.exit_code == 0
+    exported = json.loads(result.stdout)
+    assert exported["app"] == "chat"
+    assert (exported["level"], exported["ts"], exported["message"]) == ("error", FIVE_AM, "boom")
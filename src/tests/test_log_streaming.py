@@ -0,0 +1,222 @@
+"""Tests for streaming `milk-logs` output through bounded buffers, for one app or several."""
+
+import asyncio
+import io
+import os
+import weakref
+
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+from typer.testing import CliRunner
+
+from modal_for_noobs import subprocess_runner
+from modal_for_noobs.cli import app
+from modal_for_noobs.cli_helpers import logs_helper
+from modal_for_noobs.cli_helpers.logs_helper import (
+    LogPrinter,
+    MergedLogPrinter,
+    fetch_log_tail,
+    fetch_merged_tails,
+    follow_logs,
+    follow_many_logs,
+    make_line_filter,
+)
+from modal_for_noobs.log_parser import LEVELS, LogParser
+
+# `modal app logs --timestamps` output of two apps; the script prints the lines of the app it is asked for
+FLEET_LOGS = {
+    "chat": [
+        "2026-03-01 05:00:00+00:00 INFO: chat ready",
+        '2026-03-01 05:00:03+00:00 INFO: "POST /api/predict HTTP/1.1" 500 Internal Server Error',
+    ],
+    "vision": [
+        "2026-03-01 05:00:01+00:00 INFO: vision ready",
+        "2026-03-01 05:00:02+00:00 ERROR: out of GPU memory",
+        "Traceback (most recent call last):",
+    ],
+}
+FLEET_SCRIPT = f"for line in {FLEET_LOGS!r}[sys.argv[3]]: print(line, flush=True)\n"
+
+
+class CountingConsole(Console):
+    """Console that counts its writes."""
+
+    def __init__(self):
+        super().__init__(file=io.StringIO(), width=200, color_system=None)
+        self.writes = 0
+
+    def print(self, *args, **kwargs):
+        self.writes += 1
+        super().print(*args, **kwargs)
+
+
+async def test_tail_keeps_only_the_last_lines(fake_modal_cli, tmp_path):
+    args_file = tmp_path / "args"
+    fake_modal_cli(f"Path({str(args_file)!r}).write_text(' '.join(sys.argv[1:]))\nfor i in range(10_000): print(f'line {{i}}')\n")
+
+    result, lines = await fetch_log_tail("chat", 3)
+
+    assert result.ok
+    assert lines == ["line 9997", "line 9998", "line 9999"]
+    assert args_file.read_text() == "app logs chat --tail 3"
+
+
+async def test_tail_reports_modal_errors(fake_modal_cli):
+    fake_modal_cli("print('No App with name chat found', file=sys.stderr)\nsys.exit(1)\n")
+
+    result, lines = await fetch_log_tail("chat", 10)
+
+    assert not result.ok
+    assert lines == []
+    assert result.error == "No App with name chat found"
+
+
+async def test_follow_prints_lines_in_batches(fake_modal_cli, monkeypatch):
+    monkeypatch.setattr(logs_helper, "RENDER_INTERVAL", 0.01)
+    fake_modal_cli("for i in range(5000): print(f'line {i} [red]not markup[/red]')\n")
+    console = CountingConsole()
+
+    async with LogPrinter(console) as printer:
+        result = await follow_logs("chat", printer)
+
+    output = console.file.getvalue()
+    assert result.ok
+    assert printer.printed == 5000
+    assert console.writes < 100
+    assert "🥛 line 4999 [red]not markup[/red]" in output
+
+
+async def test_full_buffer_blocks_reading():
+    printer = LogPrinter(CountingConsole(), buffer_size=2)
+    await printer.put("one")
+    await printer.put("two")
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(printer.put("three"), timeout=0.05)
+
+
+async def test_cancelling_follow_kills_modal(fake_modal_cli, tmp_path):
+    pid_file = tmp_path / "pid"
+    fake_modal_cli(f"import os\nPath({str(pid_file)!r}).write_text(str(os.getpid()))\nprint('ready', flush=True)\ntime.sleep(30)\n")
+    console = CountingConsole()
+
+    async def follow():
+        async with LogPrinter(console) as printer:
+            await follow_logs("chat", printer)
+
+    task = asyncio.create_task(follow())
+    while not pid_file.exists() or not pid_file.read_text():
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert "🥛 ready" in console.file.getvalue()
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+async def test_following_more_apps_than_the_command_cap(fake_modal_cli, tmp_path, monkeypatch):
+    monkeypatch.setattr(subprocess_runner.runner, "max_concurrency", 2)
+    monkeypatch.setattr(subprocess_runner.runner, "_semaphores", weakref.WeakKeyDictionary())
+    started = tmp_path / "started"
+    started.mkdir()
+    fake_modal_cli(
+        f"Path({str(started)!r}, sys.argv[3] if '--follow' in sys.argv else sys.argv[2]).touch()\n"
+        "if '--follow' in sys.argv: time.sleep(30)\n"
+    )
+    apps = ["chat", "vision", "audio"]
+
+    async with MergedLogPrinter(CountingConsole(), apps) as printer:
+        task = asyncio.create_task(follow_many_logs(printer))
+        async with asyncio.timeout(10):
+            while len(list(started.iterdir())) < len(apps):
+                await asyncio.sleep(0.05)
+            # Follows leave the command slots free for short commands
+            assert (await subprocess_runner.run_modal("app", "list", timeout=5)).ok
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert sorted(path.name for path in started.iterdir()) == ["audio", "chat", "list", "vision"]
+
+
+async def test_merged_lines_are_reordered_within_the_window(monkeypatch):
+    monkeypatch.setattr(logs_helper, "RENDER_INTERVAL", 0.01)
+    console = CountingConsole()
+
+    async with MergedLogPrinter(console, ["chat", "vision"], window=0.2) as printer:
+        await printer.put("vision", FLEET_LOGS["vision"][0])
+        await asyncio.sleep(0.05)
+        await printer.put("chat", FLEET_LOGS["chat"][0])
+
+    output = console.file.getvalue().splitlines()
+    assert [line.split()[0] for line in output] == ["chat", "vision"]
+    assert output[0].endswith("│ INFO: chat ready")
+    assert printer.printed == 2
+
+
+async def test_filters_apply_before_queueing():
+    printer = MergedLogPrinter(CountingConsole(), ["chat", "vision"], buffer_size=1, line_filter=make_line_filter(min_level=LEVELS["error"]))
+
+    # Filtered lines never take a buffer slot
+    await asyncio.wait_for(printer.put("chat", FLEET_LOGS["chat"][0]), timeout=0.05)
+    await asyncio.wait_for(printer.put("vision", FLEET_LOGS["vision"][0]), timeout=0.05)
+    await printer.put("vision", FLEET_LOGS["vision"][1])
+
+    assert printer.streams["chat"].filtered == 1
+    assert printer.streams["vision"].filtered == 1
+    assert printer.streams["vision"].lines == 1
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(printer.put("chat", FLEET_LOGS["chat"][1]), timeout=0.05)
+
+
+async def test_fetch_merges_apps_by_timestamp(fake_modal_cli):
+    fake_modal_cli(FLEET_SCRIPT)
+
+    merged = await fetch_merged_tails(["chat", "vision"], 10, make_line_filter(pattern="ready|Error|Traceback"))
+
+    assert all(result.ok for result in merged.results.values())
+    assert [(app_name, line) for _, app_name, line in merged.entries] == [
+        ("chat", "INFO: chat ready"),
+        ("vision", "INFO: vision ready"),
+        ("vision", "Traceback (most recent call last):"),
+        ("chat", 'INFO: "POST /api/predict HTTP/1.1" 500 Internal Server Error'),
+    ]
+    assert merged.streams["vision"].filtered == 1
+    assert merged.streams["vision"].rate == 3.0
+    assert merged.raw["chat"] == FLEET_LOGS["chat"]
+
+
+async def test_follow_many_runs_one_modal_per_app(fake_modal_cli):
+    fake_modal_cli(FLEET_SCRIPT)
+    console = CountingConsole()
+
+    # A window longer than the test holds every line until the ordered flush on exit
+    async with MergedLogPrinter(console, ["chat", "vision"], window=60) as printer:
+        results = await follow_many_logs(printer)
+
+    assert set(results) == {"chat", "vision"}
+    assert all(result.ok for result in results.values())
+    assert printer.printed == 5
+    # Ordered by timestamp, not by which process printed first
+    assert [line.split()[0] for line in console.file.getvalue().splitlines()] == ["chat", "vision", "vision", "vision", "chat"]
+
+
+@patch("modal_for_noobs.cli._milk_many_logs_async")
+def test_several_apps_use_the_merged_view(mock_milk):
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["milk-logs", "chat", "vision", "--follow", "--level", "error"])
+    assert result.exit_code == 0
+    apps, follow, lines, line_filter, *_ = mock_milk.call_args.args
+    assert (apps, follow, lines) == (["chat", "vision"], True, 100)
+    assert not line_filter(LogParser().parse("INFO: ready"))
+    assert line_filter(LogParser().parse('"GET / HTTP/1.1" 502'))
+
+    result = runner.invoke(app, ["milk-logs", "chat", "--grep", "("])
+    assert result.exit_code == 1
+    assert "Invalid log filter" in result.stdout
@@ -0,0 +1,128 @@
+"""Tests for the Modal backends behind ModalAPI."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from modal_for_noobs import modal_backends
+from modal_for_noobs.modal_backends import CliBackend, FakeBackend, ModalBackendError, SdkBackend, create_backend
+from modal_for_noobs.modal_deploy import ModalAPI
+from modal_for_noobs.modal_listings import AppInfo, SecretInfo
+
+APPS = [
+    {"app_id": "ap-1", "description": "chat", "state": "deployed", "tasks": "1"},
+    {"app_id": "ap-2", "description": "vision", "state": "stopped", "tasks": "0"},
+]
+
+
+def test_backend_selected_by_environment(monkeypatch):
+    assert isinstance(create_backend(), FakeBackend)
+    monkeypatch.setenv("MODAL_FOR_NOOBS_BACKEND", "cli")
+    assert isinstance(ModalAPI().backend, CliBackend)
+    monkeypatch.delenv("MODAL_FOR_NOOBS_BACKEND")
+    assert isinstance(create_backend(), SdkBackend)
+    with pytest.raises(ValueError):
+        create_backend("grpc")
+
+
+@pytest.mark.parametrize("error", [ImportError("No module named 'modal'"), AttributeError("_Secret has no attribute 'objects'")])
+def test_sdk_falls_back_to_cli_when_it_cannot_bind(monkeypatch, error):
+    def unavailable():
+        raise error
+
+    monkeypatch.setattr(modal_backends, "_sdk_calls", unavailable)
+    assert isinstance(create_backend("sdk"), CliBackend)
+
+
+async def test_modal_api_on_fake_backend():
+    backend = FakeBackend(APPS, logs={"chat": ["one", "two", "three"]})
+    api = ModalAPI(backend=backend)
+
+    assert [app.name for app in await api.list_deployments()] == ["chat", "vision"]
+    assert await api.get_app_logs("ap-1", lines=2) == "two\nthree"
+    assert [record.text for record in await api.get_app_log_records("chat", lines=2)] == ["two", "three"]
+    assert await api.kill_deployment("chat") is True
+    assert backend.apps[0]["state"] == "stopped"
+    assert await api.kill_deployment("missing") is False
+    assert await api.create_secret("keys", "TOKEN=abc REGION=eu") is True
+    assert await api.create_secret("keys", "TOKEN=abc") is False
+    assert await api.create_secret("broken", "TOKEN") is False
+    assert await api.list_secrets() == ["keys"]
+    assert backend.secrets["keys"] == {"TOKEN": "abc", "REGION": "eu"}
+    await api.close()
+
+
+async def test_cli_backend_parses_json_and_text(fake_modal_cli, tmp_path):
+    output = tmp_path / "output"
+    fake_modal_cli(f"print(Path({str(output)!r}).read_text())\n")
+    backend = CliBackend()
+
+    output.write_text(json.dumps(APPS))
+    assert await backend.list_apps() == [
+        AppInfo(app_id="ap-1", name="chat", state="deployed", tasks=1),
+        AppInfo(app_id="ap-2", name="vision", state="stopped", tasks=0),
+    ]
+
+    output.write_text("App  State  Created\nchat deployed 2024-01-01 https://ws--chat.modal.run\n")
+    assert await backend.list_apps() == [
+        AppInfo(app_id="chat", name="chat", state="deployed", created_at="2024-01-01", url="https://ws--chat.modal.run")
+    ]
+
+    output.write_text(json.dumps([{"name": "hf-token", "created_at": None, "created_by": "alice", "last_used_at": None}]))
+    assert await backend.list_secrets() == [SecretInfo(name="hf-token", created_by="alice")]
+
+
+async def test_cli_backend_reads_details_from_logs(fake_modal_cli):
+    fake_modal_cli(
+        "print('2024-01-01T10:00:00 App starting on T4 GPU')\n"
+        "print('2024-01-01T10:01:00 App available at https://test-app.modal.run')\n"
+    )
+
+    assert await CliBackend().app_details("test-app") == {"url": "https://test-app.modal.run", "gpu_type": "T4"}
+
+
+async def test_cli_backend_raises_modal_errors(fake_modal_cli):
+    fake_modal_cli("print('No App with name chat found', file=sys.stderr)\nsys.exit(1)\n")
+
+    with pytest.raises(ModalBackendError, match="No App with name chat found"):
+        await CliBackend().stop_app("chat")
+
+
+async def test_sdk_backend_wraps_client_errors(monkeypatch):
+    async def failing(*args):
+        raise ConnectionError("Could not connect to the Modal server.")
+
+    calls = SimpleNamespace(list_apps=SimpleNamespace(aio=failing))
+    monkeypatch.setattr(modal_backends, "_sdk_calls", lambda: calls)
+
+    with pytest.raises(ModalBackendError, match="Could not connect"):
+        await SdkBackend().list_apps()
+    assert await ModalAPI(backend=SdkBackend()).list_deployments() == []
+
+
+def test_sdk_calls_bind_to_installed_modal():
+    calls = modal_backends._sdk_calls()
+
+    for name in ("list_apps", "stop_app", "app_logs", "app_details", "create_secret", "list_secrets"):
+        assert callable(getattr(calls, name).aio)
+
+
+def test_gpu_comes_from_the_function_definition():
+    api_pb2 = pytest.importorskip("modal_proto.api_pb2")
+
+    def definition(*gpus):
+        return api_pb2.FunctionData(
+            ranked_functions=[
+                api_pb2.FunctionData.RankedFunction(
+                    rank=rank,
+                    function=api_pb2.Function(resources=api_pb2.Resources(gpu_config=api_pb2.GPUConfig(gpu_type=gpu, count=count))),
+                )
+                for rank, (gpu, count) in enumerate(gpus)
+            ]
+        )
+
+    assert modal_backends.function_gpu(definition(("A100-80GB", 1), ("T4", 1))) == "A100-80GB"
+    assert modal_backends.function_gpu(definition(("H100", 2))) == "H100:2"
+    assert modal_backends.function_gpu(definition(("", 0))) is None
+    assert modal_backends.function_gpu(definition()) is None
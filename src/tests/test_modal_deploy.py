@@ -1,6 +1,7 @@
 """Tests for Modal deployment functionality."""
 
 import asyncio
+import importlib.resources
 import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -8,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from modal_for_noobs.modal_deploy import DeploymentConfig, ModalDeployer
+from modal_for_noobs.templates.deployment import DASHBOARD_FILE
 
 
 @pytest.fixture
@@ -318,6 +320,81 @@ class TestDeploymentTemplates:
         assert "try:" in content or "except" in content or "if demo is None:" in content
         assert "queue" in content  # Should enable queuing for stability
 
+    @pytest.mark.asyncio
+    async def test_image_dashboard_runtime(self, sample_gradio_app):
+        """Test the image dashboard runtime replaces the embedded module."""
+        embedded_config = DeploymentConfig(mode="minimum", app_name="runtime-test")
+        image_config = DeploymentConfig(mode="minimum", app_name="runtime-test", dashboard_runtime="image")
+        deployer = ModalDeployer(sample_gradio_app, use_cache=False)
+
+        embedded = (await deployer.create_modal_deployment_async(sample_gradio_app, embedded_config)).read_text()
+        image = (await deployer.create_modal_deployment_async(sample_gradio_app, image_config)).read_text()
+
+        assert "dashboard_module_encoded" in embedded
+        assert "dashboard_module_encoded" not in image
+        assert "image = image.add_local_file(dashboard_runtime_path, remote_path='/root/dashboard.py', copy=True)" in image
+        # Found through the installed package, not this machine's path
+        assert str(DASHBOARD_FILE) not in image
+        assert importlib.resources.files("modal_for_noobs.templates").joinpath("dashboard.py").is_file()
+        assert image.index("add_local_file") < image.index("@app.function(")
+        assert len(image) < len(embedded) / 2
+        compile(image, "modal_app.py", "exec")
+
+    @pytest.mark.asyncio
+    async def test_image_dashboard_runtime_needs_standard_template(self, sample_gradio_app):
+        """Test the enhanced template rejects the image dashboard runtime it cannot honor."""
+        config = DeploymentConfig(mode="minimum", gpu_type="T4", dashboard_runtime="image")
+        deployer = ModalDeployer(sample_gradio_app, use_cache=False)
+
+        with pytest.raises(ValueError, match="'image' dashboard runtime is not supported"):
+            await deployer.create_modal_deployment_async(sample_gradio_app, config)
+
+    def test_unknown_dashboard_runtime(self, sample_gradio_app):
+        """Test an unknown dashboard runtime is rejected."""
+        from modal_for_noobs.templates.deployment import generate_modal_deployment
+
+        with pytest.raises(ValueError, match="Unknown dashboard runtime"):
+            generate_modal_deployment(sample_gradio_app, sample_gradio_app.read_text(), dashboard_runtime="wheel")
+
+    @pytest.mark.parametrize("dashboard_runtime", ["embedded", "image"])
+    def test_marimo_template_renders(self, sample_gradio_app, dashboard_runtime):
+        """Test the marimo template fills every field and renders valid Python."""
+        from modal_for_noobs.templates.deployment import generate_modal_deployment
+
+        content = generate_modal_deployment(
+            sample_gradio_app, sample_gradio_app.read_text(), deployment_mode="marimo", dashboard_runtime=dashboard_runtime
+        )
+
+        assert "import modal\n" in content
+        assert "start_marimo_server" in content
+        assert "scaledown_window=1200" in content
+        compile(content, "modal_app.py", "exec")
+
+    def test_image_layers_are_ordered_and_sorted(self):
+        """Test heavy, core, system and user packages land in stable layers."""
+        from modal_for_noobs.templates.deployment import image_layers
+
+        layers = image_layers("optimized", ["zeta", "gradio", "torch>=2.0.0", "aardvark", "uvicorn"], ["git", "ffmpeg"])
+
+        assert layers == [
+            ("pip", ["torch>=2.0.0"]),
+            ("pip", ["gradio", "uvicorn"]),
+            ("apt", ["ffmpeg", "git"]),
+            ("pip", ["aardvark", "zeta"]),
+        ]
+
+    def test_user_packages_do_not_change_base_layers(self):
+        """Test changing an app package only changes the last layer."""
+        from modal_for_noobs.templates.deployment import get_image_config
+
+        first = get_image_config("optimized", ["gradio", "torch>=2.0.0", "requests"], ["ffmpeg"])
+        second = get_image_config("optimized", ["requests", "torch>=2.0.0", "gradio", "tqdm"], ["ffmpeg"])
+
+        prefix = first[: first.index('"requests"')]
+        assert second.startswith(prefix)
+        assert first.count(".pip_install(") == 3
+        compile(first, "image.py", "exec")
+
 
 class TestAsyncOperations:
     """Test async deployment operations."""
@@ -0,0 +1,60 @@
+"""Tests for parsing modal CLI listings, against captured CLI output."""
+
+from pathlib import Path
+
+import pytest
+
+from modal_for_noobs.modal_listings import AppInfo, SecretInfo, app_from_row, parse_apps, parse_secrets, parse_table
+
+CORPUS = Path(__file__).parent / "resources" / "modal_cli"
+
+APPS = [
+    AppInfo("ap-Xk2Lq9sT4vB8nM1cR7yW3e", "chat-bot", "deployed", 2, "2025-03-14 09:26:53+00:00"),
+    AppInfo("ap-Pq7Zt1Hc5mN9bV3xK8dJ2a", "image caption with a long description", "deployed", 0, "2025-03-12 17:02:11+00:00"),
+    AppInfo(
+        "ap-Ry4Fs6Gt8Hu0Ji2Kl4Mn6o", "whisper-transcribe", "stopped", 0, "2025-02-28 11:45:00+00:00", "2025-03-01 08:00:12+00:00"
+    ),
+    AppInfo("ap-Ab1Cd2Ef3Gh4Ij5Kl6Mn7p", "ephemeral run", "ephemeral (detached)", 1, "2025-03-14 10:01:42+00:00"),
+]
+
+
+@pytest.mark.parametrize("capture", ["app_list.json", "app_list_wide.txt", "app_list_narrow.txt"])
+def test_app_listings_agree(capture):
+    assert parse_apps((CORPUS / capture).read_text()) == APPS
+
+
+def test_legacy_and_empty_app_listings():
+    assert parse_apps((CORPUS / "app_list_legacy.txt").read_text()) == [
+        AppInfo("chat-bot", "chat-bot", "deployed", created_at="2025-03-14", url="https://ws--chat-bot.modal.run"),
+        AppInfo("whisper-transcribe", "whisper-transcribe", "stopped", created_at="2025-02-28"),
+    ]
+    assert parse_apps((CORPUS / "app_list_empty.txt").read_text()) == []
+    assert parse_apps("") == []
+
+
+@pytest.mark.parametrize("capture", ["secret_list.json", "secret_list.txt"])
+def test_secret_listings_agree(capture):
+    assert parse_secrets((CORPUS / capture).read_text()) == [
+        SecretInfo("hf-token", "2025-01-02 10:00:00+00:00", "alice", "2025-03-14 09:26:53+00:00"),
+        SecretInfo("openai key", "2025-02-11 15:30:00+00:00", "bob"),
+    ]
+
+
+def test_wrapped_header_is_joined():
+    assert list(parse_table((CORPUS / "app_list_narrow.txt").read_text())[0]) == [
+        "App ID",
+        "Description",
+        "State",
+        "Tasks",
+        "Created at",
+        "Stopped at",
+    ]
+
+
+def test_app_rows_accept_display_names():
+    app = app_from_row({"App ID": "ap-1", "Description": "chat", "State": "stopping"})
+
+    assert app == AppInfo("ap-1", "chat", "stopping")
+    assert not app.is_live
+    assert app.matches("chat") and app.matches("ap-1")
+    assert app_from_row({"State": "deployed"}) is None
@@ -0,0 +1,182 @@
+"""Tests for the content-addressed deployment render cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from modal_for_noobs.modal_deploy import DeploymentConfig, ModalDeployer
+from modal_for_noobs.render_cache import RenderCache, atomic_write_text, compute_render_key, template_version
+
+APP_CODE = """
+import gradio as gr
+
+def greet(name):
+    return f"Hello {name}!"
+
+demo = gr.Interface(fn=greet, inputs="text", outputs="text")
+"""
+
+
+@pytest.fixture
+def app_file(tmp_path):
+    app_file = tmp_path / "cached_app.py"
+    app_file.write_text(APP_CODE)
+    return app_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(tmp_path / "render")
+
+
+class TestRenderKey:
+    """Test render key computation."""
+
+    def test_key_is_stable(self):
+        config = DeploymentConfig(app_name="cached_app").to_dict()
+        key1 = compute_render_key(APP_CODE, config, "cached_app.py")
+        key2 = compute_render_key(APP_CODE, dict(reversed(list(config.items()))), "cached_app.py")
+        assert key1 == key2
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"code": APP_CODE + "\n# changed"},
+            {"config": DeploymentConfig(app_name="cached_app", timeout_minutes=5).to_dict()},
+            {"app_name": "other_app.py"},
+        ],
+    )
+    def test_any_input_changes_key(self, change):
+        base = {
+            "code": APP_CODE,
+            "config": DeploymentConfig(app_name="cached_app").to_dict(),
+            "app_name": "cached_app.py",
+        }
+        changed = {**base, **change}
+        assert compute_render_key(*base.values()) != compute_render_key(*changed.values())
+
+    def test_input_file_contents_change_key(self, tmp_path):
+        requirements = tmp_path / "requirements.txt"
+        requirements.write_text("numpy\n")
+        config = DeploymentConfig(app_name="cached_app").to_dict()
+        key = compute_render_key(APP_CODE, config, "cached_app.py", [requirements])
+
+        requirements.write_text("numpy\npandas\n")
+        assert compute_render_key(APP_CODE, config, "cached_app.py", [requirements]) != key
+
+        requirements.unlink()
+        assert compute_render_key(APP_CODE, config, "cached_app.py", [requirements]) != key
+
+    def test_template_version_covers_deployer_and_package_version(self):
+        template_version.cache_clear()
+        version = template_version()
+        template_version.cache_clear()
+        with patch("modal_for_noobs.__version__", "0.0.0-test"):
+            assert template_version() != version
+        template_version.cache_clear()
+
+
+class TestRenderCache:
+    """Test the cache store and file index."""
+
+    def test_lookup_miss_then_hit(self, cache):
+        assert cache.lookup("ab" * 32) is None
+        cache.store("ab" * 32, "rendered")
+        assert cache.lookup("ab" * 32) == "rendered"
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_is_current_tracks_file_changes(self, cache, tmp_path):
+        deployment_file = tmp_path / "modal_app.py"
+        deployment_file.write_text("rendered")
+        cache.record(deployment_file, "key")
+
+        assert cache.is_current(deployment_file, "key")
+        assert not cache.is_current(deployment_file, "other-key")
+
+        deployment_file.write_text("edited by hand")
+        assert not cache.is_current(deployment_file, "key")
+
+    def test_clear(self, cache, tmp_path):
+        cache.store("cd" * 32, "rendered")
+        assert cache.clear() == 1
+        assert cache.lookup("cd" * 32) is None
+
+
+@pytest.mark.asyncio
+class TestDeployerRenderCache:
+    """Test render cache integration in ModalDeployer."""
+
+    async def test_second_render_skips_template_and_write(self, app_file, cache):
+        deployer = ModalDeployer(app_file, mode="minimum", render_cache=cache)
+
+        deployment_file = await deployer.create_modal_deployment_async(app_file)
+        assert deployer.last_render_cache_hit is False
+        first_content = deployment_file.read_text()
+        first_mtime = deployment_file.stat().st_mtime_ns
+
+        with (
+            patch.object(deployer, "_generate_enhanced_deployment") as mock_render,
+            patch.object(deployer, "_resolve_packages") as mock_resolve,
+        ):
+            await deployer.create_modal_deployment_async(app_file)
+            mock_render.assert_not_called()
+            mock_resolve.assert_not_called()
+
+        assert deployer.last_render_cache_hit is True
+        assert deployment_file.stat().st_mtime_ns == first_mtime
+        assert deployment_file.read_text() == first_content
+
+    async def test_deleted_file_is_restored_from_cache(self, app_file, cache):
+        deployer = ModalDeployer(app_file, mode="minimum", render_cache=cache)
+        deployment_file = await deployer.create_modal_deployment_async(app_file)
+        content = deployment_file.read_text()
+        deployment_file.unlink()
+
+        with patch.object(deployer, "_generate_enhanced_deployment") as mock_render:
+            await deployer.create_modal_deployment_async(app_file)
+            mock_render.assert_not_called()
+
+        assert deployer.last_render_cache_hit is True
+        assert deployment_file.read_text() == content
+
+    async def test_source_change_rerenders(self, app_file, cache):
+        deployer = ModalDeployer(app_file, mode="minimum", render_cache=cache)
+        await deployer.create_modal_deployment_async(app_file)
+
+        app_file.write_text(APP_CODE + "\nEXTRA = 1\n")
+        deployment_file = await deployer.create_modal_deployment_async(app_file)
+
+        assert deployer.last_render_cache_hit is False
+        assert "EXTRA = 1" in deployment_file.read_text()
+
+    async def test_requirements_change_rerenders(self, app_file, cache, tmp_path):
+        requirements = tmp_path / "requirements.txt"
+        requirements.write_text("numpy\n")
+        config = DeploymentConfig(app_name="cached_app", requirements_path=requirements)
+        deployer = ModalDeployer(app_file, mode="minimum", config=config, render_cache=cache)
+        await deployer.create_modal_deployment_async(app_file)
+
+        requirements.write_text("numpy\nscipy\n")
+        deployment_file = await deployer.create_modal_deployment_async(app_file)
+
+        assert deployer.last_render_cache_hit is False
+        assert "scipy" in deployment_file.read_text()
+
+    async def test_cache_disabled(self, app_file):
+        deployer = ModalDeployer(app_file, mode="minimum", use_cache=False)
+        deployment_file = await deployer.create_modal_deployment_async(app_file)
+
+        assert deployment_file.exists()
+        assert deployer.last_render_cache_hit is None
+
+
+def test_concurrent_writes_to_one_file_from_threads(tmp_path):
+    target = tmp_path / "modal_app.py"
+    contents = [f"# render {i}\n" + "x = 1\n" * 20_000 for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda content: atomic_write_text(target, content), contents * 4))
+
+    assert target.read_text() in contents
+    assert [path.name for path in tmp_path.iterdir()] == ["modal_app.py"]
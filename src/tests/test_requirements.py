@@ -0,0 +1,66 @@
+"""Tests for the shared requirements model."""
+
+from modal_for_noobs.modal_deploy import DeploymentConfig, ModalDeployer
+from modal_for_noobs.requirements import RequirementSet, read_requirements
+
+REQUIREMENTS = """\
+# Serving
+-r base.txt
+--index-url https://example.org/simple
+torch>=2.0  # inline comment
+torchvision==0.16 ; sys_platform == "linux"
+pywin32 ; sys_platform == "win32"
+fastapi[standard]>=0.100
+FastAPI[all]
+numpy<2 \\
+    --hash=sha256:abc
+git+https://github.com/org/repo.git@v1#egg=mylib
+-e git+https://github.com/org/other.git#egg=Other_Lib
+-e .
+"""
+
+
+def write_requirements(tmp_path):
+    (tmp_path / "base.txt").write_text("numpy>=1.24\n-r requirements.txt\n")
+    path = tmp_path / "requirements.txt"
+    path.write_text(REQUIREMENTS)
+    return path
+
+
+def test_parses_requirement_file(tmp_path):
+    requirements = read_requirements(write_requirements(tmp_path))
+
+    assert requirements.to_list() == [
+        "numpy<2,>=1.24",
+        "torch>=2.0",
+        "torchvision==0.16",
+        "fastapi[all,standard]>=0.100",
+        "mylib @ git+https://github.com/org/repo.git@v1#egg=mylib",
+        "other-lib @ git+https://github.com/org/other.git#egg=Other_Lib",
+    ]
+    assert requirements.index_options == ["--index-url https://example.org/simple"]
+    assert requirements.skipped == ["-e ."]
+    assert [path.name for path in requirements.files] == ["requirements.txt", "base.txt"]
+
+
+def test_merges_by_normalized_name():
+    requirements = RequirementSet(["PyYAML>=5", "pyyaml<7", "py_yaml", "not a requirement!"])
+
+    assert "pyyaml" in requirements
+    assert requirements.to_list() == ["pyyaml<7,>=5", "py-yaml"]
+    assert requirements.skipped == ["not a requirement!"]
+
+
+def test_resolve_packages_keeps_similar_names(tmp_path):
+    app_file = tmp_path / "app.py"
+    app_file.write_text("import gradio as gr\n")
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("torchvision>=0.15\ngradio>=4.40\n")
+    deployer = ModalDeployer(app_file, use_cache=False)
+
+    packages = deployer._resolve_packages(DeploymentConfig(mode="optimized", requirements_path=requirements, minimal_image=False))
+
+    assert "torch>=2.0.0" in packages
+    assert "torchvision>=0.15" in packages
+    assert packages.count("gradio>=4.40") == 1
+    assert "gradio" not in packages
@@ -0,0 +1,107 @@
+"""Tests for the shared modal CLI subprocess runner."""
+
+import asyncio
+import os
+import sys
+import time
+
+from modal_for_noobs import subprocess_runner
+from modal_for_noobs.subprocess_runner import CommandRunner, command_name
+
+
+def python(code: str) -> tuple[str, ...]:
+    return (sys.executable, "-c", code)
+
+
+def test_command_name_uses_subcommand_words():
+    assert command_name(["modal", "app", "logs", "my-app", "--follow"]) == "modal app logs"
+    assert command_name(["modal", "deploy", "/tmp/app.py"]) == "modal deploy"
+    assert command_name(["modal", "secret", "create", "--force"]) == "modal secret create"
+
+
+async def test_keeps_tail_of_large_output():
+    runner = CommandRunner(output_limit=1000)
+
+    result = await runner.run(*python("for i in range(1000): print(f'line {i}')"))
+
+    assert result.ok
+    assert result.truncated
+    assert result.stdout.startswith("line ")
+    assert result.stdout.endswith("line 999\n")
+    assert len(result.stdout) <= 1000
+
+
+async def test_timeout_kills_process():
+    runner = CommandRunner()
+    started = time.perf_counter()
+
+    result = await runner.run(*python("import time; time.sleep(30)"), timeout=0.2)
+
+    assert result.timed_out
+    assert not result.ok
+    assert result.returncode is not None
+    assert "timed out" in result.error
+    assert time.perf_counter() - started < 5
+
+
+async def test_cancel_kills_process(tmp_path):
+    runner = CommandRunner()
+    pid_file = tmp_path / "pid"
+    task = asyncio.create_task(
+        runner.run(*python(f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"), timeout=None)
+    )
+    while not pid_file.exists() or not pid_file.read_text():
+        await asyncio.sleep(0.05)
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    try:
+        os.kill(int(pid_file.read_text()), 0)
+    except ProcessLookupError:
+        return
+    raise AssertionError("process survived cancellation")
+
+
+async def test_retries_transient_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(subprocess_runner, "BACKOFF_BASE", 0)
+    runner = CommandRunner()
+    marker = tmp_path / "attempted"
+    code = (
+        "import sys; from pathlib import Path\n"
+        f"marker = Path({str(marker)!r})\n"
+        "if not marker.exists():\n"
+        "    marker.touch(); print('connection reset by peer', file=sys.stderr); sys.exit(1)\n"
+        "print('ok')"
+    )
+
+    result = await runner.run(*python(code))
+    failed = await runner.run(*python("import sys; print('App not found', file=sys.stderr); sys.exit(1)"))
+
+    assert result.ok and result.attempts == 2
+    assert failed.attempts == 1 and failed.error == "App not found"
+    assert runner.metrics()[sys.executable]["calls"] == 2
+    assert runner.metrics()[sys.executable]["retries"] == 1
+    assert runner.metrics()[sys.executable]["failures"] == 1
+
+
+async def test_limits_concurrent_processes():
+    runner = CommandRunner(max_concurrency=1)
+    started = time.perf_counter()
+
+    await asyncio.gather(*(runner.run(*python("import time; time.sleep(0.3)")) for _ in range(2)))
+
+    assert time.perf_counter() - started >= 0.6
+
+
+async def test_stream_reports_lines_as_they_arrive():
+    runner = CommandRunner()
+    lines = []
+
+    result = await runner.stream(*python("import sys; print('out'); print('err', file=sys.stderr)"), on_line=lambda *line: lines.append(line))
+
+    assert result.ok
+    assert sorted(lines) == [("stderr", "err"), ("stdout", "out")]
@@ -6,12 +6,19 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from jinja2 import ChoiceLoader, FileSystemLoader, ModuleLoader
 
+from modal_for_noobs import template_generator
 from modal_for_noobs.template_generator import (
+    TEMPLATE_DIR,
     RemoteFunctionConfig,
     TemplateConfig,
     TemplateGenerator,
+    bytecode_cache_dir,
+    create_environment,
     generate_from_wizard_input,
+    get_template_generator,
+    precompile_templates,
 )
 
 
@@ -483,5 +490,35 @@ demo = gr.Interface(fn=greet, inputs="text", outputs="text")
                 assert brace_count >= 0, f"Potentially problematic f-string: {line}"
 
 
+class TestTemplateEnvironment:
+    """Test the shared environment, bytecode cache and precompiled templates."""
+
+    def test_generators_share_environment(self):
+        assert TemplateGenerator().env is TemplateGenerator().env
+        assert get_template_generator() is get_template_generator()
+
+    def test_bytecode_cache_written(self):
+        env = create_environment(loader=FileSystemLoader(TEMPLATE_DIR))
+        env.get_template("base_deployment.j2")
+        assert list(bytecode_cache_dir().glob("__jinja2_*.cache"))
+
+    def test_precompiled_templates_render_identically(self, tmp_path):
+        config = TemplateConfig(app_name="precompiled", deployment_mode="optimized", gpu_type="t4", original_code="print('hi')")
+        compiled = precompile_templates(tmp_path / "compiled")
+
+        precompiled_env = create_environment(loader=ModuleLoader(str(compiled)))
+        expected = TemplateGenerator(create_environment(loader=FileSystemLoader(TEMPLATE_DIR))).generate_deployment(config)
+        assert TemplateGenerator(precompiled_env).generate_deployment(config) == expected
+
+    def test_stale_precompiled_templates_ignored(self, tmp_path, monkeypatch):
+        compiled = precompile_templates(tmp_path / "compiled")
+        monkeypatch.setattr(template_generator, "PRECOMPILED_DIR", compiled)
+        assert isinstance(template_generator._template_loader(), ChoiceLoader)
+
+        manifest = compiled / template_generator.PRECOMPILED_MANIFEST
+        manifest.write_text(manifest.read_text().replace('"base_deployment.j2": "', '"base_deployment.j2": "stale'))
+        assert isinstance(template_generator._template_loader(), FileSystemLoader)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Tests for the local wheelhouse."""
+
+import json
+
+from modal_for_noobs import wheelhouse
+from modal_for_noobs.templates.deployment import get_image_config
+from modal_for_noobs.wheelhouse import MANIFEST_FILE, download_command, index_wheelhouse, prefetch
+
+
+def test_download_command_targets_linux_wheels(tmp_path):
+    command = download_command(["torch>=2.0"], tmp_path)
+
+    assert command[1:4] == ["-m", "pip", "download"]
+    assert "--only-binary=:all:" in command
+    assert "manylinux2014_x86_64" in command
+    assert command[command.index("--python-version") + 1] == "3.11"
+    assert command[-1] == "torch>=2.0"
+
+
+def test_prefetch_retries_packages_one_by_one(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_download(packages, target):
+        calls.append(packages)
+        for package in packages:
+            (target / f"{package}-1.0-py3-none-any.whl").write_bytes(b"wheel")
+        return "flash-attn" not in packages
+
+    monkeypatch.setattr(wheelhouse, "_download", fake_download)
+    results, manifest = prefetch({"optimized": ["torch", "flash-attn"], "minimum": ["torch"]}, tmp_path)
+
+    assert calls == [["torch", "flash-attn"], ["torch"], ["flash-attn"], ["torch"]]
+    assert [result.failed for result in results] == [["flash-attn"], []]
+    assert manifest["modes"]["minimum"]["packages"] == ["torch"]
+    assert sorted(manifest["wheels"]) == [
+        "minimum/torch-1.0-py3-none-any.whl",
+        "optimized/flash-attn-1.0-py3-none-any.whl",
+        "optimized/torch-1.0-py3-none-any.whl",
+    ]
+    assert (tmp_path / "minimum" / "torch-1.0-py3-none-any.whl").samefile(tmp_path / "optimized" / "torch-1.0-py3-none-any.whl")
+    assert json.loads((tmp_path / MANIFEST_FILE).read_text()) == manifest
+
+
+def test_index_hard_links_identical_wheels(tmp_path):
+    first = tmp_path / "torch-2.1.0-cp311-cp311-manylinux2014_x86_64.whl"
+    second = tmp_path / "torch-2.1.0-cp311-cp311-manylinux_2_28_x86_64.whl"
+    first.write_bytes(b"x" * 1000)
+    second.write_bytes(b"x" * 1000)
+    (tmp_path / "numpy-1.26.0-cp311-cp311-manylinux2014_x86_64.whl").write_bytes(b"numpy")
+
+    manifest = index_wheelhouse(tmp_path)
+
+    assert first.samefile(second)
+    assert manifest["total_bytes"] == 1005
+    assert manifest["deduplicated_bytes"] == 1000
+    assert index_wheelhouse(tmp_path)["deduplicated_bytes"] == 1000
+
+
+def test_modes_reuse_each_others_wheels(tmp_path):
+    (tmp_path / "optimized").mkdir()
+    (tmp_path / "minimum").mkdir()
+
+    command = download_command(["gradio"], tmp_path / "minimum", [tmp_path / "optimized"])
+
+    assert command[command.index("--find-links") + 1] == str(tmp_path / "optimized")
+    assert command[command.index("--dest") + 1] == str(tmp_path / "minimum")
+
+
+def test_image_copies_only_its_modes_wheels(tmp_path):
+    for mode in ("minimum", "optimized"):
+        (tmp_path / mode).mkdir()
+
+    config = get_image_config("minimum", ["gradio"], wheelhouse=tmp_path)
+
+    assert f".add_local_dir({str(tmp_path / 'minimum')!r}, remote_path='/wheelhouse', copy=True)" in config
+    assert "optimized" not in config
+
+
+def test_image_installs_from_wheelhouse(tmp_path):
+    config = get_image_config("minimum", ["gradio", "requests"], wheelhouse=tmp_path)
+
+    assert f".add_local_dir({str(tmp_path)!r}, remote_path='/wheelhouse', copy=True)" in config
+    assert config.count('find_links="/wheelhouse"') == 2
+    assert config.index("add_local_dir") < config.index("pip_install")
+    compile(config, "image.py", "exec")